@@ -14,13 +14,17 @@ __description__ = metadata.long_description
 from . import copads
 
 # Module imports (in ascending order of module names)
+from . import codegen
 from . import codonA
 from . import database_calls
 from . import dose
 from . import genetic
+from . import lockstep
+from . import population_matrix
 from . import register_machine
 from . import ragaraja
 from . import simulation_calls
+from . import tapes
 
 # COPADS Class imports (in ascending order of module names, then class names)
 from .copads.lindenmayer import lindenmayer
@@ -0,0 +1,850 @@
+'''
+Interpreter Benchmark and Differential Testing
+Date created: 18th October 2026
+
+Measures the throughput of the interpreter loops and their alternative
+backends, and checks that the backends give the same results as the
+reference interpreter loop (a frozen copy of register_machine.interpret of
+DOSE 1.0.5, see reference_interpret), on corpora of sources generated for
+each instruction set (see instruction_sets):
+    1. Random corpora, where each source is a random sequence of the
+    instructions of the instruction set.
+    2. Evolved corpora, where the sources are the chromosomes of a
+    population descended from a random ancestor by point mutations (see
+    genetic.Chromosome.rmutate) and random survival over a number of
+    generations, as in a simulation without selection.
+
+Each source is executed with a fixed seed of the random number generator
+and in its own execution context (see register_machine.Context), so that
+the results of sources using random numbers, registers or stacks can be
+compared. The state of the random number generator is restored after the
+corpora are generated and executed. Backends executing on tapes of floats
+(see tapes) are checked against the interpreter loop on a tape of the same
+class (see references).
+
+Usage (from the directory above the dose package):
+    python -m dose.benchmark
+'''
+
+import contextlib
+import io
+import random
+import time
+
+from . import codegen, codonA, genetic, lc_bf, lockstep, ragaraja
+from . import register_machine, tapes
+
+# Instructions of the mathematical operations (see ragaraja.mathematics)
+# which can take unbounded time on integers - the hyperbolic functions,
+# powers and factorials replaced by the bounded mathematical operations
+# (see ragaraja.bounded_mathematics), and the squares of cells - which are
+# left out of the sources of the instruction sets of the unbounded
+# mathematical operations
+unbounded_instructions = ['099', '100', '107', '108', '109', '110', '111',
+                          '114', '115', '166', '167', '168']
+
+def _ragaraja_set(version, instructions, bases='0123456789', decoder=None,
+                  bounded=True):
+    '''
+    Gives the instruction set of a Ragaraja version (see
+    ragaraja.instruction_table), with the bounded mathematical operations
+    (see ragaraja.bounded_ragaraja), as powers and factorials of integers
+    can take unbounded time on random sources. If bounded is False, the
+    instruction set has the mathematical operations of the instruction
+    table, and the instructions which can take unbounded time (see
+    unbounded_instructions) are left out of the sources.
+    '''
+    functions = ragaraja.instruction_table(version)
+    excluded = []
+    if bounded:
+        functions = ragaraja.bounded_ragaraja(functions)
+    else:
+        excluded = unbounded_instructions
+        instructions = [x for x in instructions if x not in excluded]
+    return {'functions': functions,
+            'function_size': 3,
+            'instructions': instructions,
+            'excluded': excluded,
+            'bases': bases,
+            'decoder': decoder,
+            'specialised': ragaraja.specialised_ragaraja,
+            'superinstructions': ragaraja.superinstructions_ragaraja,
+            'programs': codegen.ProgramCache(1,
+                            codegen=ragaraja.codegen_ragaraja),
+            'lockstep': ragaraja.lockstep_ragaraja,
+            'nondeterministic': ragaraja.nondeterministic_ragaraja,
+            'structural': ragaraja.structural_ragaraja,
+            'vectorised': True}
+
+# Instruction sets for benchmarking, where each instruction set is a
+# dictionary of
+#   - functions: dictionary of functions / operations
+#   - function_size: length of each instruction
+#   - instructions: list of instructions for random sources
+#   - excluded: list of instructions which are left out of evolved sources
+#   - bases: allowable bases of chromosomes for evolved sources
+#   - decoder: function converting chromosomal sequences into sources
+#   (see genetic.Chromosome.program), or None
+#   - specialised, superinstructions: specialised functions / operations
+#   and simple functions / operations (see register_machine.DispatchTable)
+#   - programs: generated functions of the sources (see
+#   codegen.ProgramCache), generated at the first execution of each source,
+#   or None where generated functions are not faster than the specialised
+#   functions / operations (such as Codon A, where most sources have
+#   accumulator instructions, which are not compiled, and LCBF, where
+#   instructions are compiled into calls of the specialised functions /
+#   operations)
+#   - lockstep: functions / operations for lockstep execution (see
+#   lockstep.LockstepTable), or None
+#   - nondeterministic: list of nondeterministic functions / operations
+#   - structural: list of structural functions / operations (see
+#   register_machine.Checkpoints), or None where sources are not
+#   checkpointed
+#   - vectorised: True if the whole-tape operations of tapes can be used
+#   (see ragaraja.vectorised_ragaraja); sparse tapes (see tapes.SparseTape)
+#   are only used with whole-tape operations, as the cells of a sparse
+#   tape are slower to read and write than the cells of a list
+instruction_sets = {
+    'nBF 0.1': _ragaraja_set(0.1, ragaraja.nBF_instructions),
+    'nBF 0.2': _ragaraja_set(0.2, sorted(ragaraja.nBF_codes.keys()),
+                             ''.join(sorted(ragaraja.nBF_codes.keys())),
+                             ragaraja.nBF_to_Ragaraja),
+    'nBF 0.2 DNA': _ragaraja_set(0.2, ['A', 'C', 'G', 'T'], 'ACGT',
+                                 ragaraja.nBF_to_Ragaraja),
+    'Ragaraja 1': _ragaraja_set(1, ragaraja.ragaraja_v1),
+    'Ragaraja 2': _ragaraja_set(2, ragaraja.ragaraja_v2),
+    'Ragaraja tested': _ragaraja_set(99,
+                            ragaraja.tested_ragaraja_instructions),
+    'Ragaraja 1 unbounded': _ragaraja_set(1, ragaraja.ragaraja_v1,
+                                          bounded=False),
+    'Ragaraja 2 unbounded': _ragaraja_set(2, ragaraja.ragaraja_v2,
+                                          bounded=False),
+    'Ragaraja tested unbounded': _ragaraja_set(99,
+                            ragaraja.tested_ragaraja_instructions,
+                            bounded=False),
+    'CodonA': {'functions': codonA.interpreter,
+               'function_size': codonA.codonLength,
+               'instructions': sorted(codonA.interpreter.keys()),
+               'excluded': [],
+               'bases': 'ATCG',
+               'decoder': None,
+               'specialised': codonA.specialised_codonA,
+               'superinstructions': None,
+               'programs': None,
+               'lockstep': None,
+               'nondeterministic': codonA.nondeterministic_codonA,
+               'structural': None,
+               'vectorised': False},
+    'LCBF': {'functions': lc_bf.LCBF,
+             'function_size': 1,
+             'instructions': sorted(lc_bf.LCBF.keys()),
+             'excluded': [],
+             'bases': ''.join(sorted(lc_bf.LCBF.keys())),
+             'decoder': None,
+             'specialised': lc_bf.specialised_LCBF,
+             'superinstructions': lc_bf.superinstructions_LCBF,
+             'programs': None,
+             'lockstep': None,
+             'nondeterministic': [],
+             'structural': None,
+             'vectorised': False},
+    }
+
+@contextlib.contextmanager
+def _seeded(seed):
+    '''
+    Seeds the random number generator within a block (unless the seed is
+    None), and restores the state of the random number generator after
+    the block.
+    '''
+    state = random.getstate()
+    if seed != None: random.seed(seed)
+    try:
+        yield
+    finally:
+        random.setstate(state)
+
+def random_corpus(name, count=100, length=60, seed=0):
+    '''
+    Generates a corpus of random sources of an instruction set, where each
+    source is a sequence of random instructions of the instruction set.
+
+    @param name: Name of the instruction set (see instruction_sets).
+    @type name: string
+    @param count: Number of sources. Default = 100
+    @type count: integer
+    @param length: Number of instructions in each source. Default = 60
+    @type length: integer
+    @param seed: Seed of the random number generator. Default = 0
+    @return: List of sources.
+
+    @since: version 1.0.6
+    '''
+    instruction_set = instruction_sets[name]
+    decoder = instruction_set['decoder']
+    corpus = []
+    with _seeded(seed):
+        for i in range(count):
+            source = ''.join([random.choice(instruction_set['instructions'])
+                              for j in range(length)])
+            if decoder != None: source = decoder(source)
+            corpus.append(source)
+    return corpus
+
+def evolved_corpus(name, count=100, length=60, generations=20,
+                   rate=0.01, seed=0):
+    '''
+    Generates a corpus of evolved sources of an instruction set. A
+    population of chromosomes (see genetic.Chromosome) of a random
+    ancestor (a random source, see random_corpus) is mutated by point
+    mutations in each generation, and the chromosomes surviving into the
+    next generation are chosen at random (with replacement), so that the
+    sources share ancestry as the chromosomes of a simulated population.
+    Instructions left out of the instruction set (excluded, such as the
+    instructions of unbounded mathematical operations) are removed from
+    the sources.
+
+    @param name: Name of the instruction set (see instruction_sets).
+    @type name: string
+    @param count: Number of sources (population size). Default = 100
+    @type count: integer
+    @param length: Number of instructions in the ancestor. Default = 60
+    @type length: integer
+    @param generations: Number of generations. Default = 20
+    @type generations: integer
+    @param rate: Point mutation rate per base in each generation.
+    Default = 0.01
+    @type rate: float
+    @param seed: Seed of the random number generator. Default = 0
+    @return: List of sources.
+
+    @since: version 1.0.6
+    '''
+    instruction_set = instruction_sets[name]
+    bases = instruction_set['bases']
+    with _seeded(seed):
+        ancestor = ''.join([random.choice(instruction_set['instructions'])
+                            for j in range(length)])
+        population = [genetic.Chromosome(list(ancestor), bases, 0.0)
+                      for i in range(count)]
+        for generation in range(generations):
+            for chromosome in population:
+                chromosome.rmutate('point', rate)
+            population = [random.choice(population) for i in range(count)]
+            population = [genetic.Chromosome(list(chromosome.read_sequence()),
+                                             bases, 0.0)
+                          for chromosome in population]
+    corpus = [chromosome.program(instruction_set['decoder'])
+              for chromosome in population]
+    excluded = instruction_set['excluded']
+    if len(excluded) > 0:
+        size = instruction_set['function_size']
+        corpus = [''.join([source[i:i+size]
+                           for i in range(0, len(source), size)
+                           if source[i:i+size] not in excluded])
+                  for source in corpus]
+    return corpus
+
+def reference_interpret(source, functions, function_size=1, inputdata=[],
+                        array=None, size=30, max_instructions=1000):
+    '''
+    Reference interpreter loop - a frozen copy of register_machine.interpret
+    of DOSE 1.0.5, before the interpreter loops were optimised, which
+    copies the tape, input data, output and source before each
+    instruction for rolling back an instruction which raises an exception.
+    The backends, including register_machine.interpret, are checked
+    against this loop (see differential), so that it must not be changed.
+
+    Parameters are as of register_machine.interpret.
+    @return: Results of execution - (array, apointer, inputdata, output,
+    source, spointer).
+
+    @since: version 1.0.6
+    '''
+    spointer = 0
+    apointer = 0
+    output = list()
+    if array == None:
+        array = [0] * size
+    if len(array) > size:
+        array = array[0:size]
+    if len(source) % function_size != 0:
+        source = source + '!'*(function_size - \
+                               len(source) % function_size)
+        tokens = list(functions.keys())
+        source = ''.join([x for x in source if x in tokens])
+    instruction_count = 0
+    while spointer < len(source):
+        instruction_count = instruction_count + 1
+        original_array = [x for x in array]
+        original_inputdata = [x for x in inputdata]
+        original_output = [x for x in output]
+        original_source = [x for x in source]
+        try:
+            cmd = source[spointer:spointer+function_size]
+            (array, apointer, inputdata, output,
+                source, spointer) = functions[cmd](array, apointer,
+                                                   inputdata, output,
+                                                   source, spointer)
+        except KeyError:
+            print(' '.join(['Unknown function: ', cmd,
+                            'at source position', str(spointer)]))
+        except:
+            # implement roll back operation
+            array = original_array
+            inputdata = original_inputdata
+            output = original_output
+            source = original_source
+        if apointer > size - 1:
+            apointer = apointer - size
+        if apointer < 0:
+            apointer = size + apointer
+        spointer = spointer + function_size
+        if instruction_count > max_instructions:
+            return (array, apointer, inputdata, output, source, spointer)
+    return (array, apointer, inputdata, output, source, spointer)
+
+def _reference(source, instruction_set, inputdata, array, size,
+               max_instructions, context):
+    return register_machine.within(context, reference_interpret, source,
+        instruction_set['functions'], instruction_set['function_size'],
+        inputdata, array, size, max_instructions)
+
+def _interpret(source, instruction_set, inputdata, array, size,
+               max_instructions, context):
+    return register_machine.interpret(source,
+        instruction_set['functions'], instruction_set['function_size'],
+        inputdata, array, size, max_instructions, context=context)
+
+def _execute(source, instruction_set, inputdata, array, size,
+             max_instructions, context):
+    return register_machine.execute(source,
+        instruction_set['functions'], instruction_set['function_size'],
+        inputdata, array, size, max_instructions, context=context)
+
+def _specialised(source, instruction_set, inputdata, array, size,
+                 max_instructions, context):
+    return register_machine.execute(source,
+        instruction_set['functions'], instruction_set['function_size'],
+        inputdata, array, size, max_instructions,
+        instruction_set['specialised'], context=context)
+
+def _superinstructions(source, instruction_set, inputdata, array, size,
+                       max_instructions, context):
+    return register_machine.execute(source,
+        instruction_set['functions'], instruction_set['function_size'],
+        inputdata, array, size, max_instructions,
+        instruction_set['specialised'],
+        instruction_set['superinstructions'], context=context)
+
+def _repetition(source, instruction_set, inputdata, array, size,
+                max_instructions, context):
+    repetition = register_machine.Repetition(
+        nondeterministic=instruction_set['nondeterministic'])
+    return register_machine.execute(source,
+        instruction_set['functions'], instruction_set['function_size'],
+        inputdata, array, size, max_instructions,
+        instruction_set['specialised'], context=context,
+        repetition=repetition)
+
+def _codegen(source, instruction_set, inputdata, array, size,
+             max_instructions, context):
+    if instruction_set['programs'] == None:
+        return None
+    return instruction_set['programs'].execute(source,
+        instruction_set['functions'], instruction_set['function_size'],
+        inputdata, array, size, max_instructions,
+        specialised=instruction_set['specialised'], context=context)
+
+def _sparse(source, instruction_set, inputdata, array, size,
+            max_instructions, context):
+    if not instruction_set['vectorised']:
+        return None
+    specialised = ragaraja.vectorised_ragaraja(tapes.SparseTape)
+    return register_machine.execute(source,
+        instruction_set['functions'], instruction_set['function_size'],
+        inputdata, tapes.SparseTape(array), size, max_instructions,
+        specialised, context=context)
+
+def _checkpoints(source, instruction_set, inputdata, array, size,
+                 max_instructions, context):
+    # the parent of the source (mutated at two thirds of the source) is
+    # executed first, and the source is resumed from its checkpoints
+    if instruction_set['structural'] == None:
+        return None
+    checkpoints = register_machine.Checkpoints(10,
+        instruction_set['nondeterministic'], instruction_set['structural'])
+    function_size = instruction_set['function_size']
+    position = len(source) // function_size * 2 // 3 * function_size
+    parent = source[:position] + source[:function_size] + \
+        source[position+function_size:]
+    with _seeded(None):
+        register_machine.execute(parent,
+            instruction_set['functions'], function_size, list(inputdata),
+            array[:], size, max_instructions,
+            instruction_set['specialised'],
+            context=register_machine.Context(), checkpoints=checkpoints)
+    return register_machine.execute(source,
+        instruction_set['functions'], function_size, inputdata, array,
+        size, max_instructions, instruction_set['specialised'],
+        context=context, checkpoints=checkpoints)
+
+def _cached(source, instruction_set, inputdata, array, size,
+            max_instructions, context):
+    # the source is executed twice, so that the results are given by the
+    # cache if the source is deterministic
+    cache = register_machine.ResultCache(
+        nondeterministic=instruction_set['nondeterministic'])
+    with _seeded(None):
+        cache.execute(register_machine.execute, source,
+            instruction_set['functions'], instruction_set['function_size'],
+            list(inputdata), array[:], size, max_instructions,
+            specialised=instruction_set['specialised'],
+            context=register_machine.Context())
+    return cache.execute(register_machine.execute, source,
+        instruction_set['functions'], instruction_set['function_size'],
+        inputdata, array, size, max_instructions,
+        specialised=instruction_set['specialised'], context=context)
+
+def _numpy(source, instruction_set, inputdata, array, size,
+           max_instructions, context):
+    if not instruction_set['vectorised'] or tapes.numpy == None:
+        return None
+    specialised = ragaraja.vectorised_ragaraja(tapes.NumPyTape)
+    return register_machine.execute(source,
+        instruction_set['functions'], instruction_set['function_size'],
+        inputdata, tapes.NumPyTape(array), size, max_instructions,
+        specialised, context=context)
+
+def _bounded(source, instruction_set, inputdata, array, size,
+             max_instructions, context):
+    if not instruction_set['vectorised']:
+        return None
+    specialised = ragaraja.vectorised_ragaraja(tapes.BoundedTape)
+    return register_machine.execute(source,
+        ragaraja.bounded_ragaraja(instruction_set['functions']),
+        instruction_set['function_size'], inputdata,
+        tapes.BoundedTape(array), size, max_instructions, specialised,
+        context=context)
+
+def _tape_reference(source, instruction_set, inputdata, array, size,
+                    max_instructions, context, tape_class):
+    '''
+    Interprets a source (see register_machine.interpret) on a tape of a
+    tape class, where each instruction is executed by its operation for
+    the tape class (see ragaraja.vectorised_ragaraja) as in
+    register_machine.execute, for checking the backends executing on
+    tapes of floats, whose results differ from the results on a list.
+    Tapes which cannot journal their changes (such as tapes.NumPyTape)
+    are copied into lists by register_machine.interpret, and are executed
+    by register_machine.execute, which copies the tape before each
+    instruction as no instruction is specialised.
+    '''
+    if not instruction_set['vectorised']:
+        return None
+    functions = instruction_set['functions']
+    if tape_class == tapes.BoundedTape:
+        functions = ragaraja.bounded_ragaraja(functions)
+    table = register_machine.dispatch_table(functions,
+        instruction_set['function_size'],
+        ragaraja.vectorised_ragaraja(tape_class))
+    functions = dict([(instruction,
+                       table.specialise(instruction, functions[instruction]))
+                      for instruction in functions])
+    if hasattr(tape_class, 'journaled'):
+        engine = register_machine.interpret
+    else:
+        engine = register_machine.execute
+    return engine(source, functions, instruction_set['function_size'],
+                  inputdata, tape_class(array), size, max_instructions,
+                  context=context)
+
+def _numpy_reference(source, instruction_set, inputdata, array, size,
+                     max_instructions, context):
+    if tapes.numpy == None:
+        return None
+    return _tape_reference(source, instruction_set, inputdata, array,
+                           size, max_instructions, context, tapes.NumPyTape)
+
+def _bounded_reference(source, instruction_set, inputdata, array, size,
+                       max_instructions, context):
+    return _tape_reference(source, instruction_set, inputdata, array,
+                           size, max_instructions, context,
+                           tapes.BoundedTape)
+
+def _lockstep(source, instruction_set, inputdata, array, size,
+              max_instructions, context):
+    if instruction_set['lockstep'] == None or lockstep.numpy == None:
+        return None
+    return lockstep.execute([source],
+        instruction_set['functions'], instruction_set['function_size'],
+        [inputdata], [array], size, max_instructions,
+        instruction_set['lockstep'], context=context,
+        specialised=instruction_set['specialised'])[0]
+
+# Interpreter backends, where each backend is a function executing a
+# source of an instruction set (see instruction_sets) which gives the
+# results of execution - (array, apointer, inputdata, output, source,
+# spointer) - or None if the backend cannot execute the source. The
+# reference backend is the frozen interpreter loop ('reference', see
+# reference_interpret). The checkpoints and cache backends execute each
+# source twice - a parent of the source, from whose checkpoints the source
+# is resumed (see register_machine.Checkpoints), and the source, whose
+# results are then given by the cache (see register_machine.ResultCache)
+# - so that their throughput includes the recording execution.
+backends = {'reference': _reference,
+            'interpret': _interpret,
+            'execute': _execute,
+            'specialised': _specialised,
+            'superinstructions': _superinstructions,
+            'repetition': _repetition,
+            'codegen': _codegen,
+            'sparse': _sparse,
+            'numpy': _numpy,
+            'bounded': _bounded,
+            'checkpoints': _checkpoints,
+            'cache': _cached,
+            'lockstep': _lockstep}
+
+# Reference backends of the backends executing on tapes of floats (see
+# tapes), which do not give the same results as the reference interpreter
+# loop on a list. These backends are checked against the interpreter loop
+# (register_machine.interpret, which is checked against the reference
+# interpreter loop) on a tape of the same class, with the operations of
+# the instructions for the tape class (see _tape_reference).
+references = {'numpy': _numpy_reference,
+              'bounded': _bounded_reference}
+
+def _exact(value):
+    '''
+    Gives a value, and the values in lists, tuples and dictionaries, with
+    their types, where floats are given by their hexadecimal
+    representation, for comparing the values exactly (as 0.0 == -0.0,
+    and NaN is not equal to itself).
+    '''
+    if type(value) is float:
+        return (float, value.hex())
+    if isinstance(value, (list, tuple)):
+        return (type(value), [_exact(x) for x in value])
+    if isinstance(value, dict):
+        return (dict, [(key, _exact(value[key]))
+                       for key in sorted(value.keys())])
+    return (type(value), value)
+
+def _run(backend, source, instruction_set, inputdata, size,
+         max_instructions, seed):
+    '''
+    Executes a source by a backend with a seed of the random number
+    generator and a new execution context, and gives the state of the
+    machine after execution - the results of execution (or the exception
+    raised), the input data left, the registers and stacks of the
+    context, and the next random number - for comparing exactly (see
+    _exact), or None if the backend cannot execute the source.
+    '''
+    inputdata = list(inputdata)
+    context = register_machine.Context()
+    with _seeded(seed), contextlib.redirect_stdout(io.StringIO()):
+        try:
+            result = backend(source, instruction_set, inputdata,
+                             [0] * size, size, max_instructions, context)
+        except Exception as e:
+            result = (type(e).__name__, str(e))
+        if result == None: return None
+        if len(result) == 6:
+            result = (list(result[0]),) + tuple(result[1:])
+        return _exact((result, inputdata, context.registers,
+                       context.stacks, random.random()))
+
+def differential(name, corpus, backends=backends, inputdata=None,
+                 size=30, max_instructions=1000, seed=0):
+    '''
+    Executes each source of a corpus by each backend, and compares the
+    state of the machine after execution (the results of execution, the
+    input data left, the registers and stacks of the execution context,
+    and the state of the random number generator) with that of the
+    reference interpreter loop (see reference_interpret), or of the
+    reference backend of the backend (see references). Each source is
+    executed with the same seed of the random number generator by all
+    backends.
+
+    @param name: Name of the instruction set (see instruction_sets).
+    @type name: string
+    @param corpus: List of sources (see random_corpus and evolved_corpus).
+    @type corpus: list
+    @param backends: Dictionary of backends to check. Default = all
+    backends (see backends)
+    @type backends: dictionary
+    @param inputdata: Input data for each source. Default = None
+    (integers from 1 to 10)
+    @type inputdata: list
+    @param size: Length of the tape (of zeros). Default = 30
+    @type size: integer
+    @param max_instructions: The maximum number of instructions to
+    execute for each source. Default = 1000
+    @type max_instructions: integer
+    @param seed: Seed of the random number generator for the first
+    source, which is incremented for each source. Default = 0
+    @return: Dictionary of backend names to dictionaries of number of
+    sources executed (executed), number of sources which the backend
+    cannot execute (skipped), and list of indexes of the sources with
+    different states from the reference (mismatches).
+
+    @since: version 1.0.6
+    '''
+    instruction_set = instruction_sets[name]
+    if inputdata == None: inputdata = list(range(1, 11))
+    states = {}
+    checks = {}
+    for backend in backends:
+        reference = references.get(backend, _reference)
+        if reference not in states:
+            states[reference] = [_run(reference, corpus[i],
+                                      instruction_set, inputdata, size,
+                                      max_instructions, seed + i)
+                                 for i in range(len(corpus))]
+        check = {'executed': 0, 'skipped': 0, 'mismatches': []}
+        for i in range(len(corpus)):
+            state = _run(backends[backend], corpus[i], instruction_set,
+                         inputdata, size, max_instructions, seed + i)
+            if state == None:
+                check['skipped'] = check['skipped'] + 1
+                continue
+            check['executed'] = check['executed'] + 1
+            if state != states[reference][i]:
+                check['mismatches'].append(i)
+        checks[backend] = check
+    return checks
+
+def opcode_costs(name, corpus, inputdata=None, size=30,
+                 max_instructions=1000, seed=0):
+    '''
+    Profiles the execution of a corpus by the interpreter loop
+    (register_machine.interpret, see register_machine.Profile), giving
+    the number of executions and the mean execution time of each
+    instruction.
+
+    Parameters are as of differential.
+    @return: Dictionary of instructions to dictionaries of number of
+    executions (count), cumulative execution time in seconds (time) and
+    mean execution time in seconds (cost).
+
+    @since: version 1.0.6
+    '''
+    instruction_set = instruction_sets[name]
+    if inputdata == None: inputdata = list(range(1, 11))
+    profile = register_machine.Profile()
+    for i in range(len(corpus)):
+        with _seeded(seed + i), contextlib.redirect_stdout(io.StringIO()):
+            register_machine.interpret(corpus[i],
+                instruction_set['functions'],
+                instruction_set['function_size'], list(inputdata),
+                [0] * size, size, max_instructions, profile,
+                context=register_machine.Context())
+    return dict([(instruction,
+                  {'count': profile.counts[instruction],
+                   'time': profile.times[instruction],
+                   'cost': profile.times[instruction] /
+                           profile.counts[instruction]})
+                 for instruction in profile.counts])
+
+def _counts(instruction_set, corpus, inputdata, size, max_instructions,
+            seed):
+    '''
+    Gives the number of instructions executed for each source of a corpus,
+    counted by profiling the interpreter loop (register_machine.interpret).
+    '''
+    counts = []
+    for i in range(len(corpus)):
+        profile = register_machine.Profile()
+        with _seeded(seed + i), contextlib.redirect_stdout(io.StringIO()):
+            register_machine.interpret(corpus[i],
+                instruction_set['functions'],
+                instruction_set['function_size'], list(inputdata),
+                [0] * size, size, max_instructions, profile,
+                context=register_machine.Context())
+        counts.append(profile.total() + profile.unknown)
+    return counts
+
+def throughput(name, corpus, backends=backends, inputdata=None, size=30,
+               max_instructions=1000, seed=0, repeat=3):
+    '''
+    Measures the throughput of each backend on a corpus, as the number of
+    instructions executed per second. The number of instructions executed
+    is counted by profiling the interpreter loop (see
+    opcode_costs), and the execution time of each backend is the shortest
+    of a number of executions of the corpus. Sources which the backend
+    cannot execute are not timed or counted.
+
+    Other parameters are as of differential.
+    @param repeat: Number of executions of the corpus by each backend.
+    Default = 3
+    @type repeat: integer
+    @return: Dictionary of backend names to dictionaries of number of
+    instructions executed (instructions), execution time in seconds
+    (time), and instructions per second (rate).
+
+    @since: version 1.0.6
+    '''
+    instruction_set = instruction_sets[name]
+    if inputdata == None: inputdata = list(range(1, 11))
+    counts = _counts(instruction_set, corpus, inputdata, size,
+                     max_instructions, seed)
+    rates = {}
+    for backend in backends:
+        timings = []
+        for r in range(repeat):
+            elapsed = 0.0
+            instructions = 0
+            for i in range(len(corpus)):
+                context = register_machine.Context()
+                with _seeded(seed + i), \
+                    contextlib.redirect_stdout(io.StringIO()):
+                    start = time.perf_counter()
+                    try:
+                        result = backends[backend](corpus[i],
+                            instruction_set, list(inputdata), [0] * size,
+                            size, max_instructions, context)
+                    except Exception:
+                        result = ()
+                    finish = time.perf_counter()
+                if result != None:
+                    elapsed = elapsed + finish - start
+                    instructions = instructions + counts[i]
+            timings.append(elapsed)
+        elapsed = min(timings)
+        if elapsed > 0: rate = instructions / elapsed
+        else: rate = 0.0
+        rates[backend] = {'instructions': instructions,
+                          'time': elapsed,
+                          'rate': rate}
+    return rates
+
+def lockstep_batch(name, corpus, inputdata=None, size=30,
+                   max_instructions=1000, seed=0, repeat=3):
+    '''
+    Measures the execution of a corpus as one batch in lockstep (see
+    lockstep.execute), where the machines diverging from the batch are
+    finished one at a time - the number of instructions executed in
+    lockstep, and the throughput of the batch as the number of
+    instructions executed per second (see throughput).
+
+    Parameters are as of throughput.
+    @return: Dictionary of number of instructions executed (instructions),
+    number of instructions executed in lockstep (lockstep), execution
+    time in seconds (time), and instructions per second (rate), or None
+    if the instruction set cannot be executed in lockstep.
+
+    @since: version 1.0.6
+    '''
+    instruction_set = instruction_sets[name]
+    if instruction_set['lockstep'] == None or lockstep.numpy == None:
+        return None
+    if inputdata == None: inputdata = list(range(1, 11))
+    instructions = sum(_counts(instruction_set, corpus, inputdata, size,
+                               max_instructions, seed))
+    machines = lockstep.run(corpus, instruction_set['functions'],
+                            instruction_set['function_size'], None, size,
+                            max_instructions, instruction_set['lockstep'])
+    stepped = sum([machine.instruction_count for machine in machines
+                   if machine != None])
+    timings = []
+    for r in range(repeat):
+        with _seeded(seed), contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            lockstep.execute(corpus, instruction_set['functions'],
+                instruction_set['function_size'],
+                [list(inputdata) for source in corpus], None, size,
+                max_instructions, instruction_set['lockstep'],
+                specialised=instruction_set['specialised'])
+            timings.append(time.perf_counter() - start)
+    elapsed = min(timings)
+    if elapsed > 0: rate = instructions / elapsed
+    else: rate = 0.0
+    return {'instructions': instructions,
+            'lockstep': stepped,
+            'time': elapsed,
+            'rate': rate}
+
+def report(names=None, corpora=('random', 'evolved'), count=100,
+           length=60, size=30, max_instructions=1000, seed=0, repeat=3,
+           costs=5):
+    '''
+    Benchmarks and checks the backends (see throughput and differential)
+    for instruction sets and corpora, and gives a textual report of the
+    throughput of each backend (and its speed relative to the reference 
+    interpreter loop, or '-' where the backend cannot execute the 
+    sources of the instruction set), the number of mismatches from the
+    reference interpreter loop, the throughput and share of instructions 
+    executed in lockstep of the corpus as one batch (see lockstep_batch), 
+    and the most costly instructions (see opcode_costs).
+
+    @param names: List of names of instruction sets. Default = None (all
+    instruction sets)
+    @type names: list
+    @param corpora: Kinds of corpora ('random' and / or 'evolved').
+    Default = ('random', 'evolved')
+    @param count: Number of sources in each corpus. Default = 100
+    @type count: integer
+    @param length: Number of instructions in each source. Default = 60
+    @type length: integer
+    @param costs: Number of most costly instructions to report.
+    Default = 5
+    @type costs: integer
+    @return: Report as a string.
+
+    Other parameters are as of throughput.
+
+    @since: version 1.0.6
+    '''
+    if names == None: names = sorted(instruction_sets.keys())
+    lines = []
+    for name in names:
+        for kind in corpora:
+            if kind == 'random':
+                corpus = random_corpus(name, count, length, seed)
+            else:
+                corpus = evolved_corpus(name, count, length, seed=seed)
+            lines.append('%s (%s corpus of %i sources)' %
+                         (name, kind, len(corpus)))
+            rates = throughput(name, corpus, size=size,
+                               max_instructions=max_instructions,
+                               seed=seed, repeat=repeat)
+            checks = differential(name, corpus, size=size,
+                                  max_instructions=max_instructions,
+                                  seed=seed)
+            reference = rates['reference']['rate']
+            for backend in backends:
+                if rates[backend]['instructions'] == 0:
+                    rate = '%12s instructions/s  %6s' % ('-', '-')
+                else:
+                    rate = '%12.0f instructions/s  %5.2fx' % \
+                        (rates[backend]['rate'],
+                         rates[backend]['rate'] / max(reference, 1e-9))
+                lines.append('  %-18s %s  %4i executed  %4i skipped  '
+                             '%4i mismatches' %
+                             (backend, rate, checks[backend]['executed'],
+                              checks[backend]['skipped'],
+                              len(checks[backend]['mismatches'])))
+            batch = lockstep_batch(name, corpus, size=size,
+                                   max_instructions=max_instructions,
+                                   seed=seed, repeat=repeat)
+            if batch != None:
+                lines.append('  %-18s %12.0f instructions/s  %5.2fx  '
+                             '%5.1f%% in lockstep' %
+                             ('lockstep batch', batch['rate'],
+                              batch['rate'] / max(reference, 1e-9),
+                              100.0 * batch['lockstep'] /
+                              max(batch['instructions'], 1)))
+            opcodes = opcode_costs(name, corpus, size=size,
+                                   max_instructions=max_instructions,
+                                   seed=seed)
+            opcodes = sorted(opcodes.items(),
+                             key=lambda x: x[1]['cost'], reverse=True)
+            for (instruction, cost) in opcodes[:costs]:
+                lines.append('  %-18s %12.2f microseconds  %8i executions' %
+                             (repr(instruction), cost['cost'] * 1e6,
+                              cost['count']))
+    return '\n'.join(lines)
+
+if __name__ == '__main__':
+    print(report())
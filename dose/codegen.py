@@ -0,0 +1,390 @@
+'''
+Code Generation for Register Machine
+Date created: 18th October 2026
+
+Compiles a source of the register machine (see register_machine) into a
+generated Python function, for sources which are executed many times (hot
+sources, such as the chromosomes of dominant genotypes). The generated
+function is straight-line Python code of the instructions of the source:
+    1. Simple instructions, which only move the tape pointer or change the
+    value of the current cell by a fixed amount, or do nothing, are
+    written as Python statements on the tape and the tape pointer.
+    2. Loop start and loop end (as ragaraja.loop_start and
+    ragaraja.loop_end) are written as Python while loops.
+    3. Output of the value of the current cell is written as an append to
+    the output list.
+    4. Other instructions are written as calls to their specialised
+    functions / operations (see register_machine.DispatchTable).
+
+Sources with unmatched loops, or with instructions which are not in the
+dictionary of functions / operations, or are excluded (such as
+instructions using random numbers, registers, or changing the source) are
+not compiled. Where an instruction of a compiled source changes the source
+or the source pointer, or raises an exception, the source is executed
+again from the start by register_machine.execute (the reference
+interpreter loop), so that the results are always the same as of
+register_machine.execute.
+'''
+
+from collections import OrderedDict
+
+from . import register_machine
+
+class Fallback(Exception):
+    '''
+    Raised by a generated function where the execution cannot continue in
+    the generated function, for the source to be executed by
+    register_machine.execute instead.
+    '''
+    pass
+
+def _instructions(source, functions, function_size, codegen):
+    '''
+    Gives the kind of each instruction of a source - ('simple', move,
+    change), ('loop_start',), ('loop_end',), ('output',) or ('call',
+    instruction, handler) - or None if the source cannot be compiled.
+    '''
+    excluded = codegen.get('excluded', [])
+    simple = codegen.get('simple', {})
+    kinds = []
+    for spointer in range(0, len(source), function_size):
+        instruction = source[spointer:spointer+function_size]
+        if instruction not in functions: return None
+        handler = functions[instruction]
+        if handler in excluded: return None
+        operation = simple.get(handler)
+        if isinstance(operation, dict):
+            operation = operation.get(instruction)
+        if operation != None:
+            kinds.append(('simple', operation[0], operation[1]))
+        elif handler in codegen.get('loop_start', []):
+            kinds.append(('loop_start',))
+        elif handler in codegen.get('loop_end', []):
+            kinds.append(('loop_end',))
+        elif handler in codegen.get('output', []):
+            kinds.append(('output',))
+        else:
+            kinds.append(('call', instruction, handler))
+    return kinds
+
+def _loops(kinds):
+    '''
+    Gives the dictionary of the positions of matching loop start and loop
+    end (in both directions), or None if any loop is not matched.
+    '''
+    loops = {}
+    starts = []
+    for i in range(len(kinds)):
+        if kinds[i][0] == 'loop_start':
+            starts.append(i)
+        elif kinds[i][0] == 'loop_end':
+            if len(starts) == 0: return None
+            start = starts.pop()
+            loops[start] = i
+            loops[i] = start
+    if len(starts) > 0: return None
+    return loops
+
+def generate(source, functions, function_size=1, specialised=None,
+             codegen=None):
+    '''
+    Generates the Python code of a source (see module documentation), as
+    a function of (array, apointer, inputdata, output, size, limit) giving
+    (array, apointer, inputdata, output, spointer) after executing the
+    source on the tape, the input list and the output list, where the
+    tape pointer has to be within the tape of the given size, and limit
+    is the maximum number of instructions to execute. The generated
+    function raises Fallback (or any other exception) where the source
+    has to be executed by register_machine.execute.
+
+    @param source: Source to compile.
+    @type source: string
+    @param functions: Dictionary of functions / operations.
+    @param function_size: Length of each instruction. Default = 1
+    @type function_size: integer
+    @param specialised: Dictionary of specialised functions / operations
+    (see register_machine.DispatchTable) to call for instructions which
+    are not generated as Python code. Default = None
+    @type specialised: dictionary
+    @param codegen: Dictionary of the functions / operations generated as
+    Python code - 'simple' is the dictionary of simple functions /
+    operations (as superinstructions of register_machine.DispatchTable),
+    'loop_start', 'loop_end' and 'output' are lists of functions /
+    operations of each kind, and 'excluded' is the list of functions /
+    operations of sources which are not compiled (such as
+    ragaraja.codegen_ragaraja). Default = None (all instructions are
+    called)
+    @type codegen: dictionary
+    @return: Tuple of (Python code, namespace of the function), or None
+    if the source cannot be compiled.
+
+    @since: version 1.0.6
+    '''
+    if codegen == None: codegen = {}
+    if specialised == None: specialised = {}
+    if not isinstance(source, str) or len(source) % function_size != 0:
+        return None
+    kinds = _instructions(source, functions, function_size, codegen)
+    if kinds == None: return None
+    loops = _loops(kinds)
+    if loops == None: return None
+    namespace = {'S': source, 'Fallback': Fallback}
+    handlers = {}
+    lines = ['def program(array, apointer, inputdata, output, size, limit):',
+             '    last = size - 1',
+             '    c = 0']
+    def emit(depth, line):
+        lines.append('    ' * depth + line)
+    def count(depth, spointer):
+        emit(depth, 'c = c + 1')
+        emit(depth, 'if c > limit: return (array, apointer, inputdata, '
+                    'output, %d)' % (spointer + function_size))
+    def loop_end(depth, start, end):
+        # loop end jumps back to after loop start if the loop is repeated
+        emit(depth, 'c = c + 1')
+        emit(depth, 'enter = not (array[apointer] < 1)')
+        emit(depth, 'if c > limit: return (array, apointer, inputdata, '
+                    'output, %d if enter else %d)' %
+                    (start + function_size, end + function_size))
+    def normalise(depth):
+        emit(depth, 'if apointer > last: apointer = apointer - size')
+        emit(depth, 'if apointer < 0: apointer = size + apointer')
+    i = 0
+    depth = 1
+    while i < len(kinds):
+        kind = kinds[i]
+        spointer = i * function_size
+        if kind[0] == 'simple':
+            if kind[2] > 0:
+                emit(depth, 'array[apointer] = array[apointer] + %r' %
+                     kind[2])
+            elif kind[2] < 0:
+                emit(depth, 'array[apointer] = array[apointer] - %r' %
+                     (-kind[2]))
+            if kind[1] != 0:
+                emit(depth, 'apointer = apointer + %d' % kind[1])
+                normalise(depth)
+            count(depth, spointer)
+        elif kind[0] == 'output':
+            emit(depth, 'output.append(array[apointer])')
+            count(depth, spointer)
+        elif kind[0] == 'loop_start':
+            end = loops[i] * function_size
+            emit(depth, 'if array[apointer] > 0:')
+            count(depth + 1, spointer)
+            emit(depth + 1, 'enter = True')
+            emit(depth, 'else:')
+            # loop start skips to loop end, which is executed
+            count(depth + 1, end - function_size)
+            loop_end(depth + 1, spointer, end)
+            emit(depth, 'while enter:')
+            depth = depth + 1
+            emit(depth, 'pass')
+        elif kind[0] == 'loop_end':
+            loop_end(depth, loops[i] * function_size, spointer)
+            depth = depth - 1
+        else:
+            handler = kind[2]
+            operation = specialised.get(handler)
+            if isinstance(operation, dict):
+                operation = operation.get(kind[1])
+            if operation == None:
+                operation = handler
+            if operation not in handlers:
+                handlers[operation] = 'h%d' % len(handlers)
+                namespace[handlers[operation]] = operation
+            emit(depth, '(array, apointer, inputdata, output, source, '
+                        'spointer) = %s(array, apointer, inputdata, '
+                        'output, S, %d)' % (handlers[operation], spointer))
+            emit(depth, 'if source is not S or spointer != %d: '
+                        'raise Fallback()' % spointer)
+            normalise(depth)
+            emit(depth, 'if apointer > last or apointer < 0: '
+                        'raise Fallback()')
+            count(depth, spointer)
+        i = i + 1
+    emit(1, 'return (array, apointer, inputdata, output, %d)' % len(source))
+    return ('\n'.join(lines) + '\n', namespace)
+
+def compile_source(source, functions, function_size=1, specialised=None,
+                   codegen=None):
+    '''
+    Compiles a source into a generated Python function (see generate).
+
+    @return: Generated function, or None if the source cannot be compiled
+    (including sources with loops nested too deeply for Python).
+
+    Parameters are as of generate.
+
+    @since: version 1.0.6
+    '''
+    generated = generate(source, functions, function_size, specialised,
+                         codegen)
+    if generated == None: return None
+    (code, namespace) = generated
+    try:
+        exec(compile(code, '<generated source>', 'exec'), namespace)
+    except (SyntaxError, RecursionError, MemoryError):
+        return None
+    return namespace['program']
+
+class ProgramCache(object):
+    '''
+    Generated functions (see compile_source) of hot sources - sources
+    which had been executed at least a number of times (threshold) - kept
+    by the hash of the source, the dictionary of functions / operations,
+    the instruction size and the specialised functions / operations. The
+    functions are evicted in least recently used order when the cache is
+    full. Sources which are not hot, or cannot be compiled, are executed
+    by register_machine.execute, and the results are the same as of
+    register_machine.execute.
+    '''
+    def __init__(self, threshold=100, max_size=1000, codegen=None):
+        '''
+        @param threshold: Number of executions of a source before it is
+        compiled. Default = 100
+        @type threshold: integer
+        @param max_size: Maximum number of generated functions (and ten
+        times the maximum number of sources counted). Default = 1000
+        @type max_size: integer
+        @param codegen: Dictionary of the functions / operations
+        generated as Python code (see generate). Default = None
+        @type codegen: dictionary
+        '''
+        self.threshold = threshold
+        self.max_size = max_size
+        self.codegen = codegen
+        self.counts = {}
+        self.programs = OrderedDict()
+        self.reach = 0
+        if codegen != None:
+            for operation in codegen.get('simple', {}).values():
+                if not isinstance(operation, dict):
+                    operation = {None: operation}
+                for (move, change) in operation.values():
+                    self.reach = max(self.reach, abs(move))
+        self.clear()
+
+    def clear(self):
+        '''
+        Removes all generated functions and counts, and resets the
+        statistics.
+        '''
+        self.counts.clear()
+        self.programs.clear()
+        self.compiled = 0
+        self.generated = 0
+        self.fallbacks = 0
+        self.interpreted = 0
+
+    def program(self, source, functions, function_size, specialised):
+        '''
+        Gives the generated function of a source, compiling the source
+        when it becomes hot, or None if the source is not hot or cannot
+        be compiled.
+        '''
+        key = (source, id(functions), function_size, id(specialised))
+        if key in self.programs:
+            (program, compiled_functions, compiled_specialised) = \
+                self.programs[key]
+            if compiled_functions is functions and \
+                compiled_specialised is specialised:
+                self.programs.move_to_end(key)
+                return program
+            del self.programs[key]
+        count = self.counts.get(key, 0) + 1
+        if count < self.threshold:
+            if len(self.counts) >= 10 * self.max_size:
+                self.counts.clear()
+            self.counts[key] = count
+            return None
+        if key in self.counts: del self.counts[key]
+        program = compile_source(source, functions, function_size,
+                                 specialised, self.codegen)
+        self.compiled = self.compiled + 1
+        if len(self.programs) >= self.max_size:
+            self.programs.popitem(last=False)
+        self.programs[key] = (program, functions, specialised)
+        return program
+
+    def execute(self, source, functions, function_size=1, inputdata=[],
+                array=None, size=30, max_instructions=1000, **options):
+        '''
+        Executes a source by its generated function if the source is hot
+        and can be compiled, or by register_machine.execute. Sources
+        executed with a profile, an execution budget, execution
+        checkpoints or detection of repeated states, or on tapes which are
+        not lists (see tapes), are executed by register_machine.execute.
+        Generated functions given an execution context are executed within
+        the context (see register_machine.within).
+
+        @param options: Other keyword arguments of register_machine.execute
+        (such as specialised).
+        @return: Results of execution - (array, apointer, inputdata,
+        output, source, spointer).
+
+        Other parameters are as of register_machine.execute.
+        '''
+        specialised = options.get('specialised')
+        program = None
+        if options.get('profile') == None and \
+            options.get('budget') == None and \
+            options.get('checkpoints') == None and \
+            options.get('repetition') == None and \
+            (array == None or type(array) is list) and \
+            size > self.reach and isinstance(source, str):
+            program = self.program(source, functions, function_size,
+                                   specialised)
+        if program == None:
+            self.interpreted = self.interpreted + 1
+            return register_machine.execute(source, functions,
+                                            function_size, inputdata,
+                                            array, size, max_instructions,
+                                            **options)
+        if array == None: tape = [0] * size
+        else: tape = array[0:size]
+        context = options.get('context')
+        try:
+            if context == None:
+                (tape, apointer, remaining, output, spointer) = \
+                    program(tape, 0, list(inputdata), [], size,
+                            max_instructions)
+            else:
+                previous = register_machine.current_context()
+                register_machine.contexts.current = context
+                try:
+                    (tape, apointer, remaining, output, spointer) = \
+                        program(tape, 0, list(inputdata), [], size,
+                                max_instructions)
+                finally:
+                    register_machine.contexts.current = previous
+        except Exception:
+            self.fallbacks = self.fallbacks + 1
+            return register_machine.execute(source, functions,
+                                            function_size, inputdata,
+                                            array, size, max_instructions,
+                                            **options)
+        self.generated = self.generated + 1
+        if isinstance(inputdata, list):
+            inputdata[:] = remaining
+            remaining = inputdata
+        result = (tape, apointer, remaining, output, source, spointer)
+        if options.get('context') != None:
+            options['context'].store(*result)
+        return result
+
+    def statistics(self):
+        '''
+        Gives the statistics of the cache.
+
+        @return: Dictionary of number of compiled sources, executions by
+        generated functions, fallbacks to register_machine.execute (after
+        an exception or a change of the source in a generated function),
+        executions by register_machine.execute (interpreted), and number
+        of generated functions (size).
+        '''
+        return {'compiled': self.compiled,
+                'generated': self.generated,
+                'fallbacks': self.fallbacks,
+                'interpreted': self.interpreted,
+                'size': len(self.programs)}
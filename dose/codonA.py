@@ -16,25 +16,34 @@ The interpreter environment consists of the following elements:
 When the program terminates, 4 elements (Array, Source, Input List and 
 Output List) are returned, and the interpreter terminates itself. 
 '''
+from . import register_machine
+
 codonLength = 3
 
-stackA = []
-stackB = []
+# Stacks of the default context (see register_machine.Context). The stack 
+# instructions (see push and pop) use the stacks of the current context 
+# (see register_machine.current_context).
+stackA = register_machine.default_context.stack("A")
+stackB = register_machine.default_context.stack("B")
 
 def push(x, stack):
     if stack.upper() == "A":
+        stackA = register_machine.current_context().stack("A")
         stackA.append(x)
         return stackA
     elif stack.upper() == "B":
+        stackB = register_machine.current_context().stack("B")
         stackB.append(x)
         return stackB
 
 def pop(stack):
     if stack.upper() == "A":
+        stackA = register_machine.current_context().stack("A")
         try: x = stackA.pop()
         except IndexError: x = 0
         return (x, stackA)
     elif stack.upper() == "B":
+        stackB = register_machine.current_context().stack("B")
         try: x = stackB.pop()
         except IndexError: x = 0
         return (x, stackB)
@@ -221,4 +230,147 @@ interpreter = {'TTT': stack, 'TTC': stack,
                'AGA': accumulator, 'AGG': accumulator,
                'GGT': accumulator, 'GGC': accumulator,
                'GGA': accumulator, 'GGG': accumulator}
-               
\ No newline at end of file
+               
+def _cells(indexes, operation):
+    '''
+    Generates a specialised operation (see register_machine.DispatchTable) 
+    replacing the values of cells (by indexes) with the values given by 
+    operation on the tape, or leaving the tape unchanged if operation 
+    gives None. The values are only written after all the cells are 
+    checked to be on the tape.
+    '''
+    last = max(indexes)
+    def handler(array, apointer, inputdata, output, source, spointer):
+        values = operation(array)
+        if values != None:
+            array[last]
+            for (index, value) in zip(indexes, values):
+                array[index] = value
+        return (array, apointer, inputdata, output, source, spointer)
+    return handler
+
+def _input_cell(index):
+    '''
+    Generates a specialised operation (see register_machine.DispatchTable) 
+    adding an input value into the cell of the same index.
+    '''
+    def handler(array, apointer, inputdata, output, source, spointer):
+        array[index] = array[index] + inputdata[index]
+        return (array, apointer, inputdata, output, source, spointer)
+    return handler
+
+def _stack_operation(operation):
+    '''
+    Generates a specialised operation (see register_machine.DispatchTable) 
+    of stack instructions, where operation pushes into and pops from the 
+    stacks (see push and pop), and may write a popped value into a cell 
+    as its last change.
+    '''
+    def handler(array, apointer, inputdata, output, source, spointer):
+        operation(array, inputdata)
+        return (array, apointer, inputdata, output, source, spointer)
+    return handler
+
+def _pop_into(array, index, stack):
+    (x, popped) = pop(stack)
+    array[index] = x
+
+def _max_cells(a):
+    x = max(a[0], a[1], a[2], a[3])
+    return (x, x, x, x)
+
+def _min_cells(a):
+    x = min(a[0], a[1], a[2], a[3])
+    return (x, x, x, x)
+
+def _AAC(a):
+    if not a[0] > a[1]: return None
+    x = a[2] - a[3]
+    return (a[2] + x,)
+
+# Specialised operations of the Codon A instructions (see 
+# register_machine.DispatchTable), which do not change the tape, input list 
+# or output list before raising an exception, so that they are executed 
+# without copying the tape of tapes which cannot journal their changes 
+# (see register_machine.execute). Instructions which are not listed (the 
+# random increments and the output instructions) are executed by their 
+# functions.
+specialised_codonA = {
+    accumulator: {
+        'CCT': _cells((0,), lambda a: (a[0] - 1,)),
+        'CCC': _cells((1,), lambda a: (a[1] - 1,)),
+        'CCA': _cells((2,), lambda a: (a[2] - 1,)),
+        'CCG': _cells((3,), lambda a: (a[3] - 1,)),
+        'GGT': _cells((0,), lambda a: (a[0] + 1,)),
+        'GGC': _cells((1,), lambda a: (a[1] + 1,)),
+        'GGA': _cells((2,), lambda a: (a[2] + 1,)),
+        'GGG': _cells((3,), lambda a: (a[3] + 1,)),
+        'GAA': _cells((1,), lambda a: (a[2] - a[3],)),
+        'GAG': _cells((3,), lambda a: (a[0] - a[1],)),
+        'AGA': _cells((1,), lambda a: (a[2] + a[3],)),
+        'CGT': _cells((0,), lambda a: (a[0] + a[1],)),
+        'CGC': _cells((2,), lambda a: (a[2] + a[3],)),
+        'CGA': _cells((0,), lambda a: (a[0] - a[1],)),
+        'CGG': _cells((2,), lambda a: (a[2] - a[3],)),
+        'TAA': _cells((0, 1), lambda a: (0, 0)),
+        'TAG': _cells((2, 3), lambda a: (0, 0)),
+        'TGA': _cells((0, 1, 2, 3), lambda a: (0, 0, 0, 0)),
+        'AAT': _cells((1,), 
+            lambda a: (a[0] - a[1],) if a[2] > a[3] else None),
+        'AAC': _cells((3,), _AAC),
+        'AAA': _cells((1,), 
+            lambda a: (a[0] + a[1],) if a[2] > a[3] else None),
+        'AAG': _cells((0,), lambda a: None),
+        'AGG': _cells((0,), lambda a: None),
+        },
+    swap: {
+        'CAT': _cells((0, 1), lambda a: (a[1], a[0])),
+        'CAC': _cells((2, 3), lambda a: (a[3], a[2])),
+        'CAA': _cells((0, 2), lambda a: (a[2], a[0])),
+        'CAG': _cells((1, 3), lambda a: (a[3], a[1])),
+        'TGT': _cells((0, 1), 
+            lambda a: (a[1], a[0]) if a[2] > a[3] else None),
+        'TGC': _cells((2, 3), 
+            lambda a: (a[3], a[2]) if a[0] > a[1] else None),
+        'GCT': _cells((1,), lambda a: (max(a[0], a[1]),)),
+        'GCC': _cells((3,), lambda a: (min(a[2], a[3]),)),
+        'GCA': _cells((1,), lambda a: (max(a[0], a[1]),)),
+        'GCG': _cells((3,), lambda a: (min(a[2], a[3]),)),
+        'ATG': _cells((0, 1, 2, 3), _max_cells),
+        'TGG': _cells((0, 1, 2, 3), _min_cells),
+        },
+    inputOp: {
+        'CTT': _input_cell(0),
+        'CTC': _input_cell(1),
+        'CTA': _input_cell(2),
+        'CTG': _input_cell(3),
+        'TAT': _stack_operation(lambda a, i: push(i[0] + i[1], "A")),
+        'TAC': _stack_operation(lambda a, i: push(i[2] + i[3], "B")),
+        },
+    stack: {
+        'TTT': _stack_operation(lambda a, i: push(pop("A")[0], "B")),
+        'TTC': _stack_operation(lambda a, i: push(pop("B")[0], "A")),
+        'TTA': _stack_operation(
+            lambda a, i: (push(i[0], "A"), push(i[1], "A"))),
+        'TTG': _stack_operation(
+            lambda a, i: (push(i[2], "B"), push(i[3], "B"))),
+        'GTT': _stack_operation(lambda a, i: push(a[0], "A")),
+        'GTC': _stack_operation(lambda a, i: push(a[1], "A")),
+        'GTA': _stack_operation(lambda a, i: push(a[2], "B")),
+        'GTG': _stack_operation(lambda a, i: push(a[3], "B")),
+        'ACT': _stack_operation(lambda a, i: _pop_into(a, 0, "A")),
+        'ACC': _stack_operation(lambda a, i: _pop_into(a, 1, "A")),
+        'ACA': _stack_operation(lambda a, i: _pop_into(a, 2, "B")),
+        'ACG': _stack_operation(lambda a, i: _pop_into(a, 3, "B")),
+        },
+    }
+
+# Operations of Codon A using random numbers or the stacks of the current 
+# context, whose results do not depend only on the tape, the input list 
+# and the output list (see register_machine.Repetition).
+nondeterministic_codonA = [accumulator, inputOp, outputOp, stack]
+
+# Operations of sources of Codon A which are not compiled into generated 
+# functions (see codegen.generate), as a generated function which is 
+# executed again by register_machine.execute would change the stacks twice.
+codegen_codonA = {'excluded': nondeterministic_codonA}
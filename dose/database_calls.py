@@ -70,7 +70,8 @@ def db_log_simulation_parameters(con, cur, sim_parameters):
     starting time of current simulation (start_time) and name of the 
     current simulation (simulation_name) are used as complex primary key 
     to identify the current simulation. All parameters will be logged, 
-    except for "starting_time" and "simulation_name".
+    except for "starting_time", "simulation_name" and "simulation_state" 
+    (see simulation_calls.simulation_state).
     
     The following transformations of data are made:
         - Population name (key = "population_names") is a list of names. 
@@ -96,7 +97,8 @@ def db_log_simulation_parameters(con, cur, sim_parameters):
     start_time = sim_parameters["starting_time"]
     simulation_name = sim_parameters["simulation_name"]
     for key in [k for k in list(sim_parameters.keys()) 
-                if k not in ("simulation_name", "starting_time")]:
+                if k not in ("simulation_name", "starting_time",
+                             "simulation_state")]:
         value = sim_parameters[key]
         if key in ("population_names", "chromosome_bases", 
                    "ragaraja_instructions"):
@@ -141,6 +143,38 @@ def db_report(con, cur, sim_functions, start_time,
     con.commit()
     return (con, cur)
 
+def db_log_profile(con, cur, start_time, pop_name, generation_count, 
+                   profile):
+    '''
+    Function to log the execution profile of the chromosomes of a 
+    population (see register_machine.Profile) into the miscellaneous 
+    table, where the key is "chromosome_profile|<population name>|<name 
+    of statistic>" for each statistic of the profile, and the value is the 
+    statistic (dictionaries are logged as strings, which can be read by 
+    ast.literal_eval).
+    
+    @param con: Database connector from connect_database() function. 
+    @param cur: Database cursor from connect_database() function.
+    @param start_time: Starting time of current simulation in the format 
+    of <date>-<seconds since epoch>; for example, 2013-10-11-1381480985.77.
+    @param pop_name: Name of the population.
+    @param generation_count: Current number of generations simulated.
+    @param profile: register_machine.Profile object.
+    @return: (con, cur) where 
+        - con = connector
+        - cur = cursor 
+    
+    @since: version 1.0.6
+    '''
+    statistics = profile.statistics()
+    for key in sorted(statistics):
+        cur.execute('''insert into miscellaneous values (?,?,?,?)''', 
+                    (str(start_time), str(generation_count),
+                     '|'.join(['chromosome_profile', str(pop_name), key]),
+                     str(statistics[key])))
+    con.commit()
+    return (con, cur)
+
 def db_list_simulations(cur, table='parameters'):
     '''
     Function to list simulations, identified by starting time of the 
@@ -368,7 +402,7 @@ def db_get_organisms_chromosome_sequences(cur, start_time,
     for gen in list(genome_dict.keys()):
         results[gen] = {}
         for identity in list(genome_dict[gen].keys()):
-            results[gen][identity] = [chromosome.sequence 
+            results[gen][identity] = [chromosome.read_sequence() 
                             for chromosome in genome_dict[gen][identity]]
     return results    
 
@@ -60,6 +60,24 @@ class dose_functions():
         @return: None
         '''
         raise NotImplementedError
+    def population_mutation_scheme(self, Populations, pop_name):
+        '''
+        Method / function to trigger mutational events in the organisms 
+        of a population. This function works at the level of entire 
+        population(s). By default, mutation_scheme is called for each 
+        organism; this method can be over-ridden to mutate the whole 
+        population at once, such as point mutations across a population 
+        matrix (see population_matrix.point_mutation) when all organisms 
+        have chromosomes of the same length.
+        
+        @param Populations: A dictionary containing one or more populations 
+        where the value is a genetic.Population object.
+        @param pop_name: Name of the population which is used as key in 
+        the the dictionary (Populations parameter).
+        @return: None
+        '''
+        for organism in Populations[pop_name].agents:
+            self.mutation_scheme(organism)
     def prepopulation_control(self, Populations, pop_name):
         '''
         Method / function to trigger population control events before 
@@ -300,6 +318,25 @@ class dose_functions():
         @return: None
         '''
         raise NotImplementedError
+    def chromosome_profile(self, Populations, pop_name, statistics):
+        '''
+        Method / function to receive the execution profile of the 
+        chromosomes of a population in the current generation, when 
+        "profile_chromosome" in the simulation parameters is True. This 
+        is called after the chromosomes of the population are interpreted 
+        (see simulation_calls.interpret_chromosome). The profile is not 
+        used by default; this method can be over-ridden to report or 
+        act on the profile.
+        
+        @param Populations: A dictionary containing one or more populations 
+        where the value is a genetic.Population object.
+        @param pop_name: Name of the population which is used as key in 
+        the the dictionary (Populations parameter).
+        @param statistics: Statistics of the profile (see 
+        register_machine.Profile.statistics).
+        @return: None
+        '''
+        pass
     def database_report(self, con, cur, start_time,
                         Population, World, generation_count):
         '''
@@ -406,7 +443,7 @@ def database_report_populations(con, cur, start_time,
             # log each chromosome sequence
             for chromosome_count in range(len(org.genome)):
                 key = 'chromosome_' + str(chromosome_count)
-                sequence = ''.join(org.genome[chromosome_count].sequence)
+                sequence = org.genome[chromosome_count].joined()
                 cur.execute('insert into organisms values (?,?,?,?,?,?)', 
                     (str(start_time), str(pop_name), org_name, 
                      generation, key, sequence))
@@ -42,7 +42,7 @@ class Population(g.Population):
     def postpopulation_control(self): pass
     def generation_events(self): pass
     def report(self):
-        sequences = [''.join(org.genome[0].sequence) 
+        sequences = [''.join(org.genome[0].read_sequence()) 
                      for org in self.agents]
         return '\t'.join(sequences)
     
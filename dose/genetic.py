@@ -6,12 +6,173 @@ Date created: 23rd February 2010
 Ling, MHT. 2010. A genetic algorithm framework grounded in biology.
 The Python Papers Source Codes 2: 6. 
 """
-import random, os, string
-from copy import deepcopy
+import bisect, math, random, os, string
+from copy import copy, deepcopy
+
+def _taken_slots(ranks):
+    """
+    Gives the slots taken by a series of ranks, where each rank in turn 
+    takes the free slot of that rank (counting from 0) among the slots 
+    which are not yet taken. Only the taken slots are tracked, so the 
+    number of slots does not matter.
+    
+    @param ranks: list of ranks.
+    @return: list of slots taken, in the order of the ranks.
+    
+    @since: version 1.0.6
+    """
+    taken = []
+    slots = []
+    for rank in ranks:
+        slot = rank
+        while True:
+            shifted = rank + bisect.bisect_right(taken, slot)
+            if shifted == slot: break
+            slot = shifted
+        bisect.insort(taken, slot)
+        slots.append(slot)
+    return slots
+
+def _poisson(mean):
+    """
+    Gives a random number from a Poisson distribution, by counting the 
+    uniform random numbers multiplied until their product is below 
+    exp(-mean) (Knuth's method), in parts of means of up to 500 for large 
+    means. This takes time in proportion to the mean.
+    
+    @param mean: mean of the Poisson distribution.
+    @return: random number of events.
+    
+    @since: version 1.0.6
+    """
+    count = 0
+    while mean > 0:
+        part = min(mean, 500.0)
+        mean = mean - part
+        limit = math.exp(-part)
+        product = random.random()
+        while product > limit:
+            count = count + 1
+            product = product * random.random()
+    return count
+
+class RateMap(object):
+    """
+    Map of mutation rates per position of a chromosome, for mutational 
+    hotspots, coldspots and codon position bias (see Chromosome.rmutate). 
+    The rate of a base is the rate of the last region containing the base 
+    (or the default rate if no region contains the base), multiplied by 
+    the bias of its codon position.
+    
+    The number of mutations in a chromosome is drawn from a Poisson 
+    distribution with a mean of the sum of the rates of its bases, and 
+    the positions of the mutations are drawn from the rates of the bases 
+    using an alias table (Vose's method), so that sampling takes time in 
+    proportion to the number of mutations. The tables are kept for each 
+    length of chromosome, so one map can be used for a population.
+    
+    @since: version 1.0.6
+    """
+    def __init__(self, rate=0.01, regions=None, codon=None):
+        """
+        Constructor method.
+        
+        @param rate: default probability of mutation per base. 
+            Default = 0.01 (1%).
+        @param regions: list of (start, end, rate) of regions, where the 
+            bases from start to end (inclusive; negative positions are 
+            counted from the end of the chromosome) have the rate. 
+            Default = None (no regions).
+        @param codon: list of multipliers of the rates of the bases by 
+            codon position (position of the base modulo the length of the 
+            list). For example, [1, 1, 3] triples the rates of the third 
+            bases of codons. Default = None (no codon position bias).
+        """
+        self.rate = rate
+        self.regions = list(regions or [])
+        self.codon = codon
+        self.tables = {}
+    
+    def rates(self, length):
+        """
+        Gives the mutation rates of the bases of a chromosome.
+        
+        @param length: length of the chromosome.
+        @return: list of rates, one per base.
+        """
+        rates = [float(self.rate)] * length
+        for (start, end, rate) in self.regions:
+            if start < 0: start = length + start
+            if end < 0: end = length + end
+            start = max(start, 0)
+            end = min(end, length - 1)
+            if end >= start: 
+                rates[start:end + 1] = [float(rate)] * (end - start + 1)
+        if self.codon:
+            rates = [rates[i] * self.codon[i % len(self.codon)] 
+                     for i in range(length)]
+        return [max(rate, 0.0) for rate in rates]
+    
+    def table(self, length, background=0.0):
+        """
+        Gives the alias table of a length of chromosome, which is kept 
+        for later use.
+        
+        @param length: length of the chromosome.
+        @param background: background mutation rate of the chromosome, 
+            which is added to the rate of every base. Default = 0.0
+        @return: (total rate, probabilities, aliases)
+        """
+        key = (length, background)
+        if key in self.tables: return self.tables[key]
+        # chromosomes changing in length (by insertions, deletions or 
+        # duplications) give many lengths, so old tables are dropped
+        if len(self.tables) >= 64: self.tables = {}
+        rates = [max(rate + background, 0.0) 
+                 for rate in self.rates(length)]
+        total = sum(rates)
+        probability = [1.0] * length
+        alias = list(range(length))
+        if total > 0:
+            scaled = [rate * length / total for rate in rates]
+            small = [i for i in range(length) if scaled[i] < 1.0]
+            large = [i for i in range(length) if scaled[i] >= 1.0]
+            while small and large:
+                less = small.pop()
+                more = large.pop()
+                probability[less] = scaled[less]
+                alias[less] = more
+                scaled[more] = scaled[more] + scaled[less] - 1.0
+                if scaled[more] < 1.0: small.append(more)
+                else: large.append(more)
+        self.tables[key] = (total, probability, alias)
+        return self.tables[key]
+    
+    def sample(self, length, background=0.0):
+        """
+        Gives the positions of random mutations in a chromosome, with a 
+        Poisson number of mutations.
+        
+        @param length: length of the chromosome.
+        @param background: background mutation rate of the chromosome. 
+            Default = 0.0
+        @return: list of positions, in the order drawn.
+        """
+        (total, probability, alias) = self.table(length, background)
+        if total <= 0: return []
+        positions = []
+        for i in range(_poisson(total)):
+            position = random.randrange(length)
+            if random.random() >= probability[position]:
+                position = alias[position]
+            positions.append(position)
+        return positions
 
 class Chromosome(object):
     """
-    Representation of a linear chromosome.
+    Representation of a linear chromosome. The sequence is read by 
+    read_sequence, and changed through the sequence attribute (see 
+    sequence).
 
     @see: Lim, JZR, Aw, ZQ, Goh, DJW, How, JA, Low, SXZ, Loo, BZL,
     Ling, MHT. 2010. A genetic algorithm framework grounded in biology.
@@ -37,6 +198,8 @@ class Chromosome(object):
         self.sequence = sequence
         self.base = base
         self.background_mutation = background_mutation
+        self.checkpoints = None
+        self.decoded = {}
     
     def rmutate(self, type='point', rate=0.01, start=0, end=-1):
         """
@@ -53,49 +216,191 @@ class Chromosome(object):
             stretch of chromosome to another random position). 
             Default = point.
         @param rate: probability of mutation per base above background
-            mutation rate. Default = 0.01 (1%). No mutation event will ever 
-            happen if (rate + background_mutation) is less than zero.
+            mutation rate, or a RateMap of probabilities of mutation per 
+            position (which gives a Poisson number of mutations over the 
+            whole chromosome, ignoring start and end). Default = 0.01 (1%). 
+            No mutation event will ever happen if (rate + 
+            background_mutation) is less than zero.
         @param start: starting base on the sequence for mutation.
             Default = 0, start of the genome.
         @param end: last base on the sequence for mutation. Default = -1, 
             end of the genome.
+        
+        All mutation events are drawn in one batch before the sequence is 
+        changed; point mutations are then assigned in one pass, and all 
+        deletions or insertions are made with a single rebuild of the 
+        sequence.
             
         @since: version 0.4
         """
-        if end > len(self.sequence) - 1: end = len(self.sequence) - 1
-        if end == -1: end = len(self.sequence) - 1
+        self.decoded = {}
+        if isinstance(rate, RateMap):
+            self._map_mutate(type, rate)
+            return
+        if end > len(self._sequence) - 1: end = len(self._sequence) - 1
+        if end == -1: end = len(self._sequence) - 1
         if start == end: start = 0
         length = int(end - start)
         mutation = int((self.background_mutation + rate) * length)
-        while mutation > 0:
-            position = int(start) + random.randrange(length - 1)
+        if int(start) < 0:
+            # positions counted from the end of the sequence shift with 
+            # every event, so the events are made one at a time
+            while mutation > 0:
+                position = int(start) + random.randrange(length - 1)
+                new_base = self.base[random.randrange(len(self.base))]
+                if type == 'point': 
+                    self.sequence[position] = new_base
+                if type == 'delete': 
+                    self.sequence.pop(position)
+                if type == 'insert': 
+                    self.sequence.insert(position, new_base)
+                if type == 'duplicate':
+                    end_pos = random.randrange(position + 1, end)
+                    fragment = self.sequence[position:end_pos]
+                    for i in range(len(fragment)):
+                        self.sequence.insert(end_pos + i, fragment[i])
+                if type == 'invert':
+                    end_pos = random.randrange(position + 1, end)
+                    fragment = [self.sequence.pop(position) 
+                                for i in range(end_pos - position)]
+                    fragment.reverse()
+                    for base in fragment:
+                        self.sequence.insert(position, base)
+                if type == 'translocate':
+                    end_pos = random.randrange(position + 1, end)
+                    fragment = [self.sequence.pop(position) 
+                                for i in range(end_pos - position)]
+                    insertion_point = random.randint(0, len(self.sequence))
+                    for i in range(len(fragment)):
+                        self.sequence.insert(insertion_point + i, 
+                                             fragment[i])
+                mutation = mutation - 1
+            return
+        # draw the positions, new bases and fragments of all events; a 
+        # failed draw is raised after the events drawn before it are made
+        events = []
+        failure = None
+        try:
+            for i in range(mutation):
+                position = int(start) + random.randrange(length - 1)
+                new_base = self.base[random.randrange(len(self.base))]
+                end_pos = None
+                insertion_point = None
+                if type in ('duplicate', 'invert', 'translocate'):
+                    end_pos = random.randrange(position + 1, end)
+                if type == 'translocate':
+                    insertion_point = random.randint(0, 
+                        len(self._sequence) - (end_pos - position))
+                if type == 'delete' and \
+                    position >= len(self._sequence) - len(events):
+                    raise IndexError('pop index out of range')
+                events.append((position, new_base, end_pos, 
+                               insertion_point))
+        except (IndexError, ValueError) as error:
+            failure = error
+        if len(events) > 0: 
+            self._mutate(type, events)
+        if failure is not None: 
+            raise failure
+    
+    def _map_mutate(self, type, rate_map):
+        """
+        Makes mutation events at positions drawn from a RateMap (see 
+        rmutate). Events at positions past the end of the sequence after 
+        earlier deletions, or too near the end of the sequence for a 
+        stretch, are not made.
+        
+        @param type: type of mutation (see rmutate).
+        @param rate_map: RateMap object.
+        
+        @since: version 1.0.6
+        """
+        positions = rate_map.sample(len(self._sequence), 
+                                    self.background_mutation)
+        end = len(self._sequence) - 1
+        events = []
+        for position in positions:
             new_base = self.base[random.randrange(len(self.base))]
-            if type == 'point': 
-                self.sequence[position] = new_base
-            if type == 'delete': 
-                self.sequence.pop(position)
-            if type == 'insert': 
-                self.sequence.insert(position, new_base)
-            if type == 'duplicate':
+            end_pos = None
+            insertion_point = None
+            if type == 'delete' and \
+                position >= len(self._sequence) - len(events):
+                continue
+            if type in ('duplicate', 'invert', 'translocate'):
+                if position + 1 >= end: continue
                 end_pos = random.randrange(position + 1, end)
-                fragment = self.sequence[position:end_pos]
-                for i in range(len(fragment)):
-                    self.sequence.insert(end_pos + i, fragment[i])
-            if type == 'invert':
-                end_pos = random.randrange(position + 1, end)
-                fragment = [self.sequence.pop(position) 
-                            for i in range(end_pos - position)]
-                fragment.reverse()
-                for base in fragment:
-                    self.sequence.insert(position, base)
             if type == 'translocate':
-                end_pos = random.randrange(position + 1, end)
-                fragment = [self.sequence.pop(position) 
-                            for i in range(end_pos - position)]
-                insertion_point = random.randint(0, len(self.sequence))
-                for i in range(len(fragment)):
-                    self.sequence.insert(insertion_point + i, fragment[i])
-            mutation = mutation - 1
+                insertion_point = random.randint(0, 
+                    len(self._sequence) - (end_pos - position))
+            events.append((position, new_base, end_pos, insertion_point))
+        if len(events) > 0: 
+            self._mutate(type, events)
+    
+    def _mutate(self, type, events):
+        """
+        Makes the mutation events drawn by rmutate, rebuilding the 
+        sequence once for all deletions or insertions.
+        
+        @param type: type of mutation (see rmutate).
+        @param events: list of (position, new base, end of stretch, 
+            insertion point) tuples, in the order drawn.
+        
+        @since: version 1.0.6
+        """
+        if isinstance(self.sequence, CompactSequence):
+            values = bytearray(self.sequence.tobytes())
+            events = [(position, ord(str(new_base)), end_pos, 
+                       insertion_point)
+                      for (position, new_base, end_pos, insertion_point) 
+                      in events]
+        else:
+            values = self.sequence
+        if type == 'point':
+            changes = dict([(position, new_base) 
+                            for (position, new_base, end_pos, 
+                                 insertion_point) in events])
+            for position in changes:
+                values[position] = changes[position]
+        elif type == 'delete':
+            # positions of deletions in the original sequence
+            deleted = _taken_slots([event[0] for event in events])
+            kept = values[:0]
+            previous = 0
+            for position in sorted(deleted):
+                kept += values[previous:position]
+                previous = position + 1
+            kept += values[previous:]
+            values[:] = kept
+        elif type == 'insert':
+            # positions of insertions in the mutated sequence, where 
+            # each inserted base is before the bases inserted later 
+            # at or before its position
+            inserted = _taken_slots([event[0] 
+                                     for event in reversed(events)])
+            inserted = sorted(zip(inserted, 
+                [event[1] for event in reversed(events)]))
+            mutated = values[:0]
+            previous = 0
+            for (position, new_base) in inserted:
+                count = position - len(mutated)
+                mutated += values[previous:previous + count]
+                mutated.append(new_base)
+                previous = previous + count
+            mutated += values[previous:]
+            values[:] = mutated
+        elif type == 'duplicate':
+            for (position, new_base, end_pos, insertion_point) in events:
+                values[end_pos:end_pos] = values[position:end_pos]
+        elif type == 'translocate':
+            for (position, new_base, end_pos, insertion_point) in events:
+                fragment = values[position:end_pos]
+                del values[position:end_pos]
+                values[insertion_point:insertion_point] = fragment
+        # an inversion pops the stretch and inserts the reversed 
+        # stretch back base by base at the same position, which 
+        # restores the order of the stretch
+        if values is not self.sequence:
+            self.sequence[:] = values
     
     def kmutate(self, type='point', start=0, end=0, sequence=None, tpos=0):
         """
@@ -138,6 +443,7 @@ class Chromosome(object):
             
         @since: version 0.4
         """
+        self.decoded = {}
         if type == 'point':
             self.sequence[start] = sequence
         if type == 'delete': 
@@ -158,17 +464,563 @@ class Chromosome(object):
             for i in range(len(fragment)):
                 self.sequence.insert(tpos + i, fragment[i])
 
+    def program(self, decoder=None):
+        """
+        Gives the sequence of the chromosome as a source string, converted 
+        by a decoder if given. The source of each decoder is built once and 
+        kept until the chromosome is mutated (by rmutate or kmutate) or 
+        the sequence is given for changing (see sequence); hence, a 
+        sequence given by the sequence attribute should not be changed 
+        after the program is given.
+        
+        @param decoder: function converting the joined sequence into a 
+            source string (such as ragaraja.nBF_to_Ragaraja). Default = 
+            None, the joined sequence.
+        @return: source string.
+        
+        @since: version 1.0.6
+        """
+        decoded = getattr(self, 'decoded', None)
+        if decoded == None:
+            decoded = self.decoded = {}
+        if decoder not in decoded:
+            source = self.joined()
+            if decoder != None: 
+                source = decoder(source)
+            decoded[decoder] = source
+        return decoded[decoder]
+
+    def joined(self):
+        """
+        Gives the sequence of the chromosome as a string.
+        
+        @return: sequence string.
+        
+        @since: version 1.0.6
+        """
+        return ''.join(self._sequence)
+
+    @property
+    def sequence(self):
+        """
+        Sequence of the chromosome for changing (such as 
+        chromosome.sequence[i] = x). A replicated chromosome shares the 
+        sequence of its parent (see replicate) until the sequence is 
+        accessed by this attribute, which gives the chromosome its own 
+        copy of the sequence, and removes the decoded programs (see 
+        program), as the sequence may then be changed. Hence, 
+        read_sequence should be used to read the sequence without 
+        changing it.
+        
+        @since: version 1.0.6
+        """
+        if getattr(self, '_shared', False):
+            self._sequence = copy(self._sequence)
+            self._shared = False
+        self.decoded = {}
+        return self._sequence
+
+    @sequence.setter
+    def sequence(self, sequence):
+        self._sequence = sequence
+        self._shared = False
+
+    def read_sequence(self):
+        """
+        Gives the sequence of the chromosome for reading, without copying 
+        a sequence shared with replicated chromosomes (see replicate). The 
+        sequence must not be changed. This should be used wherever the 
+        sequence is only read (such as in fitness functions and reports), 
+        and the sequence attribute only where the sequence is changed (see 
+        sequence), as reading the sequence attribute gives the chromosome 
+        its own copy of the sequence.
+        
+        @return: sequence of the chromosome.
+        
+        @since: version 1.0.6
+        """
+        return self._sequence
+
+    def __getstate__(self):
+        """
+        Pickles the chromosome without the decoded programs, which are 
+        kept by their decoders (see program).
+        
+        @since: version 1.0.6
+        """
+        state = dict(self.__dict__)
+        state['decoded'] = {}
+        return state
+
+    def __setstate__(self, state):
+        """
+        Unpickles the chromosome, including chromosomes pickled (such as 
+        by freezing populations) before sequences were shared.
+        
+        @since: version 1.0.6
+        """
+        if 'sequence' in state:
+            state = dict(state)
+            state['_sequence'] = state.pop('sequence')
+        self.__dict__.update(state)
+
+    def __deepcopy__(self, memo):
+        """
+        Copies the chromosome (copy-on-write), sharing the sequence, bases 
+        and decoded programs with the copy until either chromosome changes 
+        its sequence (see sequence). Other attributes are deep copied.
+        
+        @since: version 1.0.6
+        """
+        chromosome = self.__class__.__new__(self.__class__)
+        memo[id(self)] = chromosome
+        for (key, value) in self.__dict__.items():
+            if key in ('_sequence', 'base'):
+                chromosome.__dict__[key] = value
+            elif key == 'decoded':
+                chromosome.decoded = dict(value)
+            else:
+                chromosome.__dict__[key] = deepcopy(value, memo)
+        if '_sequence' in self.__dict__:
+            self._shared = True
+            chromosome._shared = True
+        return chromosome
+
     def replicate(self):
         """
-        Replicates (deep copy) the chromosome.
+        Replicates (deep copy) the chromosome. The sequence is shared with 
+        the replicated chromosome until either chromosome changes its 
+        sequence (copy-on-write), so replication takes the same time for 
+        any length of sequence.
         
         @return: a copy of current chromosome.
         
         @since: version 0.4
         """
         return deepcopy(self)
- 
+
+_packing_tables = {}
+
+def _packing_table(base):
+    """
+    Gives the translation tables for packing the bases of a 4-letter 
+    alphabet into 2-bit codes (see CompactSequence) - the table of codes 
+    of the bases (4 for other characters), the tables of codes shifted to 
+    each of the 4 positions in a byte, and the tables of the bases at each 
+    of the 4 positions of a byte. The tables are kept for re-use.
+    
+    @since: version 1.0.6
+    """
+    base = tuple(base)
+    if base not in _packing_tables:
+        codes = bytearray([4] * 256)
+        for i in range(len(base)):
+            codes[ord(base[i])] = i
+        shifts = [bytes([(x % 4) << (2 * k) for x in range(256)])
+                  for k in range(4)]
+        unpacks = [bytes([ord(base[((x >> (2 * k)) & 3) % len(base)]) 
+                          for x in range(256)])
+                   for k in range(4)]
+        _packing_tables[base] = (bytes(codes), shifts, unpacks)
+    return _packing_tables[base]
+
+class CompactSequence(object):
+    """
+    Sequence of bases in a byte array, for chromosomes of long sequences 
+    (see CompactChromosome). The bases have to be single (ASCII) 
+    characters, which are stored as one byte per base, or packed as 2-bit 
+    codes of four bases in each byte for alphabets of up to 4 bases. The 
+    sequence can be used as a list of bases - by indexing, slicing, 
+    iteration, assignment of a base, insertion, deletion and 
+    concatenation - and gives the sequence as bytes or a string in a 
+    single copy (see tobytes and tostring), or a view of the bytes of an 
+    unpacked sequence without copying (see view).
+    
+    @since: version 1.0.6
+    """
+    def __init__(self, sequence=(), base='ATCG', packed=False):
+        """
+        @param sequence: a subscriptable object (list or string) of bases, 
+            or bytes of the characters of the bases.
+        @param base: a subscriptable object (list or string) representing 
+            allowable bases, which are single characters.
+        @param packed: pack the bases as 2-bit codes (for up to 4 bases). 
+            Default = False.
+        """
+        self.base = [str(x) for x in base]
+        for x in self.base:
+            if len(x) != 1 or ord(x) > 127:
+                raise ValueError('Bases of compact sequences have to be \
+single ASCII characters: ' + repr(x))
+        if packed and len(self.base) > 4:
+            raise ValueError('Packed sequences have up to 4 bases, not ' + \
+                             str(len(self.base)))
+        self.packed = packed
+        self._store(self._characters(sequence))
+
+    def _characters(self, sequence):
+        """
+        Gives the bytes of the characters of a sequence of bases.
+        """
+        if isinstance(sequence, CompactSequence):
+            return sequence.tobytes()
+        if isinstance(sequence, (bytes, bytearray)):
+            return bytes(sequence)
+        return ''.join([str(x) for x in sequence]).encode('ascii')
+
+    def _store(self, characters):
+        """
+        Stores the bytes of the characters of the bases.
+        """
+        self.length = len(characters)
+        if not self.packed:
+            self.data = bytearray(characters)
+            return
+        (codes, shifts, unpacks) = _packing_table(self.base)
+        characters = bytes(characters).translate(codes)
+        if 4 in characters:
+            raise ValueError('Sequence has bases not in ' + repr(self.base))
+        characters = characters + bytes(-len(characters) % 4)
+        size = len(characters) // 4
+        packed = 0
+        for k in range(4):
+            packed = packed | int.from_bytes(
+                characters[k::4].translate(shifts[k]), 'little')
+        self.data = bytearray(packed.to_bytes(size, 'little'))
+
+    def _index(self, index):
+        """
+        Gives the non-negative position of an index, or raises IndexError.
+        """
+        if index < 0: index = index + self.length
+        if index < 0 or index >= self.length:
+            raise IndexError('sequence index out of range')
+        return index
+
+    def _code(self, value):
+        """
+        Gives the byte (character, or 2-bit code if packed) of a base.
+        """
+        value = str(value)
+        if self.packed:
+            if value not in self.base:
+                raise ValueError(repr(value) + ' is not in ' + 
+                                 repr(self.base))
+            return self.base.index(value)
+        if len(value) != 1:
+            raise ValueError(repr(value) + ' is not a single character')
+        return ord(value)
+
+    def tobytes(self):
+        """
+        Gives the characters of the bases as bytes (a copy).
+        
+        @since: version 1.0.6
+        """
+        if not self.packed:
+            return bytes(self.data)
+        (codes, shifts, unpacks) = _packing_table(self.base)
+        characters = bytearray(4 * len(self.data))
+        for k in range(4):
+            characters[k::4] = self.data.translate(unpacks[k])
+        return bytes(characters[:self.length])
+
+    def tostring(self):
+        """
+        Gives the sequence as a string (such as the source of the 
+        chromosome for the interpreter).
+        
+        @since: version 1.0.6
+        """
+        if not self.packed:
+            return self.data.decode('ascii')
+        return self.tobytes().decode('ascii')
+
+    def view(self):
+        """
+        Gives a read-only view of the characters of the bases (as a 
+        memoryview), which is not a copy for unpacked sequences; the view 
+        of an unpacked sequence has to be released (or dropped) before the 
+        length of the sequence is changed.
+        
+        @since: version 1.0.6
+        """
+        if not self.packed:
+            return memoryview(self.data).toreadonly()
+        return memoryview(self.tobytes())
+
+    def __copy__(self):
+        sequence = CompactSequence.__new__(CompactSequence)
+        sequence.__dict__.update(self.__dict__)
+        sequence.data = bytearray(self.data)
+        return sequence
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        return iter(self.tostring())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return CompactSequence(self.tobytes()[index], self.base, 
+                                   self.packed)
+        index = self._index(index)
+        if not self.packed:
+            return chr(self.data[index])
+        code = (self.data[index >> 2] >> ((index & 3) << 1)) & 3
+        return self.base[code]
+
+    def __setitem__(self, index, value):
+        if index == slice(None):
+            self._store(self._characters(value))
+            return
+        if isinstance(index, slice):
+            characters = bytearray(self.tobytes())
+            characters[index] = self._characters(value)
+            self._store(characters)
+            return
+        index = self._index(index)
+        code = self._code(value)
+        if not self.packed:
+            self.data[index] = code
+            return
+        shift = (index & 3) << 1
+        self.data[index >> 2] = (self.data[index >> 2] & ~(3 << shift)) | \
+                                (code << shift)
+
+    def __delitem__(self, index):
+        if not self.packed:
+            del self.data[index]
+            self.length = len(self.data)
+            return
+        characters = bytearray(self.tobytes())
+        del characters[index]
+        self._store(characters)
+
+    def insert(self, index, value):
+        """
+        Inserts a base before the index.
         
+        @since: version 1.0.6
+        """
+        code = self._code(value)
+        if not self.packed:
+            self.data.insert(index, code)
+            self.length = len(self.data)
+            return
+        characters = bytearray(self.tobytes())
+        characters.insert(index, ord(self.base[code]))
+        self._store(characters)
+
+    def pop(self, index=-1):
+        """
+        Removes and gives the base at the index (default last).
+        
+        @since: version 1.0.6
+        """
+        value = self[index]
+        del self[index]
+        return value
+
+    def append(self, value):
+        """
+        Appends a base to the end of the sequence.
+        
+        @since: version 1.0.6
+        """
+        self.insert(self.length, value)
+
+    def extend(self, values):
+        """
+        Appends bases to the end of the sequence.
+        
+        @since: version 1.0.6
+        """
+        self[self.length:] = values
+
+    def __add__(self, other):
+        return CompactSequence(self.tobytes() + self._characters(other), 
+                               self.base, self.packed)
+
+    def __radd__(self, other):
+        return CompactSequence(self._characters(other) + self.tobytes(), 
+                               self.base, self.packed)
+
+    def __eq__(self, other):
+        if isinstance(other, CompactSequence):
+            return self.tobytes() == other.tobytes()
+        try: return list(self) == list(other)
+        except TypeError: return False
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return repr(list(self))
+
+class CompactChromosome(Chromosome):
+    """
+    Representation of a linear chromosome where the sequence is a compact 
+    sequence (see CompactSequence), which stores each base in a byte, or 
+    packs 4 bases into each byte for alphabets of up to 4 bases, instead 
+    of a list of bases. The bases have to be single characters (such as 
+    the bases of Ragaraja or nBF chromosomes). Mutations (rmutate and 
+    kmutate), replication and crossover are the same as of Chromosome.
+    
+    @since: version 1.0.6
+    """
+    def __init__(self, sequence, base, background_mutation=0.0001,
+                 packed=None):
+        """
+        Sets up a chromosome.
+        
+        @param sequence: a subscriptable object (list or string) 
+            representing the sequence of the chromosome, or a compact 
+            sequence.
+        @param base: a subscriptable object (list or string) representing
+            allowable entities in the sequence, which are single characters.
+        @param background_mutation: background mutation rate represented 
+            as the probability of number of mutations per base. Default = 
+            0.0001 (0.01%).
+        @param packed: pack the bases as 2-bit codes (for up to 4 bases). 
+            Default = None, packed if the sequence is a packed compact 
+            sequence.
+            
+        @since: version 1.0.6
+        """
+        if packed == None:
+            packed = isinstance(sequence, CompactSequence) and \
+                sequence.packed
+        if not isinstance(sequence, CompactSequence) or \
+            sequence.packed != packed or \
+            sequence.base != [str(x) for x in base]:
+            sequence = CompactSequence(sequence, base, packed)
+        Chromosome.__init__(self, sequence, base, background_mutation)
+
+    def joined(self):
+        """
+        Gives the sequence of the chromosome as a string.
+        
+        @return: sequence string.
+        
+        @since: version 1.0.6
+        """
+        return self._sequence.tostring()
+
+# Types of values of status which are never changed in place, so they are 
+# shared by copies of status tables without being copied (see Status).
+_immutable_status = (type(None), bool, int, float, complex, str, bytes, 
+                     frozenset)
+
+class Status(dict):
+    """
+    Status table of an organism (see Organism), which is a dictionary 
+    where copies (see share) share the values of the table until they are 
+    used. Values which can be changed in place (such as lists) are deep 
+    copied when they are first read by a copy or its table, so that 
+    changing them does not change the other tables; other values (such as 
+    numbers and strings) are never copied. Values read by the dictionary 
+    methods (such as get, items and values) are copied likewise, and all 
+    shared values are copied when the keys of the table are iterated, so 
+    that copying the table into a dictionary (such as by dict(status) or 
+    {**status}) does not share its values.
+    
+    @since: version 1.0.6
+    """
+    def __init__(self, *args, **kwargs):
+        dict.__init__(self, *args, **kwargs)
+        self._shared = set()
+
+    def share(self):
+        """
+        Copies the status table (copy-on-write), sharing the values of the 
+        table with the copy.
+        
+        @return: copy of the status table.
+        """
+        status = Status(self)
+        shared = set([key for key in dict.keys(self)
+                      if type(dict.__getitem__(self, key)) 
+                      not in _immutable_status])
+        self._shared.update(shared)
+        status._shared = shared
+        return status
+
+    def _own(self, key):
+        """
+        Copies a shared value of the table before it is used.
+        """
+        shared = self.__dict__.get('_shared')
+        if shared and key in shared:
+            shared.discard(key)
+            if dict.__contains__(self, key):
+                dict.__setitem__(self, key, 
+                                 deepcopy(dict.__getitem__(self, key)))
+
+    def _own_all(self):
+        """
+        Copies all shared values of the table.
+        """
+        for key in list(self.__dict__.get('_shared', ())): 
+            self._own(key)
+
+    def __getitem__(self, key):
+        self._own(key)
+        return dict.__getitem__(self, key)
+
+    def __setitem__(self, key, value):
+        if self.__dict__.get('_shared'): self._shared.discard(key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        if self.__dict__.get('_shared'): self._shared.discard(key)
+        dict.__delitem__(self, key)
+
+    def get(self, key, default=None):
+        self._own(key)
+        return dict.get(self, key, default)
+
+    def setdefault(self, key, default=None):
+        self._own(key)
+        return dict.setdefault(self, key, default)
+
+    def pop(self, key, *default):
+        self._own(key)
+        return dict.pop(self, key, *default)
+
+    def popitem(self):
+        self._own_all()
+        return dict.popitem(self)
+
+    def update(self, *args, **kwargs):
+        for (key, value) in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        self._shared = set()
+        dict.clear(self)
+
+    def copy(self):
+        self._own_all()
+        return dict.copy(self)
+
+    def __iter__(self):
+        self._own_all()
+        return dict.__iter__(self)
+
+    def keys(self):
+        self._own_all()
+        return dict.keys(self)
+
+    def items(self):
+        self._own_all()
+        return dict.items(self)
+
+    def values(self):
+        self._own_all()
+        return dict.values(self)
+
 class Organism(object):
     """
     An organism represented by a list of chromosomes and a status table. 
@@ -237,7 +1089,7 @@ class Organism(object):
             
         @since: version 0.4
         """
-        self.status = {'alive': True,            # is the organism alive?
+        self.status = Status({'alive': True,     # is the organism alive?
                        'vitality': 100.0,        # % of vitality
                        'parents': None,          # identity of parent(s)
                        'age': 0.0,               # age of the organism
@@ -249,7 +1101,7 @@ class Organism(object):
                        'deme': None,             # sub-population or race
                        'location': None,         # location of the organism
                        'generation': 0,          # generation of organism
-                       'death': None}
+                       'death': None})
         if genome == 'dummy':
             self.genome = [Chromosome([0], [0])]
         else: 
@@ -287,9 +1139,9 @@ class Organism(object):
         
         @since: version 0.4
         """
-        one_count = sum([sum(chromosome.sequence) 
+        one_count = sum([sum(chromosome.read_sequence()) 
                          for chromosome in self.genome])
-        length_of_genome = sum([len(chromosome.sequence) 
+        length_of_genome = sum([len(chromosome.read_sequence()) 
                                 for chromosome in self.genome])
         return float(one_count) / float(length_of_genome)
     
@@ -374,11 +1226,37 @@ class Organism(object):
     
     def __str__(self):
         """Returns the genome of the organism"""
-        return str([chromosome.sequence for chromosome in self.genome])
+        return str([chromosome.read_sequence() 
+                    for chromosome in self.genome])
+        
+    def __deepcopy__(self, memo):
+        """
+        Copies the organism (copy-on-write), where the chromosomes share 
+        their sequences with the chromosomes of the organism (see 
+        Chromosome.replicate) and the status table shares its values with 
+        the status table of the organism (see Status.share). Other 
+        attributes are deep copied.
         
+        @since: version 1.0.6
+        """
+        if isinstance(self.__dict__.get('status'), dict) and \
+            not isinstance(self.status, Status):
+            self.status = Status(self.status)
+        org = self.__class__.__new__(self.__class__)
+        memo[id(self)] = org
+        for (key, value) in self.__dict__.items():
+            if key == 'status' and isinstance(value, Status):
+                org.status = value.share()
+            else:
+                org.__dict__[key] = deepcopy(value, memo)
+        return org
+
     def clone(self):
         """
-        Cloness (deep copy) the organism.
+        Cloness (deep copy) the organism. The sequences of chromosomes and 
+        the values of the status table are shared with the clone until 
+        they are changed (copy-on-write; see __deepcopy__), so cloning 
+        takes the same time for any length of genome.
         
         @return: a copy of current organism.
         
@@ -476,7 +1354,8 @@ class Population(object):
         for x in range(size):
             organism1 = self.agents[random.randint(0, size - 1)]
             organism2 = self.agents[random.randint(0, size - 1)]
-            crossover_pt = random.randint(0, len(organism1.genome[0].sequence))
+            crossover_pt = random.randint(0, 
+                len(organism1.genome[0].read_sequence()))
             (g1, g2) = crossover(organism1.genome[0], organism2.genome[0],
                                  crossover_pt)
             temp = temp + [Organism([g1])]
@@ -630,29 +1509,30 @@ def crossover(chromosome1, chromosome2, position):
     @return: (resulting chromosome1, resulting chromosome2)
 
     New chromosomes inherit their parent's crossed sequences, bases and
-    background mutation rate.
+    background mutation rate, and are of the class of their parent (such 
+    as CompactChromosome).
     
     @since: version 0.4
     """
-    seq1 = chromosome1.sequence
-    seq2 = chromosome2.sequence 
+    seq1 = chromosome1.read_sequence()
+    seq2 = chromosome2.read_sequence()
     position = int(position)
     if len(seq1) > position and len(seq2) > position:
-        new1 = Chromosome(seq1[:position] + seq2[position:], 
+        new1 = chromosome1.__class__(seq1[:position] + seq2[position:], 
                           chromosome1.base, chromosome1.background_mutation)
-        new2 = Chromosome(seq2[:position] + seq1[position:],
+        new2 = chromosome2.__class__(seq2[:position] + seq1[position:],
                           chromosome2.base, chromosome2.background_mutation)
         return (new1, new2)
     elif len(seq1) > position:
-        new1 = Chromosome(seq1[:position], chromosome1.base, 
+        new1 = chromosome1.__class__(seq1[:position], chromosome1.base, 
                           chromosome1.background_mutation)
-        new2 = Chromosome(chromosome2.sequence + seq1[position:],
+        new2 = chromosome2.__class__(seq2 + seq1[position:],
                           chromosome2.base, chromosome2.background_mutation)
         return (new1, new2)
     elif len(seq2) > position:
-        new1 = Chromosome(chromosome1.sequence + seq2[position:],
+        new1 = chromosome1.__class__(seq1 + seq2[position:],
                           chromosome1.base, chromosome1.background_mutation)
-        new2= Chromosome(seq2[:position], chromosome2.base, 
+        new2 = chromosome2.__class__(seq2[:position], chromosome2.base, 
                          chromosome2.background_mutation)
         return (new1, new2)
     else:
@@ -689,7 +1569,10 @@ def population_constructor(data=population_data):
         - 'chromosome_bases' = List of allowable bases. 
             Default = [1, 2, 3, 4].
         - 'chromosome_length' = Length of a chromosome. Default = 200.
-        - 'chromosome_type' = Type of chromosome. Default = 'defined'.
+        - 'chromosome_type' = Type of chromosome. Accepts 'defined' 
+            (Chromosome), 'compact' (CompactChromosome, one byte per base) 
+            or 'packed' (CompactChromosome, 2-bit packed bases for up to 4 
+            bases). Default = 'defined'.
         - 'initial_chromosome' = Initial chromosome. Default = [1] * 200.
         - 'background_mutation' = Background mutation rate. 
             Default = 0.0001 (0.01%).
@@ -732,9 +1615,16 @@ def population_constructor(data=population_data):
     
     @since: version 0.4
     """
-    chr = Chromosome(data['initial_chromosome'], 
-                     data['chromosome_bases'],
-                     data['background_mutation'])
+    if "chromosome_type" in data and \
+        data['chromosome_type'] in ('compact', 'packed'):
+        chr = CompactChromosome(data['initial_chromosome'], 
+                                data['chromosome_bases'],
+                                data['background_mutation'],
+                                data['chromosome_type'] == 'packed')
+    else:
+        chr = Chromosome(data['initial_chromosome'], 
+                         data['chromosome_bases'],
+                         data['background_mutation'])
     org = Organism([chr]*data['genome_size'],
                    data['mutation_type'],
                    data['additional_mutation'])
@@ -73,22 +73,35 @@ def cbf_start_loop(array, apointer, inputdata, output, source, spointer):
     Start loop. Operations after a start loop operator ("[") will only 
     be executed provided the loop(s) are properly closed. If the loops 
     are open, the program will terminate. Note that unclosed or unopened 
-    loops may result in non-deterministic behaviour. 
+    loops may result in non-deterministic behaviour. The end loop operator 
+    is looked up from the bracket table of the source (see 
+    register_machine.bracket_table).
     '''
     if array[apointer] > 0:
         return (array, apointer, inputdata, output, source, spointer)
-    else:
-        count = 1
-        try:
-            while count > 0:
-                spointer = spointer + 1
-                if source[spointer] == ']':
-                    count = count - 1
-                if source[spointer] == '[':
-                    count = count + 1
-        except IndexError:
-            spointer = len(source) - 1
-    return (array, apointer, inputdata, output, source, spointer)
+    (forward, backward) = r.bracket_table(source, '[', ']', 1)
+    if spointer not in forward:
+        forward[spointer] = _find_end_loop(source, spointer)
+    if forward[spointer] == None:
+        return (array, apointer, inputdata, output, source, len(source) - 1)
+    return (array, apointer, inputdata, output, source, forward[spointer])
+
+def _find_end_loop(source, spointer):
+    '''
+    Finds the end loop operator ("]") of the loop started at the source 
+    pointer, or None if the loop is not closed.
+    '''
+    count = 1
+    try:
+        while count > 0:
+            spointer = spointer + 1
+            if source[spointer] == ']':
+                count = count - 1
+            if source[spointer] == '[':
+                count = count + 1
+    except IndexError:
+        return None
+    return spointer
 
 def cbf_end_loop(array, apointer, inputdata, output, source, spointer):
     '''
@@ -96,23 +109,36 @@ def cbf_end_loop(array, apointer, inputdata, output, source, spointer):
     ("]") without a preceding start loop operator ("["). In this case, 
     the end loop operator ("]") will be ignored and execution continues. 
     Note that unclosed or unopened loops may result in non-deterministic 
-    behaviour. 
+    behaviour. The start loop operator is looked up from the bracket 
+    table of the source (see register_machine.bracket_table).
     '''
-    temp = spointer
     if array[apointer] < 1:
         return (array, apointer, inputdata, output, source, spointer + 1)
-    else:
-        count = 1
-        try:
-            while count > 0:
-                spointer = spointer - 1
-                if source[spointer] == ']':
-                    count = count + 1
-                if source[spointer] == '[':
-                    count = count - 1
-        except IndexError:
-            spointer = temp
-    return (array, apointer, inputdata, output, source, spointer)
+    (forward, backward) = r.bracket_table(source, '[', ']', 1)
+    if spointer not in backward:
+        backward[spointer] = _find_start_loop(source, spointer)
+    if backward[spointer] == None:
+        return (array, apointer, inputdata, output, source, spointer)
+    return (array, apointer, inputdata, output, source, backward[spointer])
+
+def _find_start_loop(source, spointer):
+    '''
+    Finds the start loop operator ("[") of the loop ended at the source 
+    pointer, or None if the loop is not opened. As the source is indexed, 
+    the search continues from the end of the source (as negative source 
+    pointer) after passing the start of the source.
+    '''
+    count = 1
+    try:
+        while count > 0:
+            spointer = spointer - 1
+            if source[spointer] == ']':
+                count = count + 1
+            if source[spointer] == '[':
+                count = count - 1
+    except IndexError:
+        return None
+    return spointer
 
 LCBF = {'+': increment,
         '-': decrement,
@@ -124,6 +150,43 @@ LCBF = {'+': increment,
         ']': cbf_end_loop,
         }
 
+# Simple operations (see register_machine.DispatchTable) of LCBF as 
+# (tape pointer move, change in value of current cell), for folding runs 
+# of simple instructions into superinstructions (see 
+# register_machine.Superinstruction).
+superinstructions_LCBF = {increment: (0, 1),
+                          decrement: (0, -1),
+                          forward: (1, 0),
+                          backward: (-1, 0),
+                          }
+
+def _accept_predefined(array, apointer, inputdata, output, source, spointer):
+    '''
+    Specialised operation of accept_predefined (see 
+    register_machine.DispatchTable), which removes the value from the 
+    input list only after it is written into the current cell.
+    '''
+    if len(inputdata) > 0:
+        array[apointer] = inputdata[0]
+        del inputdata[0]
+    else: array[apointer] = 0
+    return (array, apointer, inputdata, output, source, spointer)
+
+# Specialised operations of LCBF (see register_machine.DispatchTable), 
+# which do not change the tape, input list or output list before raising 
+# an exception, so that they are executed without copying the tape (see 
+# register_machine.execute). The loop 
+# operations look up the bracket table of the source.
+specialised_LCBF = {increment: increment,
+                    decrement: decrement,
+                    forward: forward,
+                    backward: backward,
+                    call_out: call_out,
+                    accept_predefined: _accept_predefined,
+                    cbf_start_loop: cbf_start_loop,
+                    cbf_end_loop: cbf_end_loop,
+                    }
+
 if __name__ == '__main__':
     print(r.interpret('++++++++++[>+++++<.-]', LCBF))
     print(r.interpret('++[>+++++<.-]>>>+++.', LCBF))
@@ -0,0 +1,594 @@
+'''
+Lockstep Register Machine
+Date created: 18th October 2026
+
+Executes a batch of register machines (see register_machine) in lockstep,
+where each step executes one instruction on every machine of the batch
+using NumPy arrays. The tapes of the machines are the rows of a tape
+matrix, and each machine has its own tape pointer, source pointer and
+instruction count. Machines executing different instructions in a step
+(divergence) are separated by masks of the machines executing each kind
+of instruction, and halted or finished machines are masked out.
+
+Only a deterministic core of instructions can be executed in lockstep
+(see LockstepTable):
+    1. Simple instructions, which only move the tape pointer or change the
+    value of the current cell by a fixed amount, or do nothing.
+    2. Loop start and loop end.
+    3. Output of the value of the current cell.
+    4. Arithmetic on the current cell, or on the current and the next cell
+    (see arithmetics).
+
+A machine reaching any other instruction (or an arithmetic instruction
+which cannot be executed exactly in lockstep, such as a division by zero)
+leaves the batch at that instruction, while the other machines carry on
+in lockstep, and is finished one at a time from its state at that
+instruction (see resume). Machines with tape cells which are not numbers
+are executed one at a time from the start. Hence, the results are the
+same as of register_machine.execute for every machine, including the
+types (integer or float) of the cell values.
+
+This requires NumPy (http://www.numpy.org/).
+'''
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from . import register_machine
+
+# Kinds of instructions (see LockstepTable).
+SIMPLE = 0
+LOOP_START = 1
+LOOP_END = 2
+OUTPUT = 3
+ARITHMETIC = 4
+SCALAR = 5
+
+# Arithmetic operations which can be executed in lockstep, where x is the
+# value of the current cell and y is the value of the next cell (the first
+# cell for the last cell of the tape). The result replaces the value of the
+# current cell. The operations are given as names in the 'arithmetic'
+# dictionary of lockstep operations (see LockstepTable), such as
+# ragaraja.lockstep_ragaraja.
+#     - 'double': 2 * x
+#     - 'half': 0.5 * x
+#     - 'add': x + y
+#     - 'subtract': y - x
+#     - 'multiply': y * x
+#     - 'divide': y / x (true division)
+#     - 'negate': -1 * x
+#     - 'truncate': int(x)
+arithmetics = {'double': 1,
+               'half': 2,
+               'add': 3,
+               'subtract': 4,
+               'multiply': 5,
+               'divide': 6,
+               'negate': 7,
+               'truncate': 8}
+
+class LockstepTable(object):
+    '''
+    Kinds of the instructions of a dictionary of functions / operations,
+    for executing sources in lockstep. Each instruction is one of the
+    following kinds:
+        0. Simple instruction, which changes the value of the current cell
+        by a fixed amount and then moves the tape pointer by a fixed amount.
+        1. Loop start, which jumps when the current cell is not more than 0.
+        2. Loop end, which jumps when the current cell is not less than 1.
+        3. Output, which appends the value of the current cell to the
+        output list.
+        4. Arithmetic operation (see arithmetics).
+        5. Scalar instruction, which cannot be executed in lockstep.
+
+    Sources are compiled into lists of the kind, tape pointer move, change
+    in value of current cell, jump (source pointer after a jump) and
+    arithmetic operation of each instruction, and the compiled sources are
+    kept for re-use.
+    '''
+    max_compiled = 1000
+
+    def __init__(self, functions, function_size=1, lockstep=None):
+        '''
+        @param functions: Dictionary of functions / operations.
+        @param function_size: Length of each instruction. Default = 1
+        @type function_size: integer
+        @param lockstep: Dictionary of the functions / operations which
+        can be executed in lockstep, where 'simple' is a dictionary of
+        simple functions / operations (as superinstructions of
+        register_machine.DispatchTable), 'loop_start', 'loop_end' and
+        'output' are lists of functions / operations of each kind, and
+        'arithmetic' is a dictionary of functions / operations to
+        dictionaries of instructions to names of arithmetic operations
+        (see arithmetics), such as ragaraja.lockstep_ragaraja.
+        Default = None (no functions / operations can be executed in
+        lockstep)
+        @type lockstep: dictionary
+        '''
+        self.functions = functions
+        self.function_size = function_size
+        if lockstep == None: lockstep = {}
+        self.lockstep = lockstep
+        self.operations = list(functions.values())
+        self.instructions = {}
+        self.compiled = {}
+        self.reach = 0
+        simple = lockstep.get('simple', {})
+        for operation in simple.values():
+            if not isinstance(operation, dict):
+                operation = {None: operation}
+            for (move, change) in operation.values():
+                self.reach = max(self.reach, abs(change))
+
+    def is_current(self):
+        '''
+        Checks that the dictionary of functions / operations had not been
+        changed (such as by ragaraja.activate_version) after the table was
+        generated.
+
+        @return: True if the table is current.
+        '''
+        if isinstance(self.functions, register_machine.InstructionTable):
+            return True
+        return list(self.functions.values()) == self.operations
+
+    def kind(self, instruction):
+        '''
+        Gives the kind, tape pointer move, change in value of current cell
+        and arithmetic operation of an instruction.
+
+        @param instruction: Instruction to look up.
+        @type instruction: string
+        @return: Tuple of (kind, move, change, arithmetic operation).
+        '''
+        if instruction in self.instructions:
+            return self.instructions[instruction]
+        kind = (SCALAR, 0, 0, 0)
+        handler = self.functions.get(instruction)
+        if handler != None:
+            simple = self.lockstep.get('simple', {}).get(handler)
+            if isinstance(simple, dict):
+                simple = simple.get(instruction)
+            arithmetic = self.lockstep.get('arithmetic', {}).get(handler)
+            if isinstance(arithmetic, dict):
+                arithmetic = arithmetic.get(instruction)
+            if simple != None:
+                kind = (SIMPLE, simple[0], simple[1], 0)
+            elif handler in self.lockstep.get('loop_start', []):
+                kind = (LOOP_START, 0, 0, 0)
+            elif handler in self.lockstep.get('loop_end', []):
+                kind = (LOOP_END, 0, 0, 0)
+            elif handler in self.lockstep.get('output', []):
+                kind = (OUTPUT, 0, 0, 0)
+            elif arithmetic != None:
+                kind = (ARITHMETIC, 0, 0, arithmetics[arithmetic])
+        self.instructions[instruction] = kind
+        return kind
+
+    def compile(self, source):
+        '''
+        Compiles a source into NumPy arrays of the kind, tape pointer move,
+        change in value of current cell, jump and arithmetic operation of
+        each instruction. The jumps of loop start and loop end are given by
+        their functions / operations, executed as if the jump is taken.
+        Loop starts and loop ends jumping to negative source pointers, or
+        to source pointers which are not at the start of an instruction,
+        are compiled as scalar instructions.
+
+        @param source: Instructions to compile.
+        @type source: string
+        @return: Tuple of (kinds, moves, changes, jumps, arithmetic
+        operations), or None if the source cannot be executed in lockstep.
+        '''
+        if source in self.compiled:
+            return self.compiled[source]
+        program = None
+        size = self.function_size
+        if isinstance(source, str) and len(source) % size == 0:
+            instructions = [source[spointer:spointer+size]
+                            for spointer in range(0, len(source), size)]
+            kinds = [self.kind(x) for x in instructions]
+            jumps = list(range(0, len(source), size))
+            for i in range(len(kinds)):
+                if kinds[i][0] == LOOP_START:
+                    jumps[i] = self.functions[instructions[i]](
+                        [0], 0, [], [], source, jumps[i])[5]
+                elif kinds[i][0] == LOOP_END:
+                    jumps[i] = self.functions[instructions[i]](
+                        [1], 0, [], [], source, jumps[i])[5]
+                # loop end without loop start is searched from the end
+                # of the source (at negative source pointers)
+                if jumps[i] < 0 or jumps[i] % size != 0:
+                    kinds[i] = (SCALAR, 0, 0, 0)
+                    jumps[i] = i * size
+            program = (numpy.array([k[0] for k in kinds],
+                                   dtype=numpy.int8),
+                       numpy.array([k[1] for k in kinds],
+                                   dtype=numpy.int64),
+                       numpy.array([k[2] for k in kinds],
+                                   dtype=numpy.float64),
+                       numpy.array(jumps, dtype=numpy.int64),
+                       numpy.array([k[3] for k in kinds],
+                                   dtype=numpy.int8))
+        if len(self.compiled) >= self.max_compiled:
+            self.compiled.clear()
+        self.compiled[source] = program
+        return program
+
+lockstep_tables = {}
+
+def lockstep_table(functions, function_size=1, lockstep=None):
+    '''
+    Gives the lockstep table (see LockstepTable) of a dictionary of
+    functions / operations. Lockstep tables are kept for re-use, and
+    re-generated when the dictionary of functions / operations is changed.
+
+    @param functions: Dictionary of functions / operations.
+    @param function_size: Length of each instruction. Default = 1
+    @type function_size: integer
+    @param lockstep: Dictionary of the functions / operations which can be
+    executed in lockstep (see LockstepTable). Default = None
+    @type lockstep: dictionary
+    @return: LockstepTable object.
+
+    @since: version 1.0.6
+    '''
+    key = (id(functions), function_size, id(lockstep))
+    table = lockstep_tables.get(key)
+    if table == None or table.functions is not functions or \
+        table.lockstep is not lockstep or not table.is_current():
+        table = LockstepTable(functions, function_size, lockstep)
+        lockstep_tables[key] = table
+    return table
+
+class Machine(object):
+    '''
+    State of a machine executed in lockstep (see run) - the tape, tape
+    pointer, output list, source pointer and number of executed
+    instructions, whether the machine is halted, and whether the machine
+    had left the batch (diverged) at the instruction at the source
+    pointer, which is not executed yet. Machines which had not diverged
+    are finished.
+
+    @since: version 1.0.6
+    '''
+    __slots__ = ('array', 'apointer', 'output', 'spointer',
+                 'instruction_count', 'halted', 'diverged')
+
+    def __init__(self, array, apointer, output, spointer,
+                 instruction_count, halted=False, diverged=False):
+        self.array = array
+        self.apointer = apointer
+        self.output = output
+        self.spointer = spointer
+        self.instruction_count = instruction_count
+        self.halted = halted
+        self.diverged = diverged
+
+def _numbers(cells, limit):
+    '''
+    Checks that all cells are floats, or integers which can be represented
+    exactly as 64-bit floats after changes of their values (smaller than
+    limit).
+    '''
+    for value in cells:
+        if type(value) is int:
+            if abs(value) >= limit: return False
+        elif type(value) is not float:
+            return False
+    return True
+
+def _arithmetic(operation, x, y, xi, yi):
+    '''
+    Executes an arithmetic operation (see arithmetics) on arrays of values
+    of the current cells (x) and next cells (y), where xi and yi are
+    whether the values are integers.
+
+    @return: Tuple of (results, whether the results are integers, whether
+    the operation cannot be executed in lockstep).
+    '''
+    failed = numpy.zeros(len(x), dtype=bool)
+    if operation == 1:
+        return (2 * x, xi, failed)
+    elif operation == 2:
+        return (0.5 * x, numpy.zeros(len(x), dtype=bool), failed)
+    elif operation == 3:
+        return (x + y, xi & yi, failed)
+    elif operation == 4:
+        return (y - x, xi & yi, failed)
+    elif operation == 5:
+        return (y * x, xi & yi, failed)
+    elif operation == 6:
+        # division by zero raises an exception
+        failed = x == 0
+        return (y / numpy.where(failed, 1.0, x),
+                numpy.zeros(len(x), dtype=bool), failed)
+    elif operation == 7:
+        return (-1.0 * x, xi, failed)
+    elif operation == 8:
+        # truncation of infinity or NaN raises an exception
+        failed = ~numpy.isfinite(x)
+        return (numpy.trunc(numpy.where(failed, 0.0, x)),
+                numpy.ones(len(x), dtype=bool), failed)
+    return (x, xi, ~failed)
+
+def run(sources, functions, function_size=1, arrays=None, size=30,
+        max_instructions=1000, lockstep=None):
+    '''
+    Executes a batch of sources in lockstep, each on its own tape, until
+    each machine is finished or diverges - reaching an instruction which
+    cannot be executed in lockstep (see LockstepTable), where the machine
+    leaves the batch. Diverged machines can be finished one at a time by
+    resume.
+
+    @param sources: List of sources to execute.
+    @type sources: list
+    @param functions: Dictionary of functions / operations.
+    @param function_size: Length of each instruction. Default = 1
+    @type function_size: integer
+    @param arrays: List of tapes of the sources, where a tape of None is
+    a list of zeros. The tapes are not changed; the resulting tapes are of
+    the same class as the given tapes (list for None). Default = None
+    (tapes of zeros)
+    @type arrays: list
+    @param size: Length of the tapes. Default = 30
+    @type size: integer
+    @param max_instructions: The maximum number of instructions to execute
+    for each source. Default = 1000
+    @type max_instructions: integer
+    @param lockstep: Dictionary of the functions / operations which can be
+    executed in lockstep (see LockstepTable). Default = None
+    @type lockstep: dictionary
+    @return: List of the machine (see Machine) of each source, or None
+    for sources which cannot be executed in lockstep (sources which are
+    not strings, or tapes with cells which are not numbers).
+
+    @since: version 1.0.6
+    '''
+    if numpy == None:
+        raise ImportError('NumPy is required for lockstep execution')
+    table = lockstep_table(functions, function_size, lockstep)
+    limit = 2 ** 53 - table.reach * (max_instructions + 1)
+    results = [None] * len(sources)
+    machines = []
+    programs = []
+    rows = []
+    for i in range(len(sources)):
+        if arrays == None or arrays[i] == None: cells = [0] * size
+        else: cells = list(arrays[i][0:size])
+        program = table.compile(sources[i])
+        if program != None and _numbers(cells, limit):
+            machines.append(i)
+            programs.append(program)
+            rows.append(cells)
+    if len(machines) == 0:
+        return results
+    count = len(machines)
+    width = max([len(program[0]) for program in programs] + [1])
+    kinds = numpy.zeros((count, width), dtype=numpy.int8)
+    moves = numpy.zeros((count, width), dtype=numpy.int64)
+    changes = numpy.zeros((count, width), dtype=numpy.float64)
+    jumps = numpy.zeros((count, width), dtype=numpy.int64)
+    operations = numpy.zeros((count, width), dtype=numpy.int8)
+    tape = numpy.zeros((count, max(size, 1)), dtype=numpy.float64)
+    integers = numpy.zeros((count, max(size, 1)), dtype=bool)
+    for r in range(count):
+        (kind, move, change, jump, operation) = programs[r]
+        kinds[r, :len(kind)] = kind
+        moves[r, :len(move)] = move
+        changes[r, :len(change)] = change
+        jumps[r, :len(jump)] = jump
+        operations[r, :len(operation)] = operation
+        tape[r, :len(rows[r])] = rows[r]
+        integers[r, :len(rows[r])] = [type(x) is int for x in rows[r]]
+    lengths = numpy.array([len(cells) for cells in rows], dtype=numpy.int64)
+    source_lengths = numpy.array([len(sources[i]) for i in machines],
+                                 dtype=numpy.int64)
+    apointer = numpy.zeros(count, dtype=numpy.int64)
+    spointer = numpy.zeros(count, dtype=numpy.int64)
+    instruction_count = numpy.zeros(count, dtype=numpy.int64)
+    halted = numpy.zeros(count, dtype=bool)
+    diverged = numpy.zeros(count, dtype=bool)
+    outputs = [[] for r in range(count)]
+    # flat indices of the instructions and cells of each machine
+    program_base = numpy.arange(count, dtype=numpy.int64) * width
+    tape_base = numpy.arange(count, dtype=numpy.int64) * tape.shape[1]
+    kinds = kinds.ravel()
+    moves = moves.ravel()
+    changes = changes.ravel()
+    jumps = jumps.ravel()
+    operations = operations.ravel()
+    flat = tape.ravel()
+    integers = integers.ravel()
+    active = numpy.nonzero(spointer < source_lengths)[0]
+    while len(active) > 0:
+        live = active[~halted[active]]
+        position = program_base[live] + spointer[live] // function_size
+        kind = kinds[position]
+        # machines reaching scalar instructions leave the batch before
+        # executing the instruction; halted machines execute nothing
+        scalar = kind == SCALAR
+        if scalar.any():
+            diverged[live[scalar]] = True
+            active = active[~diverged[active]]
+            live = live[~scalar]
+            position = position[~scalar]
+            kind = kind[~scalar]
+        instruction_count[active] += 1
+        change = changes[position]
+        # current cell, as in list indexing; only simple instructions
+        # which do not change the current cell do not read it
+        cell = apointer[live]
+        length = lengths[live]
+        valid = (cell >= -length) & (cell < length)
+        cell = numpy.where(cell < 0, cell + length, cell)
+        failed = ~valid & ((kind != SIMPLE) | (change != 0))
+        if failed.any():
+            halted[live[failed]] = True
+            valid = ~failed
+            live = live[valid]
+            position = position[valid]
+            kind = kind[valid]
+            change = change[valid]
+            cell = cell[valid]
+            length = length[valid]
+        index = tape_base[live] + cell
+        changing = change != 0
+        if changing.any():
+            flat[index[changing]] += change[changing]
+        apointer[live] += moves[position]
+        calculating = numpy.nonzero(kind == ARITHMETIC)[0]
+        if len(calculating) > 0:
+            operation = operations[position[calculating]]
+            current = index[calculating]
+            following = tape_base[live[calculating]] + \
+                (cell[calculating] + 1) % length[calculating]
+            for code in numpy.unique(operation).tolist():
+                same = operation == code
+                target = current[same]
+                with numpy.errstate(all='ignore'):
+                    (value, integer, stopped) = _arithmetic(code,
+                        flat[target], flat[following[same]],
+                        integers[target], integers[following[same]])
+                # integer results must be exact (and not negative zero)
+                stopped = stopped | (integer & ~(numpy.abs(value) < limit))
+                value = numpy.where(integer, value + 0.0, value)
+                machine = live[calculating][same]
+                diverged[machine[stopped]] = True
+                instruction_count[machine[stopped]] -= 1
+                flat[target[~stopped]] = value[~stopped]
+                integers[target[~stopped]] = integer[~stopped]
+        looping = (kind == LOOP_START) | (kind == LOOP_END)
+        if looping.any():
+            value = flat[index[looping]]
+            jump = numpy.where(kind[looping] == LOOP_START, ~(value > 0),
+                               ~(value < 1))
+            spointer[live[looping][jump]] = jumps[position[looping][jump]]
+        outputting = numpy.nonzero(kind == OUTPUT)[0]
+        if len(outputting) > 0:
+            values = flat[index[outputting]].tolist()
+            integer = integers[index[outputting]].tolist()
+            machine = live[outputting].tolist()
+            for j in range(len(values)):
+                if integer[j]: outputs[machine[j]].append(int(values[j]))
+                else: outputs[machine[j]].append(values[j])
+        active = active[~diverged[active]]
+        pointer = apointer[active]
+        pointer = numpy.where(pointer > size - 1, pointer - size, pointer)
+        pointer = numpy.where(pointer < 0, size + pointer, pointer)
+        apointer[active] = pointer
+        spointer[active] += function_size
+        active = active[(spointer[active] < source_lengths[active]) &
+                        (instruction_count[active] <= max_instructions)]
+    integers = integers.reshape(tape.shape)
+    for r in range(count):
+        i = machines[r]
+        values = tape[r, :lengths[r]].tolist()
+        integer = integers[r, :lengths[r]].tolist()
+        cells = [int(values[j]) if integer[j] else values[j]
+                 for j in range(len(values))]
+        if arrays != None and arrays[i] != None and \
+            not isinstance(arrays[i], list):
+            cells = type(arrays[i])(cells)
+        results[i] = Machine(cells, int(apointer[r]), outputs[r],
+                             int(spointer[r]), int(instruction_count[r]),
+                             bool(halted[r]), bool(diverged[r]))
+    return results
+
+def resume(machine, source, functions, function_size=1, inputdata=None,
+           size=30, max_instructions=1000, **options):
+    '''
+    Gives the results of a machine executed in lockstep (see run), where
+    a diverged machine is finished by register_machine.execute from its
+    state, and a finished machine is given as it is.
+
+    @param machine: Machine executed in lockstep.
+    @type machine: Machine
+    @param source: Source of the machine.
+    @type source: string
+    @param functions: Dictionary of functions / operations.
+    @param function_size: Length of each instruction. Default = 1
+    @type function_size: integer
+    @param inputdata: Input list of the machine, which is not changed by
+    instructions executed in lockstep. Default = None (empty input list)
+    @type inputdata: list
+    @param size: Length of the tape. Default = 30
+    @type size: integer
+    @param max_instructions: The maximum number of instructions to
+    execute. Default = 1000
+    @type max_instructions: integer
+    @param options: Other parameters of register_machine.execute, such as
+    specialised functions / operations and the execution context.
+    @return: Results - (array, apointer, inputdata, output, source,
+    spointer).
+
+    @since: version 1.0.6
+    '''
+    if inputdata == None: inputdata = []
+    if machine.diverged:
+        return register_machine.execute(source, functions, function_size,
+            inputdata, machine.array, size, max_instructions,
+            state=(machine.instruction_count, machine.apointer,
+                   list(machine.output), machine.spointer), **options)
+    if machine.halted: source = [x for x in source]
+    return (machine.array, machine.apointer, inputdata,
+            list(machine.output), source, machine.spointer)
+
+def execute(sources, functions, function_size=1, inputdata=None,
+            arrays=None, size=30, max_instructions=1000, lockstep=None,
+            **options):
+    '''
+    Executes a batch of sources in lockstep (see run), each on its own
+    tape, and finishes the machines which diverged one at a time in the
+    order of the batch (see resume). Sources which cannot be executed in
+    lockstep are executed by register_machine.execute. This gives the
+    same results as executing the sources one at a time in the order of
+    the batch by register_machine.execute.
+
+    @param sources: List of sources to execute.
+    @type sources: list
+    @param functions: Dictionary of functions / operations.
+    @param function_size: Length of each instruction. Default = 1
+    @type function_size: integer
+    @param inputdata: List of input lists of the sources. Default = None
+    (empty input lists)
+    @type inputdata: list
+    @param arrays: List of tapes of the sources, where a tape of None is
+    a list of zeros. The tapes are not changed; the resulting tapes are of
+    the same class as the given tapes (list for None). Default = None
+    (tapes of zeros)
+    @type arrays: list
+    @param size: Length of the tapes. Default = 30
+    @type size: integer
+    @param max_instructions: The maximum number of instructions to execute
+    for each source. Default = 1000
+    @type max_instructions: integer
+    @param lockstep: Dictionary of the functions / operations which can be
+    executed in lockstep (see LockstepTable). Default = None
+    @type lockstep: dictionary
+    @param options: Other parameters of register_machine.execute for the
+    machines executed one at a time (see resume).
+    @return: List of results - (array, apointer, inputdata, output,
+    source, spointer) - of each source.
+
+    @since: version 1.0.6
+    '''
+    machines = run(sources, functions, function_size, arrays, size,
+                   max_instructions, lockstep)
+    results = []
+    for i in range(len(sources)):
+        if inputdata == None: given_inputdata = []
+        else: given_inputdata = inputdata[i]
+        if machines[i] != None:
+            results.append(resume(machines[i], sources[i], functions,
+                                  function_size, given_inputdata, size,
+                                  max_instructions, **options))
+        else:
+            if arrays == None: array = None
+            else: array = arrays[i]
+            results.append(register_machine.execute(sources[i],
+                functions, function_size, given_inputdata, array, size,
+                max_instructions, **options))
+    return results
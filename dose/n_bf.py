@@ -23,8 +23,10 @@ the end.
 '''
 
 import random
-import register_machine as r
-from lc_bf import increment, decrement, forward, backward, call_out
+from . import register_machine as r
+from . import ragaraja
+from .lc_bf import increment, decrement, forward, backward, call_out
+from .lc_bf import superinstructions_LCBF
 
 def random_op(array, apointer, inputdata, output, source, spointer):
     '''
@@ -161,6 +163,27 @@ nBF = {'A': increment,
        '.': call_out
        }
 
+# Simple operations of nBF (see register_machine.DispatchTable), as of LCBF.
+superinstructions_nBF = superinstructions_LCBF
+
+# Specialised operations of nBF (see register_machine.DispatchTable), which 
+# are executed without copying the tape (see register_machine.execute). 
+# The random operations are the specialised 
+# operations of the Ragaraja instructions of the ambiguous nucleotides (see 
+# ragaraja.nBF_codes), which look up the operation for the random number 
+# from a table of bounds instead of comparing the nucleotide.
+_random_operations = ragaraja.specialised_ragaraja[ragaraja.nBF_random_op]
+
+specialised_nBF = {increment: increment,
+                   decrement: decrement,
+                   forward: forward,
+                   backward: backward,
+                   call_out: call_out,
+                   random_op: dict([(x, _random_operations[code])
+                                    for (x, code) in ragaraja.nBF_codes.items()
+                                    if code in _random_operations]),
+                   }
+
 if __name__ == '__main__':
     print(r.interpret('AAAAGGTTTCAAA', nBF))
     print(r.interpret('AAAAGGTTTCAAARRYYSKVDVDBBHVNVH', nBF))
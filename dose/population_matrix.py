@@ -0,0 +1,242 @@
+'''
+Population Matrix
+Date created: 18th October 2026
+
+Views one chromosome of every organism in a population, where all the
+chromosomes have the same length and bases, as the rows of a 2-D matrix
+of base codes (unsigned 8-bit integers; the code of a base is its index
+in the list of bases of the chromosomes). Point mutations are then made
+across the whole matrix at once, instead of one organism at a time (see
+genetic.Chromosome.rmutate), and the changed rows are written back to the
+chromosomes of the organisms.
+
+Two distributions of point mutations are provided:
+    1. Bernoulli: every base of the mutated stretch is mutated with the
+    mutation probability of its chromosome.
+    2. Poisson: the number of mutations in each chromosome is drawn from a
+    Poisson distribution with a mean of the mutation probability times
+    the length of the mutated stretch, and the positions of the mutations
+    are drawn uniformly from the stretch.
+
+As in genetic.Chromosome.rmutate, the mutation probability of a
+chromosome is its background mutation rate plus the given rate, and the
+new base of a mutation is drawn from all bases (which may give the same
+base). The random numbers are drawn from a NumPy generator seeded from
+the random module, so that simulations seeded with random.seed are
+repeatable.
+
+This requires NumPy (http://www.numpy.org/).
+'''
+
+import random
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from . import genetic
+
+class PopulationMatrix(object):
+    '''
+    Matrix of base codes of one chromosome of each organism in a list of
+    organisms. Changes to the matrix (in the matrix attribute) are written
+    back to the chromosomes by the write method.
+
+    @since: version 1.0.6
+    '''
+    def __init__(self, agents, chromosome=0):
+        '''
+        Constructor method.
+
+        @param agents: list of organisms (genetic.Organism objects).
+        @param chromosome: index of the chromosome in the genome of each
+        organism. Default = 0
+        @type chromosome: integer
+        '''
+        if numpy == None:
+            raise ImportError('NumPy is required for population matrices')
+        self.agents = agents
+        self.chromosome = chromosome
+        self.chromosomes = [organism.genome[chromosome]
+                            for organism in agents]
+        if len(self.chromosomes) == 0:
+            self.base = []
+            self.length = 0
+        else:
+            self.base = list(self.chromosomes[0].base)
+            self.length = len(self.chromosomes[0].read_sequence())
+        if len(self.base) > 256:
+            raise ValueError('Population matrices have up to 256 bases, \
+not ' + str(len(self.base)))
+        for chromosome in self.chromosomes:
+            if list(chromosome.base) != self.base:
+                raise ValueError('Chromosomes have different bases')
+            if len(chromosome.read_sequence()) != self.length:
+                raise ValueError('Chromosomes have different lengths')
+        # table of base codes of character codes (for single character 
+        # bases), where characters which are not bases have a code of 
+        # the number of bases
+        self.characters = self._characters()
+        self.table = None
+        if self.characters is not None:
+            self.table = numpy.full(256, len(self.base), dtype=numpy.int32)
+            self.table[self.characters[::-1]] = \
+                numpy.arange(len(self.base) - 1, -1, -1)
+        self.matrix = numpy.zeros((len(self.chromosomes), self.length),
+                                  dtype=numpy.uint8)
+        for i in range(len(self.chromosomes)):
+            self.matrix[i] = self._encode(
+                self.chromosomes[i].read_sequence())
+        self.written = self.matrix.copy()
+
+    def _characters(self):
+        '''
+        Gives a table of the character codes of the bases (for compact
+        sequences), or None if a base is not a single ASCII character.
+        '''
+        if not all([isinstance(x, str) and len(x) == 1 and ord(x) < 128
+                    for x in self.base]):
+            return None
+        return numpy.array([ord(x) for x in self.base], dtype=numpy.uint8)
+
+    def _encode(self, sequence):
+        '''
+        Gives the row of base codes of a sequence.
+        '''
+        characters = None
+        if isinstance(sequence, genetic.CompactSequence):
+            characters = sequence.tobytes()
+        elif self.table is not None:
+            try:
+                characters = ''.join(sequence).encode('ascii')
+            except (TypeError, UnicodeEncodeError):
+                characters = None
+            if characters is not None and len(characters) != len(sequence):
+                characters = None
+        if characters is not None:
+            codes = self.table[numpy.frombuffer(characters, 
+                                                dtype=numpy.uint8)]
+            if len(codes) > 0 and codes.max() >= len(self.base):
+                raise ValueError('Sequence has bases not in ' +
+                                 repr(self.base))
+            return codes
+        codes = {}
+        for i in range(len(self.base) - 1, -1, -1):
+            codes[self.base[i]] = i
+        try:
+            return [codes[x] for x in sequence]
+        except KeyError:
+            raise ValueError('Sequence has bases not in ' + repr(self.base))
+
+    def rates(self, rate=0.01):
+        '''
+        Gives the mutation probability of each chromosome - its background
+        mutation rate plus the given rate.
+
+        @param rate: probability of mutation per base above background
+        mutation rate. Default = 0.01 (1%)
+        @return: NumPy array of mutation probabilities, one per chromosome.
+        '''
+        return numpy.array([chromosome.background_mutation + rate
+                            for chromosome in self.chromosomes],
+                           dtype=numpy.float64)
+
+    def point_mutation(self, rate=0.01, distribution='bernoulli', start=0,
+                       end=-1, generator=None):
+        '''
+        Point mutations across the matrix. The chromosomes are not changed
+        until the matrix is written back (see write).
+
+        @param rate: probability of mutation per base above background
+        mutation rate. No mutation will happen in chromosomes where
+        (rate + background_mutation) is not more than zero.
+        Default = 0.01 (1%)
+        @param distribution: distribution of mutations - 'bernoulli' or
+        'poisson' (see module description). Default = 'bernoulli'
+        @param start: first base of the mutated stretch. Default = 0,
+        start of the chromosomes.
+        @type start: integer
+        @param end: last base of the mutated stretch. Default = -1, end of
+        the chromosomes.
+        @type end: integer
+        @param generator: NumPy random generator. Default = None (a
+        generator seeded from the random module)
+        @return: number of mutations made.
+        '''
+        if end < 0 or end > self.length - 1: end = self.length - 1
+        if start < 0: start = 0
+        size = end - start + 1
+        if size <= 0 or len(self.chromosomes) == 0: return 0
+        if generator == None:
+            generator = numpy.random.default_rng(random.getrandbits(64))
+        rates = numpy.clip(self.rates(rate), 0.0, 1.0)
+        stretch = self.matrix[:, start:end + 1]
+        if distribution == 'bernoulli':
+            (rows, positions) = numpy.nonzero(
+                generator.random(stretch.shape) < rates[:, None])
+        elif distribution == 'poisson':
+            counts = generator.poisson(rates * size)
+            rows = numpy.repeat(numpy.arange(len(counts)), counts)
+            positions = generator.integers(0, size, len(rows))
+        else:
+            raise ValueError('Unknown distribution of mutations: ' +
+                             repr(distribution))
+        stretch[rows, positions] = generator.integers(0, len(self.base),
+                                                      len(rows))
+        return len(rows)
+
+    def write(self):
+        '''
+        Writes the changed rows of the matrix back to the chromosomes,
+        only changing the bases which are changed in the matrix.
+
+        @return: list of indices of the changed chromosomes.
+        '''
+        changed = numpy.nonzero((self.matrix != self.written).any(axis=1))
+        changed = [int(i) for i in changed[0]]
+        for i in changed:
+            chromosome = self.chromosomes[i]
+            row = self.matrix[i]
+            if isinstance(chromosome.sequence, genetic.CompactSequence):
+                chromosome.sequence[:] = self.characters[row].tobytes()
+            else:
+                for position in numpy.nonzero(row != self.written[i])[0]:
+                    chromosome.sequence[int(position)] = \
+                        self.base[int(row[position])]
+            chromosome.decoded = {}
+            self.written[i] = row
+        return changed
+
+def point_mutation(agents, rate=0.01, distribution='bernoulli',
+                   chromosome=0, start=0, end=-1):
+    '''
+    Point mutations in one chromosome of every organism in a list of
+    organisms with chromosomes of the same length and bases, made across
+    the population matrix (see PopulationMatrix.point_mutation) and
+    written back to the chromosomes. This is a population-level
+    replacement of calling genetic.Chromosome.rmutate('point', rate) on
+    each organism, with a Bernoulli or Poisson number of mutations
+    instead of a fixed number of mutations.
+
+    @param agents: list of organisms (genetic.Organism objects).
+    @param rate: probability of mutation per base above background
+    mutation rate. Default = 0.01 (1%)
+    @param distribution: distribution of mutations - 'bernoulli' or
+    'poisson'. Default = 'bernoulli'
+    @param chromosome: index of the chromosome in the genome of each
+    organism. Default = 0
+    @type chromosome: integer
+    @param start: first base of the mutated stretch. Default = 0
+    @type start: integer
+    @param end: last base of the mutated stretch. Default = -1, end of the
+    chromosomes.
+    @type end: integer
+    @return: number of mutations made.
+
+    @since: version 1.0.6
+    '''
+    matrix = PopulationMatrix(agents, chromosome)
+    count = matrix.point_mutation(rate, distribution, start, end)
+    matrix.write()
+    return count
@@ -44,12 +44,16 @@ import math
 
 from . import copads
 from . import lc_bf
+from . import register_machine
 from .copads.samplestatistics import SingleSample
 from .lc_bf import increment, decrement
 from .lc_bf import forward, backward
-from .lc_bf import call_out, accept_predefined
+from .lc_bf import call_out, accept_predefined, _accept_predefined
 
-register = [0]*99
+# Registers of the default context (see register_machine.Context). The 
+# register instructions (see register_IO) use the registers of the 
+# current context (see register_machine.current_context).
+register = register_machine.default_context.registers
 
 def instruction_padding(inst):
     inst = str(inst)
@@ -62,41 +66,64 @@ def loop_start(array, apointer, inputdata, output, source, spointer):
     Start loop. Will only enter loop if current cell is more than "0". If 
     current cell is "0" or less, it will go to the end of the loop 
     (command 015). if the loop is not closed, it will go to the end of the 
-    source.
+    source. The end of the loop is looked up from the bracket table of 
+    the source (see register_machine.bracket_table).
     '''
     if array[apointer] > 0:
         return (array, apointer, inputdata, output, source, spointer)
-    else:
-        count = 1
-        try:
-            while count > 0:
-                spointer = spointer + 3
-                if source[spointer:spointer+3] == '015': count = count - 1
-                if source[spointer:spointer+3] == '014': count = count + 1
-            return (array, apointer, inputdata, output, source, spointer - 3)
-        except IndexError:
-            return (array, apointer, inputdata, output, source, len(source) - 1)
+    (forward, backward) = register_machine.bracket_table(source, 
+                                                         '014', '015', 3)
+    if spointer not in forward:
+        forward[spointer] = _find_loop_end(source, spointer)
+    if forward[spointer] == None:
+        return (array, apointer, inputdata, output, source, len(source) - 1)
+    return (array, apointer, inputdata, output, source, forward[spointer] - 3)
+
+def _find_loop_end(source, spointer):
+    '''
+    Finds the end of the loop (command 015) started at the source pointer, 
+    or None if the loop is not closed.
+    '''
+    count = 1
+    while count > 0:
+        spointer = spointer + 3
+        if spointer >= len(source): return None
+        if source[spointer:spointer+3] == '015': count = count - 1
+        if source[spointer:spointer+3] == '014': count = count + 1
+    return spointer
 
 def loop_end(array, apointer, inputdata, output, source, spointer):
     '''
     End loop. However, it is possible to have an end loop operator 
     (command 015) without a preceding start loop operator (command 014). 
     In this case, the end loop operator (command 015) will be ignored and 
-    execution continues. 
+    execution continues. The start of the loop is looked up from the 
+    bracket table of the source (see register_machine.bracket_table).
     '''
-    temp = spointer
     if array[apointer] < 1:
         return (array, apointer, inputdata, output, source, spointer)
-    else:
-        count = 1
-        try:
-            while count > 0:
-                spointer = spointer - 3
-                if source[spointer:spointer+3] == '015': count = count + 1
-                if source[spointer:spointer+3] == '014': count = count - 1
-        except IndexError:
-            spointer = temp
-    return (array, apointer, inputdata, output, source, spointer)
+    (forward, backward) = register_machine.bracket_table(source, 
+                                                         '014', '015', 3)
+    if spointer not in backward:
+        backward[spointer] = _find_loop_start(source, spointer)
+    if backward[spointer] == None:
+        return (array, apointer, inputdata, output, source, spointer)
+    return (array, apointer, inputdata, output, source, backward[spointer])
+
+def _find_loop_start(source, spointer):
+    '''
+    Finds the start of the loop (command 014) ended at the source pointer, 
+    or None if the loop is not opened. As the source is sliced, the search 
+    continues from the end of the source (as negative source pointer) 
+    after passing the start of the source.
+    '''
+    count = 1
+    while count > 0:
+        spointer = spointer - 3
+        if (spointer + 3) <= -len(source): return None
+        if source[spointer:spointer+3] == '015': count = count + 1
+        if source[spointer:spointer+3] == '014': count = count - 1
+    return spointer
 
 def tape_move(array, apointer, inputdata, output, source, spointer):
     '''
@@ -806,6 +833,84 @@ def mathematics(array, apointer, inputdata, output, source, spointer):
     if cmd == '197': array[apointer] = SingleSample(array).geometricMean()
     if cmd == '198': array[apointer] = SingleSample(array).harmonicMean()
     return (array, apointer, inputdata, output, source, spointer)
+
+def _bounded_sinh(x):
+    try: return math.sinh(x)
+    except OverflowError: 
+        if x > 0: return float('inf')
+        return float('-inf')
+
+def _bounded_cosh(x):
+    try: return math.cosh(x)
+    except OverflowError: return float('inf')
+
+def _bounded_power(x, y):
+    '''
+    Gives x to the power of y as a float, or infinity (of the sign of the 
+    result) if the result is too large for a float, or NaN if the result 
+    is a complex number too large for a float.
+    '''
+    try: return float(x) ** float(y)
+    except OverflowError:
+        if x >= 0 or y % 2 == 0: return float('inf')
+        if y % 2 == 1: return float('-inf')
+        return float('nan')
+
+def _bounded_factorial(x):
+    '''
+    Gives the factorial of the integer of x as a float, or infinity if the 
+    factorial is too large for a float (more than 170).
+    '''
+    if int(x) > 170: return float('inf')
+    return float(math.factorial(int(x)))
+
+def bounded_mathematics(array, apointer, inputdata, output, source, spointer):
+    '''
+    Performs mathematical and arithmetical operations (see mathematics), 
+    for bounded tapes (see tapes.BoundedTape and bounded_ragaraja). The 
+    instructions which may overflow give floats, and give infinity 
+    instead of raising OverflowError or computing integers which are too 
+    large for a float. Infinity is saturated, and NaN is stored as zero, 
+    by the bounded tape. Hence, each instruction takes constant time.
+    
+    Instructions handled (other instructions are handled by mathematics):
+        - 099: Hyperbolic sine of the value of the current cell, or 
+        infinity of the sign of the value if it is too large.
+        - 100: Hyperbolic cosine of the value of the current cell, or 
+        infinity if it is too large.
+        - 107 to 111: Powers of the value of the current cell (see 
+        mathematics), or infinity of the sign of the result if it is too 
+        large.
+        - 114 and 115: Factorial of the value of the current cell (see 
+        mathematics), or infinity if the value is more than 170.
+
+    @since: version 1.0.6
+    '''
+    cmd = source[spointer:spointer+3]
+    if (apointer + 1) < len(array): next_cell = apointer + 1
+    else: next_cell = 0
+    if cmd == '099': array[apointer] = _bounded_sinh(array[apointer])
+    elif cmd == '100': array[apointer] = _bounded_cosh(array[apointer])
+    elif cmd == '107': 
+        array[apointer] = _bounded_power(array[apointer], math.e)
+    elif cmd == '108': 
+        array[apointer] = _bounded_power(math.e, array[apointer])
+    elif cmd == '109': 
+        array[apointer] = _bounded_power(10, array[apointer])
+    elif cmd == '110':
+        array[apointer] = _bounded_power(array[apointer], array[next_cell])
+    elif cmd == '111':
+        array[apointer] = _bounded_power(array[apointer], 
+                                         1 / array[next_cell])
+    elif cmd == '114':
+        if array[apointer] >= 0: 
+            array[apointer] = _bounded_factorial(array[apointer])
+    elif cmd == '115': 
+        array[apointer] = _bounded_factorial(abs(array[apointer]))
+    else:
+        return mathematics(array, apointer, inputdata, output, 
+                           source, spointer)
+    return (array, apointer, inputdata, output, source, spointer)
     
 def output_IO(array, apointer, inputdata, output, source, spointer):
     '''
@@ -1342,7 +1447,11 @@ def register_IO(array, apointer, inputdata, output, source, spointer):
         - 597: Clear register #97 (set to 0)
         - 598: Clear register #98 (set to 0)
         - 599: Clear register #99 (set to 0)
+    
+    The registers are of the current context (see 
+    register_machine.current_context).
     '''
+    register = register_machine.current_context().registers
     cmd = source[spointer:spointer+3]
     if cmd == '201': register[0] = array[apointer]
     if cmd == '202': register[1] = array[apointer]
@@ -1646,7 +1755,8 @@ def register_IO(array, apointer, inputdata, output, source, spointer):
 def jump_identifier(array, apointer, inputdata, output, source, spointer):
     '''
     Defines jump location within the source tape. These instructions acts as pure
-    identifiers and do not perform any operations.
+    identifiers and do not perform any operations. The locations of jump 
+    identifiers in a source are indexed by jump_table.
     
     Instructions handled:
     200, 300, 400, 500, 600, 700, 800, 900
@@ -1662,6 +1772,22 @@ def jump_identifier(array, apointer, inputdata, output, source, spointer):
     if cmd == '900': pass
     return (array, apointer, inputdata, output, source, spointer)
     
+jump_identifiers = ['200', '300', '400', '500', '600', '700', '800', '900']
+
+def jump_table(source):
+    '''
+    Gives the locations of jump identifiers (see jump_identifier) in a 
+    Ragaraja source code string (see register_machine.label_table).
+
+    @param source: Ragaraja source code string
+    @type source: string
+    @return: Dictionary where the key is the jump identifier and the value 
+    is the list of source positions of the jump identifier.
+
+    @since: version 1.0.6
+    '''
+    return register_machine.label_table(source, jump_identifiers, 3)
+
 def not_used(array, apointer, inputdata, output, source, spointer):
     '''
     Default do-nothing handler for not implemented instructions.
@@ -2170,6 +2296,11 @@ ragaraja = {'000': forward, '001': tape_move,
             '998': not_used, '999': not_used
            }
 
+# Ragaraja instructions as implemented, which are not changed by 
+# activate_version, for generating instruction tables (see 
+# instruction_table).
+implemented_ragaraja = dict(ragaraja)
+
 ragaraja_v1 = [
     '000', '001', '002', '003', '004', '005', '006', '007', '008', '009', 
     '010', '011', '012', '013', '016', '017', '018', '019', 
@@ -2297,13 +2428,44 @@ def source_filter(source, sfilter=ragaraja_v1):
     
     @since: version 0.4
     '''
-    filtered_source = []
-    spointer = 0
-    while spointer < len(source):
-        if source[spointer:spointer+3] in sfilter:
-            filtered_source = filtered_source + [source[spointer:spointer+3]]
-        spointer = spointer + 3
-    return ''.join(filtered_source)
+    sfilter = set(sfilter)
+    return ''.join([source[spointer:spointer+3]
+                    for spointer in range(0, len(source), 3)
+                    if source[spointer:spointer+3] in sfilter])
+
+class TranslationTable(dict):
+    '''
+    Translation table of characters into Ragaraja instructions (for 
+    str.translate), where a character which is not in the table is 
+    translated by its upper case, or into a default instruction, and is 
+    added into the table.
+    '''
+    def __init__(self, codes, default):
+        '''
+        @param codes: Dictionary of upper case characters and their 
+        Ragaraja instructions.
+        @type codes: dictionary
+        @param default: Ragaraja instruction of other characters.
+        @type default: string
+        '''
+        dict.__init__(self, [(ord(x), codes[x]) for x in codes])
+        self.codes = codes
+        self.default = default
+
+    def __missing__(self, key):
+        value = self.codes.get(chr(key).upper(), self.default)
+        self[key] = value
+        return value
+
+# Ragaraja instructions of NucleotideBF (nBF) instructions as IUPAC 
+# nucleotide code, where other characters are converted to jump identifier 
+# I (200).
+nBF_codes = {'G': '000', 'C': '004', 'A': '008', 'T': '011', '.': '020',
+             'R': '050', 'Y': '051', 'S': '052', 'W': '053', 'K': '054',
+             'M': '055', 'B': '056', 'D': '057', 'H': '058', 'V': '059',
+             'N': '060'}
+
+nBF_table = TranslationTable(nBF_codes, '200')
 
 def nBF_to_Ragaraja(source):
     '''
@@ -2315,26 +2477,7 @@ def nBF_to_Ragaraja(source):
     
     @since: version 0.4
     '''
-    converted = []
-    for x in source:
-        if x.upper() == 'G': converted.append('000')
-        elif x.upper()  == 'C': converted.append('004')
-        elif x.upper()  == 'A': converted.append('008')
-        elif x.upper()  == 'T': converted.append('011')
-        elif x.upper()  == '.': converted.append('020')
-        elif x.upper()  == 'R': converted.append('050')
-        elif x.upper()  == 'Y': converted.append('051')
-        elif x.upper()  == 'S': converted.append('052')
-        elif x.upper()  == 'W': converted.append('053')
-        elif x.upper()  == 'K': converted.append('054')
-        elif x.upper()  == 'M': converted.append('055')
-        elif x.upper()  == 'B': converted.append('056')
-        elif x.upper()  == 'D': converted.append('057')
-        elif x.upper()  == 'H': converted.append('058')
-        elif x.upper()  == 'V': converted.append('059')
-        elif x.upper()  == 'N': converted.append('060')
-        else: converted.append('200') # Jump identifier I
-    return ''.join(converted)
+    return source.translate(nBF_table)
 
 def activate_version(version=1, instructions=None):
     '''
@@ -2411,27 +2554,859 @@ def activate_version(version=1, instructions=None):
     instructions in string) to be activated. This will only be activated 
     when version = 0.
     
+    This changes the Ragaraja instructions (ragaraja) for all simulations 
+    in the process. Use instruction_table to get the instruction set of a 
+    version without changing the Ragaraja instructions.
+    
     @since: version 0.4
     '''
-    if version == 0 or version == 66: 
+    active = version_instructions(version, instructions)
+    if active != None:
         for key in list(ragaraja.keys()):
-            if key not in instructions:
+            if key not in active:
                 ragaraja[key] = not_used
+
+def version_instructions(version=1, instructions=None):
+    '''
+    Gives the instructions to be used for a version (see 
+    activate_version).
+
+    @param version: Version of the instruction set. Default = 1. 
+    @param instructions: User-defined set of instructions (as list of 
+    instructions in string), which is used when version = 0 or 66.
+    @return: List of instructions, or None if all instructions are used 
+    (version = 98, or unknown versions).
+
+    @since: version 1.0.6
+    '''
+    if version == 0 or version == 66: 
+        return instructions
     elif version == 0.1 or version == 0.2: 
-        for key in list(ragaraja.keys()):
-            if key not in nBF_instructions:
-                ragaraja[key] = not_used
+        return nBF_instructions
     elif version == 1: 
-        for key in list(ragaraja.keys()):
-            if key not in ragaraja_v1:
-                ragaraja[key] = not_used
+        return ragaraja_v1
     elif version == 2: 
-        for key in list(ragaraja.keys()):
-            if key not in ragaraja_v2:
-                ragaraja[key] = not_used
-    elif version == 98:
-        pass
+        return ragaraja_v2
     elif version == 99:
-        for key in list(ragaraja.keys()):
-            if key not in tested_ragaraja_instructions:
-                ragaraja[key] = not_used
+        return tested_ragaraja_instructions
+    return None
+
+instruction_tables = {}
+
+def instruction_table(version=1, instructions=None):
+    '''
+    Gives the instruction set of a version (see activate_version) as an 
+    immutable dictionary of the Ragaraja instructions (see 
+    register_machine.InstructionTable), where instructions which are not 
+    in the version are not used (see not_used). Unlike activate_version, 
+    the Ragaraja instructions (ragaraja) are not changed, so that 
+    simulations with different versions can run in the same process. 
+    Instruction tables are kept for re-use.
+
+    @param version: Version of the instruction set. Default = 1. 
+    @param instructions: User-defined set of instructions (as list of 
+    instructions in string), which is used when version = 0 or 66.
+    @return: register_machine.InstructionTable object.
+
+    @since: version 1.0.6
+    '''
+    active = version_instructions(version, instructions)
+    if active != None: 
+        key = (version, tuple(active))
+    else:
+        key = (version, None)
+    if key not in instruction_tables:
+        table = []
+        for instruction in implemented_ragaraja:
+            if active == None or instruction in active:
+                table.append((instruction, 
+                              implemented_ragaraja[instruction]))
+            else:
+                table.append((instruction, not_used))
+        instruction_tables[key] = register_machine.InstructionTable(table)
+    return instruction_tables[key]
+
+def _cell_operation(operation):
+    '''
+    Generates a specialised operation (see register_machine.CompiledSource)
+    replacing the value of the current cell with the result of operation
+    on the value of the current cell.
+    '''
+    def handler(array, apointer, inputdata, output, source, spointer):
+        array[apointer] = operation(array[apointer])
+        return (array, apointer, inputdata, output, source, spointer)
+    return handler
+
+def _next_cell_operation(operation):
+    '''
+    Generates a specialised operation (see register_machine.CompiledSource)
+    replacing the value of the current cell with the result of operation
+    on the value of the current cell and the value of the next cell (or
+    the first cell if the current cell is the last cell).
+    '''
+    def handler(array, apointer, inputdata, output, source, spointer):
+        if (apointer + 1) < len(array):
+            array[apointer] = operation(array[apointer], array[apointer+1])
+        else:
+            array[apointer] = operation(array[apointer], array[0])
+        return (array, apointer, inputdata, output, source, spointer)
+    return handler
+
+def _input_operation(operation, position):
+    '''
+    Generates a specialised operation (see register_machine.CompiledSource)
+    replacing the value of the current cell with the result of operation
+    on the value of the current cell and the value at the given position
+    of the input list, if the input list is not empty.
+    '''
+    def handler(array, apointer, inputdata, output, source, spointer):
+        if len(inputdata) > 0:
+            array[apointer] = operation(array[apointer], inputdata[position])
+        return (array, apointer, inputdata, output, source, spointer)
+    return handler
+
+def _tape_operation(operation):
+    '''
+    Generates a specialised operation (see register_machine.CompiledSource)
+    replacing the value of the current cell with the result of operation
+    on the tape and the tape pointer.
+    '''
+    def handler(array, apointer, inputdata, output, source, spointer):
+        array[apointer] = operation(array, apointer)
+        return (array, apointer, inputdata, output, source, spointer)
+    return handler
+
+def _new_tape_operation(operation):
+    '''
+    Generates a specialised operation (see register_machine.CompiledSource)
+    replacing the tape with the tape generated by operation on the tape
+    and the tape pointer.
+    '''
+    def handler(array, apointer, inputdata, output, source, spointer):
+        return (operation(array, apointer), apointer, inputdata, output,
+                source, spointer)
+    return handler
+
+def _tape_pointer_operation(operation):
+    '''
+    Generates a specialised operation (see register_machine.CompiledSource)
+    moving the tape pointer to the position given by operation on the
+    tape, the tape pointer and the output list.
+    '''
+    def handler(array, apointer, inputdata, output, source, spointer):
+        return (array, operation(array, apointer, output), inputdata,
+                output, source, spointer)
+    return handler
+
+def _source_pointer_operation(operation):
+    '''
+    Generates a specialised operation (see register_machine.CompiledSource)
+    moving the source pointer to the position given by operation on the
+    tape, the tape pointer, the source and the source pointer.
+    '''
+    def handler(array, apointer, inputdata, output, source, spointer):
+        return (array, apointer, inputdata, output, source,
+                operation(array, apointer, source, spointer))
+    return handler
+
+def _logic_operation(operation):
+    '''
+    Generates a specialised operation (see register_machine.CompiledSource)
+    setting the current cell to "1" if the operation on the truth values
+    and the values of the current cell and the next cell (or the first
+    cell if the current cell is the last cell) is True, and "0" otherwise.
+    '''
+    def handler(array, apointer, inputdata, output, source, spointer):
+        xValue = array[apointer]
+        x = xValue > 0
+        if (apointer + 1) < len(array): yValue = array[apointer+1]
+        else: yValue = array[0]
+        y = yValue > 0
+        if operation(x, y, xValue, yValue): array[apointer] = 1
+        else: array[apointer] = 0
+        return (array, apointer, inputdata, output, source, spointer)
+    return handler
+
+def _random_operation(choices):
+    '''
+    Generates a specialised operation (see register_machine.CompiledSource)
+    for NucleotideBF (nBF) random operations, which executes the first
+    operation in the list of choices (as a list of (upper bound,
+    operation)) where the random number is less than the upper bound.
+    '''
+    def handler(array, apointer, inputdata, output, source, spointer):
+        r = random.random()
+        for (bound, operation) in choices:
+            if r < bound: break
+        return (array, operation(array, apointer), inputdata, output,
+                source, spointer)
+    return handler
+
+def _nBF_increment(array, apointer):
+    array[apointer] = array[apointer] + 1
+    return apointer
+
+def _nBF_decrement(array, apointer):
+    array[apointer] = array[apointer] - 1
+    return apointer
+
+def _nBF_forward(array, apointer):
+    if (apointer + 1) == len(array): return 0
+    else: return apointer + 1
+
+def _nBF_backward(array, apointer):
+    if apointer == 0: return len(array) - 1
+    else: return apointer - 1
+
+def _register_store(index):
+    '''
+    Generates a specialised operation (see register_machine.CompiledSource)
+    storing the value of current tape cell to register.
+    '''
+    def handler(array, apointer, inputdata, output, source, spointer):
+        register_machine.current_context().registers[index] = \
+            array[apointer]
+        return (array, apointer, inputdata, output, source, spointer)
+    return handler
+
+def _register_load(index):
+    '''
+    Generates a specialised operation (see register_machine.CompiledSource)
+    putting the value from register to current tape cell.
+    '''
+    def handler(array, apointer, inputdata, output, source, spointer):
+        array[apointer] = register_machine.current_context().registers[index]
+        return (array, apointer, inputdata, output, source, spointer)
+    return handler
+
+def _register_clear(index):
+    '''
+    Generates a specialised operation (see register_machine.CompiledSource)
+    clearing register (set to 0).
+    '''
+    def handler(array, apointer, inputdata, output, source, spointer):
+        register_machine.current_context().registers[index] = 0
+        return (array, apointer, inputdata, output, source, spointer)
+    return handler
+
+def _tape_resize(operation):
+    '''
+    Generates a specialised operation (see register_machine.CompiledSource)
+    replacing the tape with the tape generated by operation on the tape,
+    the tape pointer and the output list, and moving the tape pointer to
+    the last cell if it is beyond the new tape.
+    '''
+    def handler(array, apointer, inputdata, output, source, spointer):
+        array = operation(array, apointer, output)
+        if apointer >= len(array): apointer = len(array) - 1
+        return (array, apointer, inputdata, output, source, spointer)
+    return handler
+
+def _insert_cell(array, apointer, output):
+    array.insert(apointer + 1, 0)
+    return array
+
+def _delete_cell(array, apointer, output):
+    array.pop(apointer)
+    return array
+
+def _output_cell(array, apointer, output):
+    output.append(array.pop(apointer))
+    return array
+
+def _output_operation(operation):
+    '''
+    Generates a specialised operation (see register_machine.CompiledSource)
+    replacing the output list with the output list generated by operation
+    on the tape, the tape pointer, the output list and the source pointer.
+    '''
+    def handler(array, apointer, inputdata, output, source, spointer):
+        return (array, apointer, inputdata,
+                operation(array, apointer, output, spointer),
+                source, spointer)
+    return handler
+
+def _append_output(value):
+    def operation(array, apointer, output, spointer):
+        output.append(value(array, apointer, spointer))
+        return output
+    return operation
+
+def _output_to_cell(position, remove):
+    '''
+    Generates a specialised operation (see register_machine.CompiledSource)
+    replacing the current tape cell value with the value at the given
+    position of the output list, if the output list is not empty.
+    '''
+    def handler(array, apointer, inputdata, output, source, spointer):
+        if len(output) > 0:
+            array[apointer] = output[position]
+            if remove: del output[position]
+        return (array, apointer, inputdata, output, source, spointer)
+    return handler
+
+def _remove_output(position):
+    def operation(array, apointer, output, spointer):
+        if len(output) > 0: del output[position]
+        return output
+    return operation
+
+def _output_tape(array, apointer, inputdata, output, source, spointer):
+    '''
+    Specialised operation of instruction 173 (see output_IO and
+    register_machine.CompiledSource).
+    '''
+    if apointer != (len(array) - 1):
+        data = array[apointer+1:]
+        output = output + data
+        array = array[0:apointer+1] + [0] * len(data)
+    return (array, apointer, inputdata, output, source, spointer)
+
+def _output_clear_tape(array, apointer, inputdata, output, source, spointer):
+    '''
+    Specialised operation of instruction 175 (see output_IO and
+    register_machine.CompiledSource).
+    '''
+    return ([0] * len(array), apointer, inputdata, output + array,
+            source, spointer)
+
+def _swap_cell(array, apointer, inputdata, output, source, spointer):
+    '''
+    Specialised operation of instruction 081 (see tape_manipulate and
+    register_machine.CompiledSource).
+    '''
+    if (apointer + 1) < len(array): next_cell = apointer + 1
+    else: next_cell = 0
+    (array[apointer], array[next_cell]) = (array[next_cell], array[apointer])
+    return (array, apointer, inputdata, output, source, spointer)
+
+def _cut_tape(operation):
+    '''
+    Generates a specialised operation (see register_machine.CompiledSource)
+    replacing the tape and the tape pointer with the tape and tape pointer
+    generated by operation on the tape and the tape pointer.
+    '''
+    def handler(array, apointer, inputdata, output, source, spointer):
+        (array, apointer) = operation(array, apointer)
+        return (array, apointer, inputdata, output, source, spointer)
+    return handler
+
+def _cut_cell_to_front(array, apointer):
+    cell = array.pop(apointer)
+    return ([cell] + array, 0)
+
+def _cut_cell_to_end(array, apointer):
+    cell = array.pop(apointer)
+    array = array + [cell]
+    return (array, len(array) - 1)
+
+def _flip_tape(array, apointer, inputdata, output, source, spointer):
+    array.reverse()
+    return (array, apointer, inputdata, output, source, spointer)
+
+def _flip_output(array, apointer, inputdata, output, source, spointer):
+    output.reverse()
+    return (array, apointer, inputdata, output, source, spointer)
+
+def _flip_source(array, apointer, inputdata, output, source, spointer):
+    return (array, apointer, inputdata, output, source[::-1], spointer)
+
+def _read_input(array, apointer, inputdata, output, source, spointer):
+    if len(inputdata) == 0: array[apointer] = 0
+    else: array[apointer] = inputdata[0]
+    return (array, apointer, inputdata, output, source, spointer)
+
+def _average(data):
+    return sum(data) / float(len(data))
+
+def _standard_deviation(array, apointer):
+    variance = SingleSample(array).variance()
+    return math.sqrt(variance)
+
+def _factorial(x):
+    if x >= 0: return math.factorial(int(x))
+    else: return x
+
+def _divide_next_cell(array, apointer, inputdata, output, source, spointer):
+    '''
+    Specialised operation of instruction 074 (see mathematics and
+    register_machine.CompiledSource).
+    '''
+    if (apointer + 1) < len(array):
+        array[apointer] = float(array[apointer+1]) / array[apointer]
+    else:
+        array[apointer] = array[0] / array[apointer]
+    return (array, apointer, inputdata, output, source, spointer)
+
+def _set_value(value):
+    return _cell_operation(lambda x: value)
+
+# Specialised operations (see register_machine.CompiledSource) of the
+# Ragaraja instructions, for compiled execution of Ragaraja source
+# (see register_machine.execute). Instructions which are not given here
+# (029, 030 and 049) are executed by their Ragaraja operations.
+specialised_ragaraja = {
+    forward: forward,
+    backward: backward,
+    increment: increment,
+    decrement: decrement,
+    call_out: call_out,
+    accept_predefined: _accept_predefined,
+    loop_start: loop_start,
+    loop_end: loop_end,
+    jump_identifier: not_used,
+    not_used: not_used,
+    tape_move: {
+        '001': _tape_pointer_operation(lambda a, p, o: p + 5),
+        '002': _tape_pointer_operation(lambda a, p, o: p + 10),
+        '003': _tape_pointer_operation(
+            lambda a, p, o: p + int(float(a[p]) * float(a[p]))),
+        '005': _tape_pointer_operation(lambda a, p, o: p - 5),
+        '006': _tape_pointer_operation(lambda a, p, o: p - 10),
+        '007': _tape_pointer_operation(
+            lambda a, p, o: (p - int(float(a[p]) * float(a[p]))) % \
+                (len(a) - 1)),
+        '043': _tape_pointer_operation(lambda a, p, o: 0),
+        '044': _tape_pointer_operation(lambda a, p, o: len(a) - 1),
+        '045': _tape_pointer_operation(
+            lambda a, p, o: int(o[-1]) % (len(a) - 1)),
+        '061': _tape_pointer_operation(lambda a, p, o: p + int(a[p])),
+        '062': _tape_pointer_operation(lambda a, p, o: p - int(a[p])),
+        '140': _tape_pointer_operation(
+            lambda a, p, o: int((len(a) - 1) * 0.5)),
+        '141': _tape_pointer_operation(
+            lambda a, p, o: int((len(a) - 1) * 0.25)),
+        '142': _tape_pointer_operation(
+            lambda a, p, o: int((len(a) - 1) * 0.75)),
+        '143': _tape_pointer_operation(
+            lambda a, p, o: int(a[p]) % (len(a) - 1)),
+        },
+    accumulations: {
+        '009': _cell_operation(lambda x: x + 5),
+        '010': _cell_operation(lambda x: x + 10),
+        '012': _cell_operation(lambda x: x - 5),
+        '013': _cell_operation(lambda x: x - 10),
+        '032': _cell_operation(lambda x: 2 * x),
+        '033': _cell_operation(lambda x: 0.5 * x),
+        },
+    nBF_random_op: {
+        '050': _random_operation([(0.5, _nBF_increment),
+                                  (2, _nBF_forward)]),
+        '051': _random_operation([(0.5, _nBF_decrement),
+                                  (2, _nBF_backward)]),
+        '052': _random_operation([(0.5, _nBF_forward),
+                                  (2, _nBF_backward)]),
+        '053': _random_operation([(0.5, _nBF_increment),
+                                  (2, _nBF_decrement)]),
+        '054': _random_operation([(0.5, _nBF_decrement),
+                                  (2, _nBF_forward)]),
+        '055': _random_operation([(0.5, _nBF_increment),
+                                  (2, _nBF_backward)]),
+        '056': _random_operation([(0.33, _nBF_forward),
+                                  (0.67, _nBF_decrement),
+                                  (2, _nBF_backward)]),
+        '057': _random_operation([(0.33, _nBF_increment),
+                                  (0.67, _nBF_decrement),
+                                  (2, _nBF_forward)]),
+        '058': _random_operation([(0.33, _nBF_increment),
+                                  (0.67, _nBF_decrement),
+                                  (2, _nBF_backward)]),
+        '059': _random_operation([(0.33, _nBF_increment),
+                                  (0.67, _nBF_forward),
+                                  (2, _nBF_backward)]),
+        '060': _random_operation([(0.25, _nBF_increment),
+                                  (0.5, _nBF_decrement),
+                                  (0.75, _nBF_forward),
+                                  (2, _nBF_backward)]),
+        },
+    tape_size: {
+        '016': _tape_resize(lambda a, p, o: a + [0]),
+        '017': _tape_resize(lambda a, p, o: a + [0]*10),
+        '018': _tape_resize(lambda a, p, o: a[:-1]),
+        '019': _tape_resize(lambda a, p, o: a[:-10]),
+        '034': _tape_resize(_insert_cell),
+        '035': _tape_resize(_delete_cell),
+        '036': _tape_resize(_output_cell),
+        },
+    source_move: {
+        '023': _source_pointer_operation(
+            lambda a, p, s, sp: sp + 3 if (sp + 3) < len(s) else sp),
+        '024': _source_pointer_operation(
+            lambda a, p, s, sp: sp + 15 if (sp + 15) < len(s) else sp),
+        '025': _source_pointer_operation(
+            lambda a, p, s, sp: sp + 30 if (sp + 30) < len(s) else sp),
+        '026': _source_pointer_operation(
+            lambda a, p, s, sp: sp - 3 if (sp - 3) >= 0 else sp),
+        '027': _source_pointer_operation(
+            lambda a, p, s, sp: sp - 15 if (sp - 15) >= 0 else sp),
+        '028': _source_pointer_operation(
+            lambda a, p, s, sp: sp - 30 if (sp - 30) >= 0 else sp),
+        '082': _source_pointer_operation(
+            lambda a, p, s, sp: sp + 3 \
+                if a[p] == 0 and (sp + 3) <= len(s) else sp),
+        '083': _source_pointer_operation(
+            lambda a, p, s, sp: sp + (3 * abs(int(a[p]))) \
+                if (sp + (3 * abs(int(a[p])))) < len(s) else sp),
+        },
+    set_tape_value: {
+        '031': _cell_operation(lambda x: float(x) % 1000),
+        '084': _set_value(0),
+        '085': _set_value(-1),
+        '086': _set_value(1),
+        '097': _set_value(math.pi),
+        '098': _set_value(math.e),
+        '187': _new_tape_operation(
+            lambda a, p: a[0:p+1] + [0 for x in a[p+1:]]),
+        '188': _new_tape_operation(
+            lambda a, p: [0 for x in a[:p]] + a[p:]),
+        '189': _new_tape_operation(lambda a, p: [0] * len(a)),
+        '190': _new_tape_operation(lambda a, p: [a[p]] * len(a)),
+        '191': _new_tape_operation(lambda a, p: [p] * len(a)),
+        '192': _new_tape_operation(
+            lambda a, p: a[0:p+1] + [a[p] for x in a[p+1:]]),
+        '193': _new_tape_operation(
+            lambda a, p: [a[p] for x in a[:p]] + a[p:]),
+        '194': _new_tape_operation(
+            lambda a, p: a[0:p+1] + [p for x in a[p+1:]]),
+        '195': _new_tape_operation(
+            lambda a, p: [p for x in a[:p]] + a[p:]),
+        },
+    mathematics: {
+        '065': _next_cell_operation(lambda x, y: x + y),
+        '066': _input_operation(lambda x, i: x + i, 0),
+        '067': _input_operation(lambda x, i: x + i, -1),
+        '068': _next_cell_operation(lambda x, y: y - x),
+        '069': _input_operation(lambda x, i: i - x, 0),
+        '070': _input_operation(lambda x, i: i - x, -1),
+        '071': _next_cell_operation(lambda x, y: y * x),
+        '072': _input_operation(lambda x, i: i * x, 0),
+        '073': _input_operation(lambda x, i: i * x, -1),
+        '074': _divide_next_cell,
+        '075': _input_operation(lambda x, i: float(i) / x, 0),
+        '076': _input_operation(lambda x, i: float(i) / x, -1),
+        '077': _next_cell_operation(lambda x, y: y % x),
+        '078': _input_operation(lambda x, i: i % x, 0),
+        '079': _input_operation(lambda x, i: i % x, -1),
+        '080': _cell_operation(int),
+        '087': _cell_operation(lambda x: -1 * x),
+        '088': _cell_operation(math.sin),
+        '089': _cell_operation(math.cos),
+        '090': _cell_operation(math.tan),
+        '091': _cell_operation(math.asin),
+        '092': _cell_operation(math.acos),
+        '093': _cell_operation(math.atan),
+        '094': _cell_operation(lambda x: 1 / x),
+        '095': _cell_operation(math.sqrt),
+        '096': _cell_operation(lambda x: math.log(x, math.e)),
+        '099': _cell_operation(math.sinh),
+        '100': _cell_operation(math.cosh),
+        '101': _cell_operation(math.tanh),
+        '102': _cell_operation(math.asinh),
+        '103': _cell_operation(math.acosh),
+        '104': _cell_operation(math.atanh),
+        '105': _cell_operation(math.degrees),
+        '106': _cell_operation(math.radians),
+        '107': _cell_operation(lambda x: x ** math.e),
+        '108': _cell_operation(lambda x: math.e ** x),
+        '109': _cell_operation(lambda x: 10 ** x),
+        '110': _next_cell_operation(lambda x, y: x ** y),
+        '111': _next_cell_operation(lambda x, y: x ** (1 / y)),
+        '112': _cell_operation(math.erf),
+        '113': _cell_operation(math.erfc),
+        '114': _cell_operation(_factorial),
+        '115': _cell_operation(lambda x: math.factorial(abs(int(x)))),
+        '116': _next_cell_operation(math.hypot),
+        '117': _next_cell_operation(math.log),
+        '144': _cell_operation(lambda x: 0.1 * x),
+        '145': _cell_operation(lambda x: 10 * x),
+        '146': _tape_operation(lambda a, p: sum(a[p+1:])),
+        '147': _tape_operation(lambda a, p: sum(a[p:])),
+        '148': _tape_operation(lambda a, p: sum(a[0:p])),
+        '149': _tape_operation(lambda a, p: sum(a[0:p+1])),
+        '150': _tape_operation(lambda a, p: sum(a)),
+        '151': _tape_operation(lambda a, p: _average(a[p+1:])),
+        '152': _tape_operation(lambda a, p: _average(a[p:])),
+        '153': _tape_operation(lambda a, p: _average(a[0:p])),
+        '154': _tape_operation(lambda a, p: _average(a[0:p+1])),
+        '155': _new_tape_operation(lambda a, p: [0.5 * x for x in a]),
+        '156': _new_tape_operation(lambda a, p: [2 * x for x in a]),
+        '157': _new_tape_operation(lambda a, p: [0.1 * x for x in a]),
+        '158': _new_tape_operation(lambda a, p: [10 * x for x in a]),
+        '159': _new_tape_operation(lambda a, p: [0.01 * x for x in a]),
+        '160': _new_tape_operation(lambda a, p: [100 * x for x in a]),
+        '165': _new_tape_operation(lambda a, p: [-1 * x for x in a]),
+        '166': _new_tape_operation(
+            lambda a, p: a[0:p+1] + [x * x for x in a[p+1:]]),
+        '167': _new_tape_operation(
+            lambda a, p: [x * x for x in a[:p]] + a[p:]),
+        '168': _new_tape_operation(lambda a, p: [x * x for x in a]),
+        '169': _new_tape_operation(lambda a, p: [math.sqrt(x) for x in a]),
+        '170': _new_tape_operation(
+            lambda a, p: a[0:p+1] + [math.sqrt(x) for x in a[p+1:]]),
+        '171': _new_tape_operation(
+            lambda a, p: [math.sqrt(x) for x in a[:p]] + a[p:]),
+        '196': _tape_operation(_standard_deviation),
+        '197': _tape_operation(
+            lambda a, p: SingleSample(a).geometricMean()),
+        '198': _tape_operation(
+            lambda a, p: SingleSample(a).harmonicMean()),
+        },
+    output_IO: {
+        '021': _output_operation(_append_output(lambda a, p, sp: p)),
+        '022': _output_operation(_append_output(lambda a, p, sp: sp)),
+        '037': _output_to_cell(-1, True),
+        '038': _output_to_cell(-1, False),
+        '039': _output_to_cell(0, True),
+        '040': _output_to_cell(0, False),
+        '041': _output_operation(_remove_output(0)),
+        '042': _output_operation(_remove_output(-1)),
+        '172': _output_operation(
+            lambda a, p, o, sp: o + a[p+1:] if p != (len(a) - 1) else o),
+        '173': _output_tape,
+        '174': _output_operation(lambda a, p, o, sp: o + a),
+        '175': _output_clear_tape,
+        },
+    logic: {
+        '120': _logic_operation(lambda x, y, xv, yv: x and y),
+        '121': _logic_operation(lambda x, y, xv, yv: x or y),
+        '122': _logic_operation(lambda x, y, xv, yv: not x),
+        '123': _logic_operation(lambda x, y, xv, yv: xv < yv),
+        '124': _logic_operation(lambda x, y, xv, yv: xv > yv),
+        '125': _logic_operation(lambda x, y, xv, yv: xv == yv),
+        '126': _logic_operation(lambda x, y, xv, yv: xv != yv),
+        '127': _logic_operation(lambda x, y, xv, yv: xv <= yv),
+        '128': _logic_operation(lambda x, y, xv, yv: xv >= yv),
+        '129': _logic_operation(lambda x, y, xv, yv: not (x and y)),
+        '130': _logic_operation(lambda x, y, xv, yv: not (x or y)),
+        },
+    flipping: {
+        '046': _flip_tape,
+        '047': _flip_output,
+        '048': _flip_source,
+        },
+    input_IO: {
+        '064': _read_input,
+        },
+    tape_manipulate: {
+        '081': _swap_cell,
+        '131': _new_tape_operation(
+            lambda a, p: a[0:p+1] + a[p+1:][::-1] \
+                if (p + 1) < len(a) else a),
+        '161': _cut_tape(lambda a, p: (a[p:] + a[0:p], 0)),
+        '162': _cut_tape(
+            lambda a, p: (a[p+1:] + a[0:p+1], len(a) - 1)),
+        '163': _cut_tape(_cut_cell_to_front),
+        '164': _cut_tape(_cut_cell_to_end),
+        },
+    register_IO: dict(
+        [(str(201 + i), _register_store(i)) for i in range(99)] + \
+        [(str(301 + i), _register_load(i)) for i in range(99)] + \
+        [(str(501 + i), _register_clear(i)) for i in range(99)]),
+    }
+
+# Specialised operations of the bounded mathematical operations (see 
+# bounded_mathematics), as of the mathematical operations, except for the 
+# instructions which may overflow.
+specialised_ragaraja[bounded_mathematics] = \
+    dict(specialised_ragaraja[mathematics])
+specialised_ragaraja[bounded_mathematics].update({
+    '099': _cell_operation(_bounded_sinh),
+    '100': _cell_operation(_bounded_cosh),
+    '107': _cell_operation(lambda x: _bounded_power(x, math.e)),
+    '108': _cell_operation(lambda x: _bounded_power(math.e, x)),
+    '109': _cell_operation(lambda x: _bounded_power(10, x)),
+    '110': _next_cell_operation(_bounded_power),
+    '111': _next_cell_operation(lambda x, y: _bounded_power(x, 1 / y)),
+    '114': _cell_operation(
+        lambda x: _bounded_factorial(x) if x >= 0 else x),
+    '115': _cell_operation(lambda x: _bounded_factorial(abs(x))),
+    })
+
+# Simple operations (see register_machine.DispatchTable) of the Ragaraja
+# instructions as (tape pointer move, change in value of current cell),
+# for folding runs of simple instructions into superinstructions (see
+# register_machine.Superinstruction). Instructions which are not used
+# are folded as instructions doing nothing.
+superinstructions_ragaraja = {
+    forward: (1, 0),
+    backward: (-1, 0),
+    increment: (0, 1),
+    decrement: (0, -1),
+    jump_identifier: (0, 0),
+    not_used: (0, 0),
+    tape_move: {'001': (5, 0), '002': (10, 0),
+                '005': (-5, 0), '006': (-10, 0)},
+    accumulations: {'009': (0, 5), '010': (0, 10),
+                    '012': (0, -5), '013': (0, -10)},
+    }
+
+# Nondeterministic operations of the Ragaraja instructions, which use random
+# numbers (050 to 060, and 049), store values outside of the tape (registers),
+# or change the source. Sources with these instructions are not cached (see
+# register_machine.ResultCache).
+nondeterministic_ragaraja = [nBF_random_op, source_manipulate, register_IO]
+
+# Structural operations of the Ragaraja instructions, which depend on other 
+# instructions of the source - loop start (014) and loop end (015) are 
+# matched by the bracket table of the source. Changes of these instructions 
+# are executed from the start of the source by execution checkpoints (see 
+# register_machine.Checkpoints).
+structural_ragaraja = [loop_start, loop_end]
+
+# Costs of the Ragaraja instructions for cost-weighted execution budgets (see
+# register_machine.Budget), relative to the cost of 1 for the instructions 
+# not listed. Powers (107 to 111) and factorials (114 and 115) of cell values 
+# grow with the values, and instructions on the whole tape (016 to 019, 034 
+# to 036, 146 to 171, and 187 to 198) grow with the length of the tape.
+cost_ragaraja = dict(
+    [(x, 10) for x in ('107', '108', '109', '110', '111')] + \
+    [(x, 100) for x in ('114', '115')] + \
+    [(x, 10) for x in ('016', '017', '018', '019', '034', '035', '036')] + \
+    [(str(x), 10) for x in range(146, 172)] + \
+    [(str(x), 10) for x in range(187, 199)])
+
+# Operations of the Ragaraja instructions which can be executed in lockstep
+# (see lockstep.LockstepTable) - simple operations (as superinstructions),
+# loop start (014), loop end (015), output of current cell (020), and the
+# arithmetic operations (see lockstep.arithmetics) on the current cell and
+# the next cell - double (032), half (033), add (065), subtract (068),
+# multiply (071), divide (074), truncate (080) and negate (087). These
+# cover the NucleotideBF (nBF) instructions except the random operations.
+_lockstep_arithmetic = {'065': 'add', '068': 'subtract', '071': 'multiply',
+                        '074': 'divide', '080': 'truncate', '087': 'negate'}
+lockstep_ragaraja = {'simple': superinstructions_ragaraja,
+                     'loop_start': [loop_start],
+                     'loop_end': [loop_end],
+                     'output': [call_out],
+                     'arithmetic': {
+                         accumulations: {'032': 'double', '033': 'half'},
+                         mathematics: _lockstep_arithmetic,
+                         bounded_mathematics: _lockstep_arithmetic}}
+
+# Operations of the Ragaraja instructions which are generated as Python code 
+# (see codegen.generate) - as lockstep_ragaraja - and the operations of 
+# sources which are not compiled (nondeterministic operations). Other 
+# operations are called from the generated functions.
+codegen_ragaraja = dict(lockstep_ragaraja, 
+                        excluded=nondeterministic_ragaraja)
+
+def _vectorised(tape_class, handler):
+    '''
+    Generates a vectorised operation (see vectorised_ragaraja) converting 
+    the tape into tape_class (if it is not) before executing the handler, 
+    which uses the whole-tape operations of tape_class (see tapes).
+    '''
+    def vectorised_handler(array, apointer, inputdata, output, 
+                           source, spointer):
+        if not isinstance(array, tape_class): array = tape_class(array)
+        return handler(array, apointer, inputdata, output, source, spointer)
+    return vectorised_handler
+
+vectorised_tables = {}
+
+def vectorised_ragaraja(tape_class):
+    '''
+    Gives the specialised operations (see specialised_ragaraja) of the 
+    Ragaraja instructions for a tape class (such as tapes.NumPyTape), 
+    where instructions changing the length of the tape (016 to 019, and 
+    034 to 036), and instructions operating on the whole tape (146 to 
+    160, 165 to 171, and 187 to 195) use the whole-tape operations of the 
+    tape class instead of building new lists.
+
+    @param tape_class: Tape class with whole-tape operations (see tapes).
+    @return: Dictionary of specialised operations, for 
+    register_machine.execute.
+
+    @since: version 1.0.6
+    '''
+    if tape_class in vectorised_tables:
+        return vectorised_tables[tape_class]
+    operations = {
+        tape_size: {
+            '016': _tape_resize(lambda a, p, o: a.resize(len(a) + 1)),
+            '017': _tape_resize(lambda a, p, o: a.resize(len(a) + 10)),
+            '018': _tape_resize(lambda a, p, o: a.resize(len(a) - 1)),
+            '019': _tape_resize(lambda a, p, o: a.resize(len(a) - 10)),
+            '034': _tape_resize(_insert_cell),
+            '035': _tape_resize(_delete_cell),
+            '036': _tape_resize(_output_cell)},
+        mathematics: {
+            '146': _tape_operation(lambda a, p: a.total(p+1, None)),
+            '147': _tape_operation(lambda a, p: a.total(p, None)),
+            '148': _tape_operation(lambda a, p: a.total(0, p)),
+            '149': _tape_operation(lambda a, p: a.total(0, p+1)),
+            '150': _tape_operation(lambda a, p: a.total()),
+            '151': _tape_operation(lambda a, p: a.mean(p+1, None)),
+            '152': _tape_operation(lambda a, p: a.mean(p, None)),
+            '153': _tape_operation(lambda a, p: a.mean(0, p)),
+            '154': _tape_operation(lambda a, p: a.mean(0, p+1)),
+            '155': _new_tape_operation(lambda a, p: a.multiply(0.5)),
+            '156': _new_tape_operation(lambda a, p: a.multiply(2)),
+            '157': _new_tape_operation(lambda a, p: a.multiply(0.1)),
+            '158': _new_tape_operation(lambda a, p: a.multiply(10)),
+            '159': _new_tape_operation(lambda a, p: a.multiply(0.01)),
+            '160': _new_tape_operation(lambda a, p: a.multiply(100)),
+            '165': _new_tape_operation(lambda a, p: a.multiply(-1)),
+            '166': _new_tape_operation(lambda a, p: a.square(p+1, None)),
+            '167': _new_tape_operation(lambda a, p: a.square(None, p)),
+            '168': _new_tape_operation(lambda a, p: a.square()),
+            '169': _new_tape_operation(lambda a, p: a.sqrt()),
+            '170': _new_tape_operation(lambda a, p: a.sqrt(p+1, None)),
+            '171': _new_tape_operation(lambda a, p: a.sqrt(None, p))},
+        set_tape_value: {
+            '187': _new_tape_operation(lambda a, p: a.fill(0, p+1, None)),
+            '188': _new_tape_operation(lambda a, p: a.fill(0, None, p)),
+            '189': _new_tape_operation(lambda a, p: a.fill(0)),
+            '190': _new_tape_operation(lambda a, p: a.fill(a[p])),
+            '191': _new_tape_operation(lambda a, p: a.fill(p)),
+            '192': _new_tape_operation(
+                lambda a, p: a.fill_cell(p, p+1, None)),
+            '193': _new_tape_operation(
+                lambda a, p: a.fill_cell(p, None, p)),
+            '194': _new_tape_operation(lambda a, p: a.fill(p, p+1, None)),
+            '195': _new_tape_operation(lambda a, p: a.fill(p, None, p))},
+        }
+    operations[bounded_mathematics] = operations[mathematics]
+    vectorised = dict(specialised_ragaraja)
+    for handler in operations:
+        table = dict(specialised_ragaraja[handler])
+        for instruction in operations[handler]:
+            table[instruction] = _vectorised(tape_class, 
+                                    operations[handler][instruction])
+        vectorised[handler] = table
+    vectorised_tables[tape_class] = vectorised
+    return vectorised
+
+bounded_tables = {}
+
+def bounded_ragaraja(functions=ragaraja):
+    '''
+    Gives a copy of a dictionary of functions / operations (such as the 
+    Ragaraja instructions), where the mathematical operations (see 
+    mathematics) are replaced by the bounded mathematical operations (see 
+    bounded_mathematics), for executing on a bounded tape (see 
+    tapes.BoundedTape). The copies are kept for re-use, and re-generated 
+    when the dictionary of functions / operations is changed (such as by 
+    activate_version).
+
+    @param functions: Dictionary of functions / operations. Default = 
+    Ragaraja instructions
+    @type functions: dictionary
+    @return: Dictionary of functions / operations.
+
+    @since: version 1.0.6
+    '''
+    operations = list(functions.values())
+    if id(functions) in bounded_tables:
+        (original, original_operations, bounded) = \
+            bounded_tables[id(functions)]
+        if original is functions and original_operations == operations:
+            return bounded
+    bounded = {}
+    for instruction in functions:
+        if functions[instruction] is mathematics:
+            bounded[instruction] = bounded_mathematics
+        else:
+            bounded[instruction] = functions[instruction]
+    bounded_tables[id(functions)] = (functions, operations, bounded)
+    return bounded
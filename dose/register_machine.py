@@ -6,19 +6,778 @@ The machine consists of the following elements:
     1. Array/Tape: A circular tape for operations to occur
     2. Source: The program
     3. Input List: A list of data given to the machine at initialization.
-    4. Output List: A list of output from the execution. This may also be 
-    used as a secondary tape. 
+    4. Output List: A list of output from the execution. This may also be
+    used as a secondary tape.
 
-When the program terminates, all 4 elements are returned, and the 
-machine terminates itself. 
+When the program terminates, all 4 elements are returned, and the
+machine terminates itself.
 '''
 
+import math
+import threading
+from collections import OrderedDict
+
+try:
+    from time import perf_counter as timer
+except ImportError:
+    from time import time as timer
+
+class JournalList(list):
+    '''
+    List which records the inverse of every in-place change made to it
+    into a journal (a list shared by all journaled lists of a machine).
+    This allows the changes made by a failed instruction to be rolled
+    back, without copying the entire list before every instruction.
+
+    Each journal entry is a tuple of (function, arguments...) which, when
+    called in reverse order of recording, undoes the changes.
+    '''
+    __slots__ = ('journal',)
+
+    def __init__(self, data=(), journal=None):
+        '''
+        @param data: Initial content of the list.
+        @param journal: Journal to record into. A new journal will be
+        created if not given.
+        @type journal: list
+        '''
+        list.__init__(self, data)
+        if journal is None: journal = []
+        self.journal = journal
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            self.journal.append((list.__setitem__, self,
+                                 slice(None), list(self)))
+        else:
+            self.journal.append((list.__setitem__, self,
+                                 index, list.__getitem__(self, index)))
+        list.__setitem__(self, index, value)
+
+    def __delitem__(self, index):
+        self.journal.append((list.__setitem__, self,
+                             slice(None), list(self)))
+        list.__delitem__(self, index)
+
+    def __iadd__(self, other):
+        self.journal.append((list.__delitem__, self,
+                             slice(len(self), None)))
+        return list.__iadd__(self, other)
+
+    def __imul__(self, other):
+        self.journal.append((list.__setitem__, self,
+                             slice(None), list(self)))
+        return list.__imul__(self, other)
+
+    def append(self, value):
+        self.journal.append((list.__delitem__, self,
+                             slice(len(self), None)))
+        list.append(self, value)
+
+    def extend(self, values):
+        self.journal.append((list.__delitem__, self,
+                             slice(len(self), None)))
+        list.extend(self, values)
+
+    def insert(self, index, value):
+        length = len(self)
+        if index < 0: index = max(0, length + index)
+        if index > length: index = length
+        list.insert(self, index, value)
+        self.journal.append((list.pop, self, index))
+
+    def pop(self, index=-1):
+        value = list.pop(self, index)
+        if index < 0: index = len(self) + 1 + index
+        self.journal.append((list.insert, self, index, value))
+        return value
+
+    def remove(self, value):
+        self.journal.append((list.__setitem__, self,
+                             slice(None), list(self)))
+        list.remove(self, value)
+
+    def clear(self):
+        self.journal.append((list.__setitem__, self,
+                             slice(None), list(self)))
+        list.clear(self)
+
+    def reverse(self):
+        list.reverse(self)
+        self.journal.append((list.reverse, self))
+
+    def sort(self, *args, **kwargs):
+        self.journal.append((list.__setitem__, self,
+                             slice(None), list(self)))
+        list.sort(self, *args, **kwargs)
+
+def rollback(journal):
+    '''
+    Undo all the changes recorded in a journal (see JournalList), in
+    reverse order of recording, and empty the journal.
+
+    @param journal: Journal shared by the journaled lists.
+    @type journal: list
+    '''
+    while journal:
+        entry = journal.pop()
+        entry[0](*entry[1:])
+
+class InstructionTable(dict):
+    '''
+    Immutable dictionary of functions / operations (such as an instruction 
+    set given by ragaraja.instruction_table), which can be shared by 
+    simulations and worker processes as it cannot be changed (such as by 
+    ragaraja.activate_version) after it is generated. The functions / 
+    operations are also indexed by opcode - the position of the 
+    instruction in instructions - as handlers.
+    '''
+    __slots__ = ('instructions', 'handlers', 'opcodes')
+
+    def __init__(self, functions=()):
+        '''
+        @param functions: Dictionary of functions / operations, or list of 
+        (instruction, function / operation).
+        '''
+        dict.__init__(self, functions)
+        self.instructions = tuple(self.keys())
+        self.handlers = tuple(self.values())
+        self.opcodes = dict([(self.instructions[i], i) 
+                             for i in range(len(self.instructions))])
+
+    def immutable(self, *args, **kwargs):
+        raise TypeError('InstructionTable cannot be changed')
+
+    __setitem__ = immutable
+    __delitem__ = immutable
+    __ior__ = immutable
+    clear = immutable
+    pop = immutable
+    popitem = immutable
+    setdefault = immutable
+    update = immutable
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
+
+def journaled(data, journal):
+    '''
+    Gives a journaled copy of a list or tape (see tapes), which records 
+    the inverse of its changes into a journal. Tapes which can journal 
+    their own changes (having a journaled method) are kept as tapes, 
+    other lists and tapes are copied into a JournalList.
+
+    @param data: List or tape to journal.
+    @param journal: Journal to record into.
+    @type journal: list
+    @return: JournalList or journaled tape.
+
+    @since: version 1.0.6
+    '''
+    if hasattr(data, 'journaled'):
+        return data.journaled(journal)
+    return JournalList(data, journal)
+
+class Context(object):
+    '''
+    Execution context of the register machine, carrying the state of the 
+    machine outside of the tape, the input list, the output list and the 
+    source - registers and named stacks - for the functions / operations 
+    to use (through current_context) instead of module-level lists. A 
+    context given to an interpreter loop (interpret or execute) is the 
+    current context of the thread during the execution, so that 
+    executions with different contexts do not share registers and stacks, 
+    and may run in separate threads. At the end of the execution, the 
+    tape, the tape pointer, the input list, the output list, the source 
+    and the source pointer are stored into the context.
+    '''
+    def __init__(self, registers=99):
+        '''
+        @param registers: Number of registers (each starting as 0). 
+        Default = 99 (as Ragaraja)
+        @type registers: integer
+        '''
+        self.registers = [0] * registers
+        self.stacks = {}
+        self.store(None, 0, [], [], '', 0)
+
+    def stack(self, name):
+        '''
+        Gives a named stack (list) of the context, which is created empty 
+        if it is not in the context.
+
+        @param name: Name of the stack.
+        @type name: string
+        @return: Stack (list).
+        '''
+        if name not in self.stacks:
+            self.stacks[name] = []
+        return self.stacks[name]
+
+    def store(self, array, apointer, inputdata, output, source, spointer):
+        '''
+        Stores the tape, the tape pointer, the input list, the output list, 
+        the source and the source pointer of an execution into the context.
+        '''
+        self.array = array
+        self.apointer = apointer
+        self.inputdata = inputdata
+        self.output = output
+        self.source = source
+        self.spointer = spointer
+
+# Default context, which is the current context of executions without a 
+# context (such as ragaraja.register for the registers of Ragaraja).
+default_context = Context()
+
+contexts = threading.local()
+
+def current_context():
+    '''
+    Gives the current context (see Context) of the thread, which is the 
+    context of the execution by the interpreter loop in this thread, or 
+    the default context if the execution is not given a context.
+
+    @return: Context object.
+
+    @since: version 1.0.6
+    '''
+    return getattr(contexts, 'current', default_context)
+
+def within(context, engine, *args, **kwargs):
+    '''
+    Executes an interpreter loop (interpret or execute) with a context as 
+    the current context of the thread, restoring the previous current 
+    context afterwards, and stores the results of the interpreter loop 
+    into the context.
+
+    @param context: Context object.
+    @param engine: Interpreter loop (interpret or execute), which is 
+    given the other arguments.
+    @return: Results of the interpreter loop - (array, apointer, 
+    inputdata, output, source, spointer).
+
+    @since: version 1.0.6
+    '''
+    previous = current_context()
+    contexts.current = context
+    try:
+        result = engine(*args, **kwargs)
+    finally:
+        contexts.current = previous
+    context.store(*result)
+    return result
+
+class Profile(object):
+    '''
+    Execution profile of interpreter loops (interpret and execute), 
+    recording the number of executions and the cumulative execution time 
+    of each instruction, the number of executions of each instruction 
+    which raised an exception (and were rolled back), and the number of 
+    unknown instructions. The number of instructions executed for each 
+    organism, and the number of chromosome errors, are recorded by 
+    simulation_calls.interpret_chromosome.
+    '''
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        '''
+        Clears the profile.
+        '''
+        self.counts = {}
+        self.times = {}
+        self.rollbacks = {}
+        self.unknown = 0
+        self.errors = 0
+        self.organisms = {}
+
+    def record(self, instruction, elapsed, rolled_back=False):
+        '''
+        Records an execution of an instruction.
+
+        @param instruction: Executed instruction.
+        @type instruction: string
+        @param elapsed: Execution time in seconds.
+        @type elapsed: float
+        @param rolled_back: True if the instruction raised an exception 
+        and was rolled back. Default = False
+        @type rolled_back: boolean
+        '''
+        self.counts[instruction] = self.counts.get(instruction, 0) + 1
+        self.times[instruction] = self.times.get(instruction, 0.0) + elapsed
+        if rolled_back:
+            self.rollbacks[instruction] = \
+                self.rollbacks.get(instruction, 0) + 1
+
+    def organism(self, name, instructions):
+        '''
+        Records the number of instructions executed for an organism.
+
+        @param name: Name (identity) of the organism.
+        @param instructions: Number of instructions executed.
+        @type instructions: integer
+        '''
+        self.organisms[name] = self.organisms.get(name, 0) + instructions
+
+    def total(self):
+        '''
+        Gives the total number of instructions executed.
+        '''
+        return sum(self.counts.values())
+
+    def statistics(self):
+        '''
+        Gives the statistics of the profile.
+
+        @return: Dictionary of total number of instructions executed 
+        (instructions), total execution time (time), total number of 
+        rolled back instructions (rollbacks), number of unknown 
+        instructions (unknown), number of chromosome errors (errors), and 
+        dictionaries of number of executions (counts), cumulative 
+        execution time (times) and number of rolled back executions 
+        (rollback_counts) of each instruction, and of number of 
+        instructions executed for each organism (organisms).
+        '''
+        return {'instructions': self.total(),
+                'time': sum(self.times.values()),
+                'rollbacks': sum(self.rollbacks.values()),
+                'unknown': self.unknown,
+                'errors': self.errors,
+                'counts': dict(self.counts),
+                'times': dict(self.times),
+                'rollback_counts': dict(self.rollbacks),
+                'organisms': dict(self.organisms)}
+
+class Budget(object):
+    '''
+    Cost-weighted execution budget of interpreter loops (interpret and 
+    execute), which can be shared by several executions (such as the 
+    chromosomes of an organism). Each instruction is charged its cost, 
+    from a table of costs of instructions, before it is executed. The 
+    machine is terminated, with the results of the instructions executed 
+    so far, before an instruction which would bring the total cost over 
+    the maximum cost, or when the time since the budget was created is 
+    over the maximum time. As the budget is checked between instructions, 
+    an instruction which is being executed is not interrupted.
+    '''
+    def __init__(self, costs=None, max_cost=None, max_time=None, 
+                 default_cost=1):
+        '''
+        @param costs: Dictionary of costs of instructions. Default = None 
+        (every instruction costs default_cost)
+        @type costs: dictionary
+        @param max_cost: Maximum total cost of executed instructions. 
+        Default = None (no maximum)
+        @param max_time: Maximum execution time in seconds. Default = None 
+        (no maximum)
+        @type max_time: float
+        @param default_cost: Cost of instructions not in the table of 
+        costs. Default = 1
+        '''
+        if costs == None: costs = {}
+        self.costs = costs
+        self.max_cost = max_cost
+        self.max_time = max_time
+        self.default_cost = default_cost
+        self.cost = 0
+        self.started = timer()
+        self.exceeded = None
+
+    def charge(self, instruction):
+        '''
+        Charges the cost of an instruction to be executed.
+
+        @param instruction: Instruction to be executed.
+        @type instruction: string
+        @return: True if the instruction can be executed, or False if the 
+        budget is exceeded (where exceeded is set to 'cost' or 'time').
+        '''
+        if self.exceeded != None: 
+            return False
+        cost = self.costs.get(instruction, self.default_cost)
+        if self.max_cost != None and self.cost + cost > self.max_cost:
+            self.exceeded = 'cost'
+            return False
+        if self.max_time != None and timer() - self.started > self.max_time:
+            self.exceeded = 'time'
+            return False
+        self.cost = self.cost + cost
+        return True
+
+def _exact(values):
+    '''
+    Gives the values of a part of a machine state with their types (and 
+    the signs of floats, as 0.0 == -0.0), for comparing repeated states 
+    exactly (see Repetition).
+    '''
+    return [(type(x), x, math.copysign(1, x) if type(x) is float else 0)
+            for x in values]
+
+class Repetition(object):
+    '''
+    Detection of repeated machine states in interpreter loops (interpret 
+    and execute), which can be shared by several executions (such as the 
+    chromosomes of an organism). The machine state - source pointer, 
+    tape pointer, tape, input list, output list, and whether the machine 
+    is halted - is compared every number of instructions (interval) with 
+    a saved state (by Brent's cycle detection, saving the state at 
+    doubling numbers of comparisons). As the instructions are 
+    deterministic, a repeated state repeats until the maximum number of 
+    instructions is executed; hence, the execution is terminated early, 
+    after executing the remaining instructions modulo the length of the 
+    repetition, which gives the same results as executing all the 
+    remaining instructions.
+
+    Sources with nondeterministic instructions (as ResultCache), or with 
+    instructions not found in the dictionary of functions / operations, 
+    are not checked. The source is looked through at the first 
+    comparison, so that executions shorter than the interval (most 
+    executions of short or halting sources) are not slowed down.
+    '''
+    def __init__(self, interval=100, nondeterministic=None):
+        '''
+        @param interval: Number of instructions between comparisons. 
+        Default = 100
+        @type interval: integer
+        @param nondeterministic: List of nondeterministic functions / 
+        operations. Default = None (all functions / operations are 
+        deterministic)
+        @type nondeterministic: list
+        '''
+        if nondeterministic == None: nondeterministic = []
+        self.interval = interval
+        self.nondeterministic = nondeterministic
+        self.non_terminating = False
+        self.skipped = 0
+        self.next = float('inf')
+
+    def start(self, source, functions, function_size=1):
+        '''
+        Starts checking an execution of a source.
+
+        @return: True if the source can be checked (the instructions of 
+        the source are looked through at the first comparison).
+        '''
+        self.saved = None
+        self.power = 1
+        self.steps = 0
+        self.next = float('inf')
+        self.functions = functions
+        self.source = source
+        self.function_size = function_size
+        self.scanned = False
+        if not isinstance(source, str):
+            return False
+        self.next = self.interval
+        return True
+
+    def deterministic(self):
+        '''
+        Looks through the instructions of the source of the execution.
+
+        @return: True if all instructions of the source are found and 
+        deterministic.
+        '''
+        self.scanned = True
+        for position in range(0, len(self.source), self.function_size):
+            instruction = self.source[position:position+self.function_size]
+            if instruction not in self.functions or \
+                self.functions[instruction] in self.nondeterministic:
+                return False
+        return True
+
+    def unaligned(self, instruction):
+        '''
+        Stops checking the execution if an instruction executed at a 
+        position of the source which is not at the start of an 
+        instruction is nondeterministic or not found.
+
+        @param instruction: Instruction to be executed.
+        @type instruction: string
+        '''
+        if instruction not in self.functions or \
+            self.functions[instruction] in self.nondeterministic:
+            self.next = float('inf')
+
+    def check(self, count, max_instructions, state):
+        '''
+        Compares the machine state after a number of instructions with 
+        the saved state.
+
+        @param count: Number of instructions executed.
+        @type count: integer
+        @param max_instructions: The maximum number of instructions to 
+        execute.
+        @type max_instructions: integer
+        @param state: Machine state - (spointer, apointer, halted, array, 
+        inputdata, output) with tuples of the lists.
+        @return: The maximum number of instructions to execute, which is 
+        reduced if the state is repeated.
+        '''
+        if not self.scanned and not self.deterministic():
+            self.next = float('inf')
+            return max_instructions
+        self.next = count + self.interval
+        if self.saved != None and self.saved[1] == state and \
+            all([_exact(x) == _exact(y) 
+                 for (x, y) in zip(state[3:], self.saved[1][3:])]):
+            period = count - self.saved[0]
+            remaining = (max_instructions + 1 - count) % period
+            self.non_terminating = True
+            self.skipped = self.skipped + \
+                (max_instructions + 1 - count) - remaining
+            self.next = float('inf')
+            return count + remaining - 1
+        self.steps = self.steps + 1
+        if self.saved == None or self.steps >= self.power:
+            self.saved = (count, state)
+            self.power = self.power * 2
+            self.steps = 0
+        return max_instructions
+
+class Checkpoints(object):
+    '''
+    Execution checkpoints of a source executed by execute - snapshots of 
+    the tape, tape pointer, source pointer, input data and output every 
+    number of instructions (interval), the instruction count at which 
+    each source position was first executed, and the results. When the 
+    source is changed (such as by mutations) and executed again on the 
+    same input data and tape, the execution resumes from the last 
+    snapshot before the first executed changed instruction, or the 
+    results are reused if no executed instruction is changed.
+
+    Executions with nondeterministic instructions (as ResultCache), or 
+    with instructions not found in the dictionary of functions / 
+    operations, are not resumed nor reused. Changes of instructions of 
+    structural functions / operations (such as loops, which are matched 
+    over the whole source), or of the length of the source, execute the 
+    source from the start.
+    '''
+    def __init__(self, interval=100, nondeterministic=None, 
+                 structural=None):
+        '''
+        @param interval: Number of instructions between snapshots. 
+        Default = 100
+        @type interval: integer
+        @param nondeterministic: List of nondeterministic functions / 
+        operations. Default = None (all functions / operations are 
+        deterministic)
+        @type nondeterministic: list
+        @param structural: List of functions / operations which depend on 
+        other instructions of the source. Default = None (no structural 
+        functions / operations)
+        @type structural: list
+        '''
+        if nondeterministic == None: nondeterministic = []
+        if structural == None: structural = []
+        self.interval = interval
+        self.nondeterministic = nondeterministic
+        self.structural = structural
+        self.functions = None
+        self.function_size = 1
+        self.key = None
+        self.source = None
+        self.reset()
+        self.resumes = 0
+        self.reuses = 0
+
+    def reset(self):
+        '''
+        Removes all snapshots and results, for executing from the start.
+        '''
+        self.snapshots = []
+        self.first = {}
+        self.next = 0
+        self.result = None
+        self.valid = True
+
+    def __getstate__(self):
+        '''
+        Pickles the checkpoints without the dictionary of functions / 
+        operations, so that unpickled checkpoints execute from the start.
+        '''
+        state = dict(self.__dict__)
+        state['functions'] = None
+        return state
+
+    def __deepcopy__(self, memo):
+        '''
+        Copies the checkpoints (such as for replicated chromosomes), 
+        sharing the snapshots which are not changed after they are taken.
+        '''
+        checkpoints = Checkpoints.__new__(Checkpoints)
+        checkpoints.__dict__.update(self.__dict__)
+        checkpoints.snapshots = list(self.snapshots)
+        checkpoints.first = dict(self.first)
+        return checkpoints
+
+    def changed(self, source):
+        '''
+        Gives the instruction count at which a changed instruction of the 
+        source (compared to the checkpointed source of the same length) 
+        was first executed.
+
+        @param source: Changed source.
+        @type source: string
+        @return: Instruction count, 0 if the source has to be executed 
+        from the start, or None if no executed instruction is changed.
+        '''
+        previous = self.source
+        size = self.function_size
+        if previous == source:
+            return None
+        block = 64 * size
+        for start in range(0, len(source), block):
+            if previous[start:start+block] == source[start:start+block]:
+                continue
+            for position in range(start, start + block, size):
+                old = previous[position:position+size]
+                new = source[position:position+size]
+                if old != new and \
+                    (self.functions.get(old) in self.structural or
+                     self.functions.get(new) in self.structural):
+                    return 0
+        count = None
+        for position in self.first:
+            if previous[position:position+size] != \
+                source[position:position+size] and \
+                (count == None or self.first[position] < count):
+                count = self.first[position]
+        return count
+
+    def start(self, source, functions, function_size, inputdata, array, 
+              size, max_instructions):
+        '''
+        Starts an execution of a source, giving the snapshot to resume 
+        from (where reused is False) or the results to reuse (where 
+        reused is True).
+
+        @return: Snapshot - (instruction count, array, apointer, 
+        inputdata, output, spointer) - or results - (array, apointer, 
+        inputdata, output, source, spointer) - or None if the source is 
+        executed from the start.
+
+        Parameters are as of execute.
+        '''
+        key = (function_size, size, max_instructions, list(inputdata),
+               list(array))
+        state = None
+        self.reused = False
+        if self.valid and self.source != None and \
+            self.functions is functions and self.key == key and \
+            len(self.source) == len(source):
+            count = self.changed(source)
+            if count == None and self.result != None:
+                self.reused = True
+                self.reuses = self.reuses + 1
+                (array, apointer, inputdata, output, 
+                    previous, spointer) = self.result
+                if isinstance(previous, list): 
+                    previous = list(source)
+                else:
+                    previous = source
+                state = (list(array), apointer, list(inputdata), 
+                         list(output), previous, spointer)
+            elif count:
+                snapshots = [x for x in self.snapshots if x[0] < count]
+                (executed, array, apointer, inputdata, output, 
+                    spointer) = snapshots[-1]
+                self.snapshots = snapshots
+                self.first = dict([(x, self.first[x]) 
+                                   for x in self.first 
+                                   if self.first[x] <= executed])
+                self.next = executed + self.interval
+                self.result = None
+                self.resumes = self.resumes + 1
+                state = (executed, list(array), apointer, list(inputdata), 
+                         list(output), spointer)
+        if state == None:
+            self.reset()
+            self.functions = functions
+            self.function_size = function_size
+            self.key = key
+        self.source = source
+        return state
+
+    def record(self, count, spointer, array, apointer, inputdata, output, 
+               source):
+        '''
+        Records an instruction before it is executed, taking a snapshot 
+        (of the results of the previous instructions) every interval 
+        instructions.
+
+        @param count: Instruction count of the instruction.
+        @type count: integer
+        '''
+        if spointer not in self.first:
+            self.first[spointer] = count
+            instruction = source[spointer:spointer+self.function_size]
+            if instruction not in self.functions or \
+                self.functions[instruction] in self.nondeterministic or \
+                (spointer % self.function_size != 0 and
+                 self.functions[instruction] in self.structural):
+                self.valid = False
+        if count > self.next:
+            self.snapshots.append((count - 1, list(array), apointer, 
+                                   list(inputdata), list(output), spointer))
+            self.next = count - 1 + self.interval
+
+    def finish(self, array, apointer, inputdata, output, source, spointer):
+        '''
+        Records the results of the execution.
+        '''
+        self.result = (list(array), apointer, list(inputdata), 
+                       list(output), source, spointer)
+
+def profiled(profile, instruction, handler, array, apointer, inputdata, 
+             output, source, spointer):
+    '''
+    Executes the function / operation of an instruction, recording the 
+    execution into a profile (see Profile). KeyError, which is taken as 
+    an unknown instruction by the interpreter loops, is not recorded.
+
+    @param profile: Profile to record into.
+    @type profile: Profile
+    @param instruction: Instruction to execute.
+    @type instruction: string
+    @param handler: Function / operation of the instruction.
+    @return: Results of the function / operation.
+
+    @since: version 1.0.6
+    '''
+    started = timer()
+    try:
+        result = handler(array, apointer, inputdata, output, source, spointer)
+    except KeyError:
+        raise
+    except:
+        profile.record(instruction, timer() - started, True)
+        raise
+    profile.record(instruction, timer() - started)
+    return result
+
 def interpret(source, functions,
              function_size=1, inputdata=[],
-             array=None, size=30, max_instructions=1000):
+             array=None, size=30, max_instructions=1000, profile=None,
+             budget=None, context=None, repetition=None):
     '''
     Interpreter loop.
     
+    Changes made by an instruction are journaled (see JournalList) and
+    rolled back if the instruction raises an exception. A rolled back
+    instruction halts the machine: no further instruction is executed,
+    but the remaining instructions are still counted and the source is
+    returned as a list of characters. The input list is updated in place
+    with the consumed input at the end of the execution. If the tape is a 
+    tape which can journal its changes (see journaled), tapes replaced by 
+    an instruction with a list are converted into the class of the tape.
+
+    If repetition is given, the execution is terminated early when the 
+    machine state is repeated, with the same results as executing the 
+    maximum number of instructions (see Repetition). Repeated states are 
+    not detected for executions with a profile or a budget.
+
     @param source: Instructions to execute.
     @type source: string
     @param functions: Dictionary of functions / operations.
@@ -34,47 +793,989 @@ def interpret(source, functions,
     @param max_instructions: The maximum number of instructions to execute. 
     Default = 1000
     @type max_instructions: integer
+    @param profile: Profile to record the execution of instructions into 
+    (see Profile). Default = None (not profiled)
+    @type profile: Profile
+    @param budget: Execution budget (see Budget), where the machine is 
+    terminated without halting when the budget is exceeded. Default = 
+    None (no budget)
+    @type budget: Budget
+    @param context: Execution context (see Context) for the registers and 
+    stacks used by the functions / operations. Default = None (the 
+    current context, see current_context)
+    @type context: Context
+    @param repetition: Detection of repeated machine states (see 
+    Repetition). Default = None (not detected)
+    @type repetition: Repetition
     '''
+    if context != None:
+        return within(context, interpret, source, functions, 
+                      function_size, inputdata, array, size, 
+                      max_instructions, profile, budget, None, repetition)
+    if repetition != None and (profile != None or budget != None):
+        repetition = None
     spointer = 0
     apointer = 0
-    output = list()
+    journal = []
+    output = JournalList([], journal)
     if array == None:
         array = [0] * size
+    tape_class = None
+    if hasattr(array, 'journaled'): tape_class = type(array)
     if len(array) > size:
         array = array[0:size]
+    if tape_class != None and not isinstance(array, tape_class):
+        array = tape_class(array)
+    array = journaled(array, journal)
+    given_inputdata = inputdata
+    inputdata = JournalList(inputdata, journal)
     if len(source) % function_size != 0:
         source = source + '!'*(function_size - \
                                len(source) % function_size)
         tokens = list(functions.keys())
         source = ''.join([x for x in source if x in tokens])
     instruction_count = 0
+    halted = False
+    if repetition != None:
+        repetition.start(source, functions, function_size)
     while spointer < len(source):
         instruction_count = instruction_count + 1
-        original_array = [x for x in array]
-        original_inputdata = [x for x in inputdata]
-        original_output = [x for x in output]
-        original_source = [x for x in source]
-        try:
-            cmd = source[spointer:spointer+function_size]
-            #print instruction_count, cmd
-            (array, apointer, inputdata, output,
-                source, spointer) = functions[cmd](array, apointer,
-                                                   inputdata, output,
-                                                   source, spointer)
-        except KeyError:
-            print(' '.join(['Unknown function: ', cmd,
-                            'at source position', str(spointer)]))
-        except:
-            # implement roll back operation
-            array = original_array
-            inputdata = original_inputdata
-            output = original_output
-            source = original_source
+        if repetition != None and \
+            (spointer < 0 or spointer % function_size != 0):
+            repetition.unaligned(source[spointer:spointer+function_size])
+        if not halted:
+            if budget != None and \
+                not budget.charge(source[spointer:spointer+function_size]):
+                break
+            try:
+                cmd = source[spointer:spointer+function_size]
+                #print instruction_count, cmd
+                if profile == None:
+                    (array, apointer, inputdata, output,
+                        source, spointer) = functions[cmd](array, apointer,
+                                                           inputdata, output,
+                                                           source, spointer)
+                else:
+                    (array, apointer, inputdata, output,
+                        source, spointer) = profiled(profile, cmd, 
+                                                     functions[cmd], array, 
+                                                     apointer, inputdata, 
+                                                     output, source, 
+                                                     spointer)
+            except KeyError:
+                if profile != None: profile.unknown = profile.unknown + 1
+                print(' '.join(['Unknown function: ', cmd,
+                                'at source position', str(spointer)]))
+            except:
+                # implement roll back operation
+                rollback(journal)
+                halted = True
+            del journal[:]
+            # operations replacing a list (instead of changing it in
+            # place) return a plain list, which has to be journaled
+            if getattr(array, 'journal', None) is not journal:
+                if tape_class != None and not isinstance(array, tape_class):
+                    array = tape_class(array)
+                array = journaled(array, journal)
+            if getattr(inputdata, 'journal', None) is not journal:
+                inputdata = journaled(inputdata, journal)
+            if getattr(output, 'journal', None) is not journal:
+                output = journaled(output, journal)
         if apointer > size - 1:
             apointer = apointer - size
         if apointer < 0:
             apointer = size + apointer
         spointer = spointer + function_size
+        if repetition != None and instruction_count >= repetition.next:
+            max_instructions = repetition.check(instruction_count, 
+                max_instructions, (spointer, apointer, halted, 
+                                   tuple(array), tuple(inputdata), 
+                                   tuple(output)))
         if instruction_count > max_instructions:
+            break
+    if halted:
+        source = [x for x in source]
+    if isinstance(given_inputdata, list):
+        given_inputdata[:] = inputdata
+        inputdata = given_inputdata
+    else:
+        inputdata = list(inputdata)
+    if hasattr(array, 'journaled'):
+        array = array.journaled(None)
+    else:
+        array = list(array)
+    return (array, apointer, inputdata, list(output), source, spointer)
+
+bracket_tables = {}
+max_bracket_tables = 1000
+
+def bracket_table(source, start, end, size=1):
+    '''
+    Matches the start and end brackets (such as start and end loop 
+    instructions) of a source, by counting the start and end brackets 
+    of the same alignment (position in the source modulus the length of 
+    each instruction) as each bracket. This is done once for each source, 
+    and the bracket tables are kept for re-use.
+
+    The forward table maps the position of each start bracket to the 
+    position of its matching end bracket (or None if there is no matching 
+    end bracket). The backward table maps the position of each end bracket 
+    to the position of its matching start bracket, where the start bracket 
+    is found before the end bracket. Positions which are not found in the 
+    tables, including unmatched end brackets, have to be looked up by the 
+    interpreter, which may add the looked up positions into the tables.
+
+    @param source: Instructions.
+    @type source: string
+    @param start: Start bracket instruction.
+    @type start: string
+    @param end: End bracket instruction.
+    @type end: string
+    @param size: Length of each instruction. Default = 1
+    @type size: integer
+    @return: (forward table, backward table) as dictionaries.
+
+    @since: version 1.0.6
+    '''
+    key = (source, start, end, size)
+    if key not in bracket_tables:
+        if len(bracket_tables) >= max_bracket_tables:
+            bracket_tables.clear()
+        forward = {}
+        backward = {}
+        for alignment in range(size):
+            opened = []
+            for position in range(alignment, len(source), size):
+                instruction = source[position:position+size]
+                if instruction == start:
+                    opened.append(position)
+                elif instruction == end and len(opened) > 0:
+                    matched = opened.pop()
+                    forward[matched] = position
+                    backward[position] = matched
+            for position in opened:
+                forward[position] = None
+        bracket_tables[key] = (forward, backward)
+    return bracket_tables[key]
+
+label_tables = {}
+
+def label_table(source, labels, size=1):
+    '''
+    Indexes the positions of labels (such as jump identifiers) in a 
+    source. This is done once for each source, and the label tables are 
+    kept for re-use.
+
+    @param source: Instructions.
+    @type source: string
+    @param labels: Label instructions.
+    @type labels: list
+    @param size: Length of each instruction. Default = 1
+    @type size: integer
+    @return: Dictionary where the key is the label and the value is the 
+    list of positions of the label in ascending order.
+
+    @since: version 1.0.6
+    '''
+    key = (source, tuple(labels), size)
+    if key not in label_tables:
+        if len(label_tables) >= max_bracket_tables:
+            label_tables.clear()
+        table = dict([(label, []) for label in labels])
+        for position in range(len(source)):
+            instruction = source[position:position+size]
+            if instruction in table:
+                table[instruction].append(position)
+        label_tables[key] = table
+    return label_tables[key]
+
+def unknown_function(array, apointer, inputdata, output, source, spointer):
+    '''
+    Handler for instructions which are not found in the dictionary of 
+    functions / operations. Raises KeyError, which is reported by the 
+    interpreter loop as an unknown function.
+    '''
+    raise KeyError(spointer)
+
+class DispatchTable(object):
+    '''
+    Dispatch table of a dictionary of functions / operations, where each 
+    instruction is given an integer opcode, which is the index of its 
+    function / operation in the dispatch table. Sources are compiled into 
+    lists of opcodes (see CompiledSource) using the dispatch table, and 
+    the compiled sources are kept for re-use.
+
+    Specialised functions / operations are used in place of the functions 
+    / operations given in the dictionary where available. A specialised 
+    function / operation must behave identically to the function / 
+    operation it replaces, and must not change the tape, input list or 
+    output list when it raises an exception; the changes made by all other 
+    functions / operations are rolled back by the interpreter loop (see 
+    execute) when they raise an exception.
+
+    Simple instructions, which only move the tape pointer or change the 
+    value of the current cell by a fixed amount, or do nothing, can be 
+    given as superinstructions. Runs of simple instructions in compiled 
+    sources are then folded into superinstructions (see Superinstruction).
+    '''
+    max_compiled = 1000
+
+    def __init__(self, functions, function_size=1, specialised=None,
+                 superinstructions=None):
+        '''
+        @param functions: Dictionary of functions / operations.
+        @param function_size: Length of each instruction. Default = 1
+        @type function_size: integer
+        @param specialised: Dictionary of specialised functions / 
+        operations where the key is the function / operation in the 
+        dictionary of functions / operations, and the value is either the 
+        specialised function / operation, or a dictionary of specialised 
+        function / operation for each instruction. Default = None (no 
+        specialised functions / operations)
+        @type specialised: dictionary
+        @param superinstructions: Dictionary of simple functions / 
+        operations where the key is the function / operation in the 
+        dictionary of functions / operations, and the value is either a 
+        tuple of (tape pointer move, change in value of current cell), or a 
+        dictionary of such tuples for each instruction. Default = None (no 
+        folding into superinstructions)
+        @type superinstructions: dictionary
+        '''
+        self.functions = functions
+        self.function_size = function_size
+        self.specialised = specialised
+        self.superinstructions = superinstructions
+        self.simple = []
+        self.operations = list(functions.values())
+        self.instructions = {}
+        self.handlers = []
+        self.safe = []
+        self.compiled = {}
+        self.opcode(None)
+
+    def is_current(self):
+        '''
+        Checks that the dictionary of functions / operations had not been 
+        changed (such as by ragaraja.activate_version) after the dispatch 
+        table was generated.
+
+        @return: True if the dispatch table is current.
+        '''
+        if isinstance(self.functions, InstructionTable):
+            return True
+        return list(self.functions.values()) == self.operations
+
+    def opcode(self, instruction):
+        '''
+        Gives the opcode of an instruction, adding the instruction into the 
+        dispatch table if it is not already in the dispatch table. Opcode 
+        0 (instruction = None) is reserved for the positions of a compiled 
+        source which are not at the start of an instruction, where the 
+        instruction will be looked up during execution.
+
+        @param instruction: Instruction to look up.
+        @type instruction: string
+        @return: Opcode of the instruction.
+        '''
+        if instruction in self.instructions:
+            return self.instructions[instruction]
+        simple = None
+        safe = False
+        if instruction == None:
+            handler = self.unaligned
+        else:
+            try:
+                handler = self.functions[instruction]
+            except KeyError:
+                handler = unknown_function
+            if handler is not unknown_function:
+                if self.superinstructions:
+                    simple = self.superinstructions.get(handler)
+                    if isinstance(simple, dict):
+                        simple = simple.get(instruction)
+                fast = self.specialise(instruction, handler)
+                safe = fast is not handler
+                handler = fast
+            else:
+                safe = True
+        self.instructions[instruction] = len(self.handlers)
+        self.handlers.append(handler)
+        self.simple.append(simple)
+        self.safe.append(safe)
+        return self.instructions[instruction]
+
+    def specialise(self, instruction, handler):
+        '''
+        Gives the specialised function / operation of an instruction, or 
+        the function / operation itself if there is no specialised 
+        function / operation.
+
+        @param instruction: Instruction.
+        @type instruction: string
+        @param handler: Function / operation of the instruction.
+        @return: Specialised function / operation, or the function / 
+        operation.
+        '''
+        fast = None
+        if self.specialised: fast = self.specialised.get(handler)
+        if isinstance(fast, dict):
+            fast = fast.get(instruction)
+        if fast == None: fast = handler
+        return fast
+
+    def unaligned(self, array, apointer, inputdata, output, source, spointer):
+        '''
+        Looks up and executes the instruction at a position of the source 
+        which is not at the start of an instruction.
+        '''
+        handler = self.handlers[self.opcode(
+            source[spointer:spointer+self.function_size])]
+        return handler(array, apointer, inputdata, output, source, spointer)
+
+    def compile(self, source):
+        '''
+        Compiles a source, or gives the compiled source if the source had 
+        been compiled.
+
+        @param source: Instructions to compile.
+        @type source: string
+        @return: CompiledSource object.
+        '''
+        if source not in self.compiled:
+            if len(self.compiled) >= self.max_compiled:
+                self.compiled.clear()
+            self.compiled[source] = CompiledSource(source, self)
+        return self.compiled[source]
+
+class Superinstruction(object):
+    '''
+    Run of simple instructions (see DispatchTable) folded into a single 
+    instruction. The tape pointer moves of the run are added up into a net 
+    move, and the changes of cell values are added up for each cell, so 
+    that moves and changes which cancel out are collapsed.
+
+    A superinstruction is only executed when it gives the same results as 
+    executing the run one instruction at a time; that is, when the tape 
+    pointer is within the tape, the moves do not exceed the tape length, 
+    and the values of the cells to change are integers.
+    '''
+    __slots__ = ('length', 'move', 'reach', 'changes')
+
+    def __init__(self, operations):
+        '''
+        @param operations: List of (tape pointer move, change in value of 
+        current cell) of the simple instructions in the run.
+        @type operations: list
+        '''
+        self.length = len(operations)
+        self.move = 0
+        self.reach = 0
+        changes = {}
+        for (move, change) in operations:
+            if change != 0:
+                changes[self.move] = changes.get(self.move, 0) + change
+            self.move = self.move + move
+            self.reach = max(self.reach, abs(move))
+        self.changes = tuple(changes.items())
+
+    def __call__(self, array, apointer, size):
+        '''
+        Executes the superinstruction.
+
+        @return: Tape pointer after execution, or None if the 
+        superinstruction cannot be executed (the run has to be executed 
+        one instruction at a time).
+        '''
+        if apointer < 0 or apointer >= size or len(array) < size or \
+            self.reach > size:
+            return None
+        for (offset, change) in self.changes:
+            if type(array[(apointer + offset) % size]) is not int:
+                return None
+        for (offset, change) in self.changes:
+            cell = (apointer + offset) % size
+            array[cell] = array[cell] + change
+        return (apointer + self.move) % size
+
+class CompiledSource(object):
+    '''
+    Source compiled into a list of integer opcodes (see DispatchTable), one 
+    for each position in the source. This allows the function / operation 
+    of each position to be looked up by indexing, without slicing the 
+    source and looking up the instruction in the dictionary of functions 
+    / operations.
+
+    If the dispatch table has superinstructions, runs of simple 
+    instructions are folded into superinstructions (see Superinstruction), 
+    kept in a list of the superinstruction starting at each position of 
+    the source (None if there is no run starting at the position).
+    '''
+    max_run = 32
+
+    def __init__(self, source, table):
+        '''
+        @param source: Instructions to compile.
+        @type source: string
+        @param table: Dispatch table to compile with.
+        @type table: DispatchTable object
+        '''
+        self.source = source
+        self.table = table
+        size = table.function_size
+        instructions = [source[position:position+size]
+                        for position in range(0, len(source), size)]
+        for instruction in set(instructions):
+            table.opcode(instruction)
+        self.opcodes = [0] * len(source)
+        self.opcodes[0::size] = [table.instructions[instruction]
+                                 for instruction in instructions]
+        self.superinstructions = None
+        if table.superinstructions:
+            self.fold(size)
+
+    def fold(self, size):
+        '''
+        Folds runs of simple instructions (two or more instructions, up to 
+        max_run instructions) into superinstructions. A superinstruction 
+        is made for each position of a run so that execution can jump into 
+        the middle of a run.
+
+        @param size: Length of each instruction.
+        @type size: integer
+        '''
+        simple = [self.table.simple[opcode] 
+                  for opcode in self.opcodes[0::size]]
+        self.superinstructions = [None] * len(self.opcodes)
+        for start in range(len(simple)):
+            operations = []
+            for operation in simple[start:start+self.max_run]:
+                if operation == None: break
+                operations.append(operation)
+            if len(operations) > 1:
+                self.superinstructions[start*size] = \
+                    Superinstruction(operations)
+
+dispatch_tables = {}
+
+def dispatch_table(functions, function_size=1, specialised=None,
+                   superinstructions=None):
+    '''
+    Gives the dispatch table (see DispatchTable) of a dictionary of 
+    functions / operations. Dispatch tables are kept for re-use, and 
+    re-generated when the dictionary of functions / operations is changed.
+
+    @param functions: Dictionary of functions / operations.
+    @param function_size: Length of each instruction. Default = 1
+    @type function_size: integer
+    @param specialised: Dictionary of specialised functions / operations 
+    (see DispatchTable). Default = None (no specialised functions / 
+    operations)
+    @type specialised: dictionary
+    @param superinstructions: Dictionary of simple functions / operations 
+    (see DispatchTable). Default = None (no folding into superinstructions)
+    @type superinstructions: dictionary
+    @return: DispatchTable object.
+    '''
+    key = (id(functions), function_size, id(specialised), 
+           id(superinstructions))
+    table = dispatch_tables.get(key)
+    if table == None or table.functions is not functions or \
+        table.specialised is not specialised or \
+        table.superinstructions is not superinstructions or \
+        not table.is_current():
+        table = DispatchTable(functions, function_size, specialised,
+                              superinstructions)
+        dispatch_tables[key] = table
+    return table
+
+def execute(source, functions,
+            function_size=1, inputdata=[],
+            array=None, size=30, max_instructions=1000,
+            specialised=None, superinstructions=None, profile=None,
+            budget=None, context=None, checkpoints=None, 
+            repetition=None, state=None):
+    '''
+    Interpreter loop executing compiled source (see CompiledSource). This 
+    gives the same results as interpret, but without slicing the source 
+    and looking up the dictionary of functions / operations for every 
+    instruction. Compiled sources are kept in the dispatch table (see 
+    dispatch_table) for re-use, and the source will be re-compiled 
+    whenever it is changed by an instruction.
+
+    As in interpret, changes made by an instruction are journaled (see 
+    JournalList) and rolled back if the instruction raises an exception. 
+    Tapes (see tapes) which cannot journal their changes are copied 
+    before each instruction which is not specialised (see DispatchTable).
+
+    If superinstructions are given, runs of simple instructions are 
+    executed as superinstructions (see Superinstruction). Each 
+    superinstruction is counted as the number of instructions in its run, 
+    and is not used where the run would exceed the maximum number of 
+    instructions to execute. If the tape is a tape (see tapes), tapes 
+    replaced by an instruction with a list are converted into the class 
+    of the tape.
+
+    If checkpoints are given, the execution is resumed from the 
+    checkpoints of the previous execution of the source, or the results 
+    of the previous execution are reused, where the source is only 
+    changed in instructions which do not change the results before them 
+    (see Checkpoints). Checkpoints are not used for executions with a 
+    profile or a budget, or on tapes (see tapes), and runs of simple 
+    instructions are not folded into superinstructions.
+
+    If repetition is given, the execution is terminated early when the 
+    machine state is repeated, with the same results as executing the 
+    maximum number of instructions (see Repetition). Repeated states are 
+    not detected for executions with a profile or a budget.
+
+    If state is given, the execution is resumed from the state of a 
+    machine which had executed the source up to the source pointer of the 
+    state (such as a machine executed in lockstep, see lockstep.resume), 
+    with the given tape and input data. Checkpoints are not used for 
+    resumed executions.
+
+    @param source: Instructions to execute.
+    @type source: string
+    @param functions: Dictionary of functions / operations.
+    @param function_size: Length of each instruction. Default = 1
+    @type function_size: integer
+    @param inputdata: Any input data that the function may need.
+    @type inputdata: list
+    @param array: The endless tape in a Turing machine which is implemented
+    as a circular list, making it virtually limitless.
+    @type array: list
+    @param size: Length of the type (array). Default = 30
+    @type size: integer
+    @param max_instructions: The maximum number of instructions to execute.
+    Default = 1000
+    @type max_instructions: integer
+    @param specialised: Dictionary of specialised functions / operations 
+    (see DispatchTable). Default = None (no specialised functions / 
+    operations)
+    @type specialised: dictionary
+    @param superinstructions: Dictionary of simple functions / operations 
+    (see DispatchTable). Default = None (no superinstructions)
+    @type superinstructions: dictionary
+    @param profile: Profile to record the execution of instructions into 
+    (see Profile), where runs of simple instructions are not folded into 
+    superinstructions so that each instruction is recorded. Default = None 
+    (not profiled)
+    @type profile: Profile
+    @param budget: Execution budget (see Budget), where runs of simple 
+    instructions are not folded into superinstructions so that each 
+    instruction is charged. Default = None (no budget)
+    @type budget: Budget
+    @param context: Execution context (see Context) for the registers and 
+    stacks used by the functions / operations. Default = None (the 
+    current context, see current_context)
+    @type context: Context
+    @param checkpoints: Execution checkpoints of the source (see 
+    Checkpoints). Default = None (no checkpoints)
+    @type checkpoints: Checkpoints
+    @param repetition: Detection of repeated machine states (see 
+    Repetition). Default = None (not detected)
+    @type repetition: Repetition
+    @param state: State to resume the execution from - (number of 
+    executed instructions, tape pointer, output list, source pointer). 
+    Default = None (execution from the start of the source)
+    @type state: tuple
+
+    @since: version 1.0.6
+    '''
+    if context != None:
+        return within(context, execute, source, functions, function_size, 
+                      inputdata, array, size, max_instructions, 
+                      specialised, superinstructions, profile, budget,
+                      None, checkpoints, repetition, state)
+    if not isinstance(source, str):
+        return interpret(source, functions, function_size, inputdata,
+                         array, size, max_instructions, profile, budget,
+                         None, repetition)
+    if repetition != None and (profile != None or budget != None):
+        repetition = None
+    spointer = 0
+    apointer = 0
+    journal = []
+    output = JournalList([], journal)
+    if array == None:
+        array = [0] * size
+    tape_class = None
+    if hasattr(array, 'zeros'): tape_class = type(array)
+    array = array[0:size]
+    if tape_class != None and not isinstance(array, tape_class):
+        array = tape_class(array)
+    # tapes which cannot journal their changes are copied before 
+    # functions / operations which are not specialised
+    snapshot = tape_class != None and not hasattr(array, 'journaled')
+    if not snapshot: array = journaled(array, journal)
+    given_inputdata = inputdata
+    inputdata = JournalList(inputdata, journal)
+    if len(source) % function_size != 0:
+        source = source + '!'*(function_size - \
+                               len(source) % function_size)
+        tokens = list(functions.keys())
+        source = ''.join([x for x in source if x in tokens])
+    if profile != None or budget != None or tape_class != None or \
+        state != None: 
+        checkpoints = None
+    if profile != None or budget != None or checkpoints != None: 
+        superinstructions = None
+    table = dispatch_table(functions, function_size, specialised,
+                           superinstructions)
+    program = table.compile(source)
+    source = program.source
+    opcodes = program.opcodes
+    folded = program.superinstructions
+    handlers = table.handlers
+    safe = table.safe
+    length = len(source)
+    instruction_count = 0
+    halted = False
+    original = None
+    if checkpoints != None:
+        resumed = checkpoints.start(source, functions, function_size, 
+                                    inputdata, array, size, 
+                                    max_instructions)
+        if resumed != None and checkpoints.reused:
+            (array, apointer, inputdata, output, source, spointer) = resumed
+            if isinstance(given_inputdata, list):
+                given_inputdata[:] = inputdata
+                inputdata = given_inputdata
             return (array, apointer, inputdata, output, source, spointer)
+        if resumed != None:
+            (instruction_count, array, apointer, inputdata, output, 
+                spointer) = resumed
+            array = journaled(array, journal)
+            inputdata = JournalList(inputdata, journal)
+            output = JournalList(output, journal)
+    elif state != None:
+        (instruction_count, apointer, output, spointer) = state
+        output = JournalList(output, journal)
+    if repetition != None:
+        repetition.start(source, functions, function_size)
+    (tape, data, result) = (array, inputdata, output)
+    while spointer < length:
+        if halted:
+            # a halted machine only moves the source pointer, to the end 
+            # of the source or the maximum number of instructions, and 
+            # wraps the tape pointer once per instruction
+            steps = min((length - spointer + function_size - 1) // 
+                        function_size, 
+                        max_instructions + 1 - instruction_count)
+            instruction_count = instruction_count + steps
+            spointer = spointer + steps * function_size
+            while steps > 0 and (apointer > size - 1 or apointer < 0):
+                if apointer > size - 1:
+                    apointer = apointer - size
+                if apointer < 0:
+                    apointer = size + apointer
+                steps = steps - 1
+            break
+        if folded and not halted and spointer >= 0 and \
+            folded[spointer] != None and \
+            instruction_count + folded[spointer].length <= \
+            max_instructions + 1:
+            superinstruction = folded[spointer]
+            moved = superinstruction(array, apointer, size)
+            if moved != None:
+                apointer = moved
+                instruction_count = instruction_count + \
+                    superinstruction.length
+                spointer = spointer + \
+                    superinstruction.length * function_size
+                if repetition != None and \
+                    instruction_count >= repetition.next:
+                    max_instructions = repetition.check(instruction_count,
+                        max_instructions, (spointer, apointer, halted, 
+                                           tuple(array), tuple(inputdata), 
+                                           tuple(output)))
+                if instruction_count > max_instructions:
+                    break
+                continue
+        instruction_count = instruction_count + 1
+        if checkpoints != None and not halted:
+            checkpoints.record(instruction_count, spointer, array, apointer,
+                               inputdata, output, source)
+        if repetition != None and \
+            (spointer < 0 or spointer % function_size != 0):
+            repetition.unaligned(source[spointer:spointer+function_size])
+        if not halted:
+            if budget != None and \
+                not budget.charge(source[spointer:spointer+function_size]):
+                break
+            if journal: del journal[:]
+            try:
+                if spointer >= 0:
+                    handler = handlers[opcodes[spointer]]
+                    if snapshot and not safe[opcodes[spointer]]:
+                        original = array[:]
+                else:
+                    handler = table.unaligned
+                    if snapshot: original = array[:]
+                if profile == None:
+                    (array, apointer, inputdata, output,
+                        source, spointer) = handler(array, apointer,
+                                                    inputdata, output,
+                                                    source, spointer)
+                else:
+                    (array, apointer, inputdata, output,
+                        source, spointer) = profiled(profile, 
+                            source[spointer:spointer+function_size], 
+                            handler, array, apointer, inputdata, output, 
+                            source, spointer)
+            except KeyError:
+                if profile != None: profile.unknown = profile.unknown + 1
+                cmd = source[spointer:spointer+function_size]
+                print(' '.join(['Unknown function: ', cmd,
+                                'at source position', str(spointer)]))
+            except:
+                # implement roll back operation
+                rollback(journal)
+                if snapshot and original is not None: 
+                    array[:] = original
+                halted = True
+            original = None
+            # operations replacing a list (instead of changing it in
+            # place) return a plain list, which has to be journaled
+            if array is not tape:
+                if tape_class != None and not isinstance(array, tape_class):
+                    array = tape_class(array)
+                if not snapshot: array = journaled(array, journal)
+                tape = array
+            if inputdata is not data:
+                inputdata = journaled(inputdata, journal)
+                data = inputdata
+            if output is not result:
+                output = journaled(output, journal)
+                result = output
+            if source is not program.source:
+                program = table.compile(source)
+                source = program.source
+                opcodes = program.opcodes
+                folded = program.superinstructions
+                length = len(source)
+        if apointer > size - 1:
+            apointer = apointer - size
+        if apointer < 0:
+            apointer = size + apointer
+        spointer = spointer + function_size
+        if repetition != None and instruction_count >= repetition.next:
+            max_instructions = repetition.check(instruction_count, 
+                max_instructions, (spointer, apointer, halted, 
+                                   tuple(array), tuple(inputdata), 
+                                   tuple(output)))
+        if instruction_count > max_instructions:
+            break
+    if halted:
+        source = [x for x in source]
+    if hasattr(array, 'journaled'):
+        array = array.journaled(None)
+    elif not snapshot:
+        array = list(array)
+    output = list(output)
+    if isinstance(given_inputdata, list):
+        given_inputdata[:] = inputdata
+        inputdata = given_inputdata
+    else:
+        inputdata = list(inputdata)
+    if checkpoints != None:
+        checkpoints.finish(array, apointer, inputdata, output, source, 
+                           spointer)
     return (array, apointer, inputdata, output, source, spointer)
+
+class ResultCache(object):
+    '''
+    Cache of the results of executing sources (see interpret and execute), 
+    where the key is the source, input data, initial tape, and the 
+    dictionary of functions / operations (with its version), so that 
+    identical sources executed on identical input data and tape are 
+    executed once.
+
+    Sources are checked before caching, and sources which may not give the 
+    same results each time they are executed - sources with instructions 
+    of nondeterministic functions / operations (such as functions / 
+    operations using random numbers, or storing values outside of the 
+    tape), or with instructions not found in the dictionary of functions 
+    / operations - are executed without caching (bypassed). The check 
+    looks at the instructions at the start of each instruction length in 
+    the source; hence, functions / operations which change the source 
+    should be given as nondeterministic.
+    Executions with an execution budget (see Budget) are also bypassed, 
+    as their results depend on the remaining budget.
+
+    Cached results are evicted when the cache is full, either least 
+    recently used results first (eviction = 'LRU') or the earliest cached 
+    results first (eviction = 'FIFO'). Hits, misses, bypasses and 
+    evictions are counted for sizing the cache (see statistics).
+    '''
+    def __init__(self, max_size=1000, eviction='LRU', nondeterministic=None):
+        '''
+        @param max_size: Maximum number of cached results. Default = 1000
+        @type max_size: integer
+        @param eviction: Eviction of cached results when the cache is full; 
+        'LRU' (least recently used first) or 'FIFO' (earliest cached 
+        first). Default = 'LRU'
+        @type eviction: string
+        @param nondeterministic: List of nondeterministic functions / 
+        operations. Default = None (no nondeterministic functions / 
+        operations)
+        @type nondeterministic: list
+        '''
+        if eviction not in ('LRU', 'FIFO'):
+            raise ValueError('Unknown eviction: ' + str(eviction))
+        self.max_size = max_size
+        self.eviction = eviction
+        if nondeterministic == None: nondeterministic = []
+        self.nondeterministic = nondeterministic
+        self.results = OrderedDict()
+        self.checked = {}
+        self.tables = {}
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.evictions = 0
+
+    def is_deterministic(self, source, functions, function_size=1):
+        '''
+        Checks that a source will give the same results each time it is 
+        executed on the same input data and tape.
+
+        @param source: Instructions to check.
+        @type source: string
+        @param functions: Dictionary of functions / operations.
+        @param function_size: Length of each instruction. Default = 1
+        @type function_size: integer
+        @return: True if the source can be cached.
+        '''
+        if not isinstance(source, str):
+            return False
+        key = (source, self._table(functions), function_size)
+        if key in self.checked:
+            return self.checked[key]
+        if len(source) % function_size != 0:
+            source = source + '!'*(function_size - \
+                                   len(source) % function_size)
+            tokens = list(functions.keys())
+            source = ''.join([x for x in source if x in tokens])
+        deterministic = True
+        for position in range(0, len(source), function_size):
+            instruction = source[position:position+function_size]
+            if instruction not in functions or \
+                functions[instruction] in self.nondeterministic:
+                deterministic = False
+                break
+        if len(self.checked) >= self.max_size:
+            self.checked.clear()
+        self.checked[key] = deterministic
+        return deterministic
+
+    def _table(self, functions):
+        '''
+        Gives the key of a dictionary of functions / operations. The 
+        dictionary is held by the cache, so that its identity is not given 
+        to another dictionary while its results are cached.
+        '''
+        if id(functions) not in self.tables:
+            self.tables[id(functions)] = functions
+        return id(functions)
+
+    def execute(self, engine, source, functions,
+                function_size=1, inputdata=[],
+                array=None, size=30, max_instructions=1000,
+                version=None, **options):
+        '''
+        Executes a source using an interpreter loop (interpret or execute), 
+        or gives the cached result if the source had been executed on the 
+        same input data and tape. As with the interpreter loops, the input 
+        data which is not consumed is written back into the input list.
+
+        @param engine: Interpreter loop (interpret or execute).
+        @param version: Version of the dictionary of functions / operations 
+        (such as the Ragaraja version), which should be changed whenever 
+        the dictionary of functions / operations is changed. Default = None
+        @param options: Other keyword arguments of the interpreter loop 
+        (such as specialised for execute).
+        @return: Results of the interpreter loop - (array, apointer, 
+        inputdata, output, source, spointer).
+
+        Other parameters are as of interpret.
+        '''
+        if not self.is_deterministic(source, functions, function_size) or \
+            options.get('budget') != None:
+            self.bypasses = self.bypasses + 1
+            return engine(source, functions, function_size, inputdata,
+                          array, size, max_instructions, **options)
+        if array == None:
+            tape = None
+        else:
+            tape = repr(array[0:size])
+        key = (source, self._table(functions), version, function_size, 
+               repr(list(inputdata)), tape, size, max_instructions)
+        if key in self.results:
+            self.hits = self.hits + 1
+            if self.eviction == 'LRU':
+                self.results.move_to_end(key)
+            (array, apointer, remaining, output, 
+                source, spointer) = self.results[key]
+            if isinstance(source, tuple): 
+                source = list(source)
+            if isinstance(array, tuple):
+                array = list(array)
+            else:
+                array = array[:]
+            if isinstance(inputdata, list):
+                inputdata[:] = remaining
+            else:
+                inputdata = list(remaining)
+            result = (array, apointer, inputdata, list(output),
+                      source, spointer)
+            if options.get('context') != None:
+                options['context'].store(*result)
+            return result
+        self.misses = self.misses + 1
+        result = engine(source, functions, function_size, inputdata,
+                        array, size, max_instructions, **options)
+        (array, apointer, remaining, output, source, spointer) = result
+        if isinstance(source, list): 
+            source = tuple(source)
+        if len(self.results) >= self.max_size:
+            self.results.popitem(last=False)
+            self.evictions = self.evictions + 1
+        if isinstance(array, list):
+            array = tuple(array)
+        else:
+            array = array[:]
+        self.results[key] = (array, apointer, tuple(remaining),
+                             tuple(output), source, spointer)
+        return result
+
+    def statistics(self):
+        '''
+        Gives the statistics of the cache.
+
+        @return: Dictionary of number of hits, misses, bypasses, 
+        evictions, cached results (size), and hit rate (hits / (hits + 
+        misses)).
+        '''
+        if self.hits + self.misses > 0:
+            hit_rate = float(self.hits) / (self.hits + self.misses)
+        else:
+            hit_rate = 0.0
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'bypasses': self.bypasses,
+                'evictions': self.evictions,
+                'size': len(self.results),
+                'hit_rate': hit_rate}
+
+    def clear(self):
+        '''
+        Removes all cached results and resets the statistics.
+        '''
+        self.results.clear()
+        self.checked.clear()
+        self.tables.clear()
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.evictions = 0
@@ -101,7 +101,7 @@ def simulate(entity_module):
         '''
         for name in population_names:
             for i in range(len(populations[name].agents)):
-                source = populations[name].agents[i].genome[0].sequence
+                source = populations[name].agents[i].genome[0].read_sequence()
                 source = ''.join(source)
                 if clean_cytoplasm:
                     array = [0]*cytoplasm_size
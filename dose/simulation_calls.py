@@ -22,10 +22,11 @@ except ImportError:
 
 from . import dose_world
 from . import genetic
-from . import ragaraja, register_machine
+from . import codegen, codonA, lc_bf, lockstep, n_bf, ragaraja
+from . import register_machine, tapes
 
 from .database_calls import connect_database, db_log_simulation_parameters
-from .database_calls import db_report
+from .database_calls import db_report, db_log_profile
 
 def file_preparation(sim_functions, sim_parameters, Populations, World):
     """
@@ -58,7 +59,12 @@ def file_preparation(sim_functions, sim_parameters, Populations, World):
 def ragaraja_activation(sim_functions, sim_parameters, Populations, World):
     """
     Step 2 of Sequential ecological cell DOSE simulator - Define active 
-    interpreter instructions.
+    interpreter instructions. The instruction set of the Ragaraja version 
+    is generated as an immutable instruction table (see 
+    ragaraja.instruction_table), without changing ragaraja.ragaraja, and 
+    kept in a new state of the simulation (see simulation_state) for 
+    interpret_chromosome, so that simulations with different versions can 
+    run in the same process.
 
     @param sim_functions: implemented simulation functions (see 
     dose.dose_functions)
@@ -66,17 +72,21 @@ def ragaraja_activation(sim_functions, sim_parameters, Populations, World):
     @param Populations: dictionary of population objects
     @param World: dose_world.World object
     """
+    state = {'profiles': {}}
     if sim_parameters["ragaraja_version"] == 0 or \
         sim_parameters["ragaraja_version"] == 66:
         print('Activating ragaraja version: 0...')
-        ragaraja.activate_version(sim_parameters["ragaraja_version"],
-                                  sim_parameters["ragaraja_instructions"])
+        state['instruction_table'] = ragaraja.instruction_table(
+            sim_parameters["ragaraja_version"],
+            sim_parameters["ragaraja_instructions"])
     elif sim_parameters["ragaraja_version"] == 'user-defined':
         pass
     else:
         print('Activating ragaraja version: ' + \
             str(sim_parameters["ragaraja_version"]) + '...')
-        ragaraja.activate_version(sim_parameters["ragaraja_version"])
+        state['instruction_table'] = ragaraja.instruction_table(
+            sim_parameters["ragaraja_version"])
+    sim_parameters["simulation_state"] = state
     return (sim_functions, sim_parameters, Populations, World)
 
 def connect_logging_database(sim_functions, sim_parameters, Populations, World):
@@ -171,6 +181,10 @@ def simulate_one_cycle(sim_functions, sim_parameters, Populations, World,
         if sim_parameters["interpret_chromosome"]:
             interpret_chromosome(sim_parameters, Populations, 
                                  pop_name, World)
+            profiles = simulation_state(sim_parameters)['profiles']
+            if pop_name in profiles:
+                sim_functions.chromosome_profile(Populations, pop_name,
+                    profiles[pop_name].statistics())
         report_generation(sim_parameters, Populations, pop_name, 
                           sim_functions, generation_count)
         sim_functions.organism_movement(Populations, pop_name, World)
@@ -196,6 +210,14 @@ def database_logging(sim_functions, sim_parameters, Populations, World,
             (con, cur) = db_report(con, cur, sim_functions,
                                sim_parameters["starting_time"],
                                Populations, World, generation_count)
+            if "database_profile" in sim_parameters and \
+                sim_parameters["database_profile"]:
+                profiles = simulation_state(sim_parameters)['profiles']
+                for pop_name in profiles:
+                    (con, cur) = db_log_profile(con, cur, 
+                                    sim_parameters["starting_time"], 
+                                    pop_name, generation_count,
+                                    profiles[pop_name])
     return (sim_functions, sim_parameters, Populations, World, 
             con, cur)
 
@@ -213,6 +235,12 @@ def close_logging_database(sim_functions, sim_parameters, Populations, World,
     """
     print('\nClosing simulation results...')
     for pop_name in Populations: close_results(sim_parameters, pop_name)
+    cache = chromosome_cache(sim_parameters)
+    if cache != None:
+        statistics = cache.statistics()
+        print('Chromosome cache: ' + \
+              ', '.join([key + ' = ' + str(statistics[key])
+                         for key in sorted(statistics)]))
     print('Committing logged data into database file...') 
     con.commit()
     print('Terminating database connection...') 
@@ -516,6 +544,484 @@ def deploy_4(sim_parameters, Populations, pop_name, World):
             World.ecosystem[x][y][z]['organisms'] += 1
             individual.status['location'] = location
 
+def simulation_state(sim_parameters):
+    '''
+    Gives the state of a simulation, kept as "simulation_state" in 
+    simulation parameters (and created if it is not in simulation 
+    parameters), so that simulations in the same process do not share 
+    their instruction tables and caches. The state is a dictionary of
+        - instruction_table: instruction table of the Ragaraja version 
+        (see ragaraja_activation)
+        - bounded_table: instruction table and its copy with the bounded 
+        mathematical operations, for bounded tapes (see 
+        chromosome_interpreter)
+        - results: cache of the results of executing chromosomes (see 
+        chromosome_cache)
+        - programs: cache of generated functions of hot chromosomes (see 
+        chromosome_codegen)
+        - profiles: latest profile of each population (see 
+        chromosome_profiler)
+    The state is not logged with the simulation parameters.
+
+    @param sim_parameters: simulation parameters dictionary (see Examples)
+    @return: Dictionary of the state of the simulation.
+
+    @since: version 1.0.6
+    '''
+    if "simulation_state" not in sim_parameters:
+        sim_parameters["simulation_state"] = {'profiles': {}}
+    return sim_parameters["simulation_state"]
+
+def chromosome_cache(sim_parameters):
+    '''
+    Gives the cache of the results of executing chromosomes (see 
+    register_machine.ResultCache) if "chromosome_cache_size" in simulation 
+    parameters is more than 0. The cache is kept across generations, in 
+    the state of the simulation (see simulation_state), and evicts cached 
+    results by "chromosome_cache_eviction" in simulation parameters ('LRU' 
+    or 'FIFO'; default = 'LRU'). Chromosomes with 
+    nondeterministic Ragaraja instructions (see 
+    ragaraja.nondeterministic_ragaraja) are not cached.
+
+    @param sim_parameters: simulation parameters dictionary (see Examples)
+    @return: register_machine.ResultCache object, or None if chromosome 
+    results are not cached.
+
+    @since: version 1.0.6
+    '''
+    if "chromosome_cache_size" not in sim_parameters or \
+        not sim_parameters["chromosome_cache_size"]:
+        return None
+    size = sim_parameters["chromosome_cache_size"]
+    if "chromosome_cache_eviction" in sim_parameters:
+        eviction = sim_parameters["chromosome_cache_eviction"]
+    else:
+        eviction = 'LRU'
+    state = simulation_state(sim_parameters)
+    cache = state.get('results')
+    if cache == None or cache.max_size != size or \
+        cache.eviction != eviction:
+        cache = register_machine.ResultCache(size, eviction,
+                    ragaraja.nondeterministic_ragaraja)
+        state['results'] = cache
+    return cache
+
+def chromosome_codegen(sim_parameters):
+    '''
+    Gives the cache of generated functions of hot chromosomes (see 
+    codegen.ProgramCache) if "codegen_threshold" in simulation parameters 
+    is more than 0. Chromosomes executed at least "codegen_threshold" 
+    times are compiled into generated Python functions (see codegen), and 
+    "codegen_cache_size" in simulation parameters (default = 1000) is the 
+    maximum number of generated functions. The cache is kept across 
+    generations, in the state of the simulation (see simulation_state). 
+    Chromosomes interpreted by user-defined interpreters are not compiled, 
+    as the instructions of user-defined interpreters are compiled into 
+    calls of their functions / operations, which are not faster than 
+    register_machine.execute.
+
+    @param sim_parameters: simulation parameters dictionary (see Examples)
+    @return: codegen.ProgramCache object, or None if chromosomes are not 
+    compiled.
+
+    @since: version 1.0.6
+    '''
+    if "codegen_threshold" not in sim_parameters or \
+        not sim_parameters["codegen_threshold"] or \
+        sim_parameters["ragaraja_version"] == 'user-defined':
+        return None
+    threshold = sim_parameters["codegen_threshold"]
+    if "codegen_cache_size" in sim_parameters:
+        size = sim_parameters["codegen_cache_size"]
+    else:
+        size = 1000
+    state = simulation_state(sim_parameters)
+    programs = state.get('programs')
+    if programs == None or programs.threshold != threshold or \
+        programs.max_size != size:
+        programs = codegen.ProgramCache(threshold, size,
+                                        ragaraja.codegen_ragaraja)
+        state['programs'] = programs
+    return programs
+
+def chromosome_profiler(sim_parameters, pop_name):
+    '''
+    Gives a new profile (see register_machine.Profile) for interpreting 
+    the chromosomes of a population in a generation, if 
+    "profile_chromosome" in simulation parameters is True. The latest 
+    profile of each population is kept in the state of the simulation 
+    (see simulation_state).
+
+    @param sim_parameters: simulation parameters dictionary (see Examples)
+    @param pop_name: population name
+    @return: register_machine.Profile object, or None if chromosomes are 
+    not profiled.
+
+    @since: version 1.0.6
+    '''
+    if "profile_chromosome" not in sim_parameters or \
+        not sim_parameters["profile_chromosome"]:
+        return None
+    profile = register_machine.Profile()
+    simulation_state(sim_parameters)['profiles'][pop_name] = profile
+    return profile
+
+def chromosome_budget(sim_parameters):
+    '''
+    Gives a new execution budget (see register_machine.Budget) for 
+    interpreting the chromosomes of an organism, by the following in 
+    simulation parameters:
+        - "chromosome_cost_budget": Maximum total cost of the instructions 
+        executed for an organism.
+        - "chromosome_time_budget": Maximum execution time (in seconds) 
+        for an organism.
+        - "chromosome_costs": Dictionary of costs of instructions (default 
+        = ragaraja.cost_ragaraja).
+
+    @param sim_parameters: simulation parameters dictionary (see Examples)
+    @return: register_machine.Budget object, or None if there is no 
+    maximum cost or time.
+
+    @since: version 1.0.6
+    '''
+    if "chromosome_cost_budget" not in sim_parameters and \
+        "chromosome_time_budget" not in sim_parameters:
+        return None
+    max_cost = None
+    max_time = None
+    costs = ragaraja.cost_ragaraja
+    if "chromosome_cost_budget" in sim_parameters:
+        max_cost = sim_parameters["chromosome_cost_budget"]
+    if "chromosome_time_budget" in sim_parameters:
+        max_time = sim_parameters["chromosome_time_budget"]
+    if "chromosome_costs" in sim_parameters:
+        costs = sim_parameters["chromosome_costs"]
+    return register_machine.Budget(costs, max_cost, max_time)
+
+def chromosome_repetition(sim_parameters):
+    '''
+    Gives a new detection of repeated machine states (see 
+    register_machine.Repetition) for interpreting the chromosomes of an 
+    organism, if "repetition_interval" in simulation parameters is more 
+    than 0, comparing the machine states every "repetition_interval" 
+    instructions. Chromosomes stuck in a repetition are terminated early, 
+    with the same results as executing "max_codon" instructions. Repeated 
+    states are only detected for Ragaraja versions, as the 
+    nondeterministic instructions of user-defined interpreters are not 
+    known.
+
+    @param sim_parameters: simulation parameters dictionary (see Examples)
+    @return: register_machine.Repetition object, or None if repeated 
+    states are not detected.
+
+    @since: version 1.0.6
+    '''
+    if "repetition_interval" not in sim_parameters or \
+        not sim_parameters["repetition_interval"] or \
+        sim_parameters["ragaraja_version"] == 'user-defined':
+        return None
+    return register_machine.Repetition(sim_parameters["repetition_interval"],
+                                       ragaraja.nondeterministic_ragaraja)
+
+def chromosome_context(sim_parameters):
+    '''
+    Gives a new execution context (see register_machine.Context) for 
+    interpreting the chromosomes of an organism. The registers and stacks 
+    used by the chromosomes of the organism start empty in each 
+    generation, and are not shared with other organisms. 
+
+    For compatibility with simulations sharing the registers and stacks 
+    of the default context (such as ragaraja.register) with all 
+    organisms, no context is given if "shared_context" in simulation 
+    parameters is True.
+
+    @param sim_parameters: simulation parameters dictionary (see Examples)
+    @return: register_machine.Context object, or None (the registers and 
+    stacks of the default context are shared by all organisms).
+
+    @since: version 1.0.6
+    '''
+    if "shared_context" in sim_parameters and \
+        sim_parameters["shared_context"]:
+        return None
+    return register_machine.Context()
+
+def chromosome_interpreter(sim_parameters):
+    '''
+    Gives the interpreter (dictionary of functions / operations) and the 
+    instruction size for interpreting chromosomes. If "ragaraja_version" 
+    in simulation parameters is 'user-defined', these are "interpreter" 
+    and "instruction_size" in simulation parameters. Otherwise, the 
+    interpreter is the instruction table of the Ragaraja version in the 
+    state of the simulation (see ragaraja_activation), or the instruction 
+    set of the Ragaraja version (see ragaraja.instruction_table, using 
+    "ragaraja_instructions" in simulation parameters for versions 0 and 
+    66) if the simulation has no instruction table, and the instruction 
+    size is 3. For bounded tapes (see chromosome_tape), the mathematical 
+    operations of the interpreter are replaced by the bounded mathematical 
+    operations (see ragaraja.bounded_ragaraja), where the bounded 
+    instruction table of the Ragaraja version is made once and kept in the 
+    state of the simulation.
+
+    @param sim_parameters: simulation parameters dictionary (see Examples)
+    @return: Tuple of (interpreter, instruction size).
+
+    @since: version 1.0.6
+    '''
+    bounded = chromosome_tape(sim_parameters) == tapes.BoundedTape
+    if sim_parameters["ragaraja_version"] == 'user-defined':
+        interpreter = sim_parameters["interpreter"]
+        if bounded:
+            interpreter = ragaraja.bounded_ragaraja(interpreter)
+        return (interpreter, sim_parameters["instruction_size"])
+    state = simulation_state(sim_parameters)
+    table = state.get('instruction_table')
+    if table == None:
+        instructions = None
+        if "ragaraja_instructions" in sim_parameters:
+            instructions = sim_parameters["ragaraja_instructions"]
+        table = ragaraja.instruction_table(
+            sim_parameters["ragaraja_version"], instructions)
+    if not bounded:
+        return (table, 3)
+    (original, bounded_table) = state.get('bounded_table', (None, None))
+    if original is not table:
+        bounded_table = ragaraja.bounded_ragaraja(table)
+        state['bounded_table'] = (table, bounded_table)
+    return (bounded_table, 3)
+
+def chromosome_checkpoints(sim_parameters, chromosome):
+    '''
+    Gives the execution checkpoints (see register_machine.Checkpoints) 
+    stored with a chromosome, if "checkpoint_interval" in simulation 
+    parameters is more than 0, taking a snapshot of the execution every 
+    "checkpoint_interval" instructions. The checkpoints are copied with 
+    the chromosome into the offspring, so that a mutated chromosome is 
+    executed from the last snapshot before its first executed mutation, 
+    or the previous results are reused if no executed instruction is 
+    mutated, when the chromosome is executed on the same input data and 
+    cytoplasm / blood. Chromosomes of user-defined interpreters are not 
+    checkpointed.
+
+    @param sim_parameters: simulation parameters dictionary (see Examples)
+    @param chromosome: genetic.Chromosome object
+    @return: register_machine.Checkpoints object, or None if chromosomes 
+    are not checkpointed.
+
+    @since: version 1.0.6
+    '''
+    if "checkpoint_interval" not in sim_parameters or \
+        not sim_parameters["checkpoint_interval"] or \
+        sim_parameters["ragaraja_version"] == 'user-defined':
+        return None
+    interval = sim_parameters["checkpoint_interval"]
+    checkpoints = getattr(chromosome, 'checkpoints', None)
+    if checkpoints == None or checkpoints.interval != interval:
+        checkpoints = register_machine.Checkpoints(interval,
+                        ragaraja.nondeterministic_ragaraja,
+                        ragaraja.structural_ragaraja)
+        chromosome.checkpoints = checkpoints
+    return checkpoints
+
+def chromosome_specialised(sim_parameters):
+    '''
+    Gives the specialised functions / operations (see 
+    register_machine.DispatchTable) for executing chromosomes. These are 
+    the specialised functions / operations of the Ragaraja instructions 
+    (see ragaraja.specialised_ragaraja) and, if "ragaraja_version" in 
+    simulation parameters is 'user-defined', of the Codon A (see 
+    codonA.specialised_codonA), LCBF (see lc_bf.specialised_LCBF) and nBF 
+    (see n_bf.specialised_nBF) interpreters, so that these interpreters 
+    given as "interpreter" in simulation parameters are executed by their 
+    specialised functions / operations.
+
+    @param sim_parameters: simulation parameters dictionary (see Examples)
+    @return: Dictionary of specialised functions / operations.
+
+    @since: version 1.0.6
+    '''
+    if sim_parameters["ragaraja_version"] != 'user-defined':
+        return ragaraja.specialised_ragaraja
+    specialised = dict(ragaraja.specialised_ragaraja)
+    specialised.update(codonA.specialised_codonA)
+    specialised.update(lc_bf.specialised_LCBF)
+    specialised.update(n_bf.specialised_nBF)
+    return specialised
+
+def chromosome_tape(sim_parameters):
+    '''
+    Gives the tape class for interpreting chromosomes, by "tape" in 
+    simulation parameters:
+        - 'list': List (default). Returns None.
+        - 'numpy': tapes.NumPyTape, a tape backed by a NumPy float64 array 
+        (requires NumPy). Cytoplasm / blood will be NumPyTape objects.
+        - 'sparse': tapes.SparseTape, a run-length encoded tape which 
+        takes memory by the number of changed regions of the tape instead 
+        of max_tape_length. Cytoplasm / blood will be SparseTape objects. 
+        As the cells of SparseTape objects are slower to read and write 
+        than the cells of lists, and only the whole-tape operations of 
+        Ragaraja versions (see ragaraja.vectorised_ragaraja) are faster on 
+        SparseTape objects, lists are used for user-defined interpreters.
+        - 'bounded': tapes.BoundedTape, a list of floats saturated at the 
+        largest finite float (with NaN stored as zero), where the 
+        instructions which may overflow give infinity (see 
+        ragaraja.bounded_mathematics), so that values of cells cannot 
+        grow into large integers. Cytoplasm / blood will be BoundedTape 
+        objects.
+
+    @param sim_parameters: simulation parameters dictionary (see Examples)
+    @return: Tape class, or None for list.
+
+    @since: version 1.0.6
+    '''
+    if "tape" not in sim_parameters or sim_parameters["tape"] == 'list':
+        return None
+    elif sim_parameters["tape"] == 'numpy':
+        return tapes.NumPyTape
+    elif sim_parameters["tape"] == 'sparse':
+        if sim_parameters["ragaraja_version"] == 'user-defined':
+            return None
+        return tapes.SparseTape
+    elif sim_parameters["tape"] == 'bounded':
+        return tapes.BoundedTape
+    else:
+        raise ValueError('Unknown tape: ' + str(sim_parameters["tape"]))
+
+def blank_tape(sim_parameters):
+    '''
+    Gives a new tape of max_tape_length cells of zero, of the tape class 
+    for interpreting chromosomes (see chromosome_tape).
+
+    @param sim_parameters: simulation parameters dictionary (see Examples)
+    @return: List or tape.
+
+    @since: version 1.0.6
+    '''
+    tape_class = chromosome_tape(sim_parameters)
+    if tape_class == None:
+        return [0] * sim_parameters["max_tape_length"]
+    return tape_class.zeros(sim_parameters["max_tape_length"])
+
+def clone_groups(agents):
+    '''
+    Groups organisms which have the same chromosomes, are in the same 
+    ecological cell, and have the same cytoplasm / blood (starting tape), 
+    such as clones produced by mating. The chromosomes of all organisms 
+    in a group will give the same results when interpreted.
+
+    @param agents: list of organisms
+    @return: dictionary where the key is the index of the first organism 
+    of each group (with more than one organism) in the list of organisms, 
+    and the value is the list of indexes of the other organisms in the 
+    group.
+
+    @since: version 1.0.6
+    '''
+    first = {}
+    groups = {}
+    for i in range(len(agents)):
+        key = (tuple([chromosome.program() 
+                      for chromosome in agents[i].genome]),
+               coordinates(agents[i].status['location']),
+               repr(agents[i].status['blood']))
+        if key in first:
+            groups[first[key]].append(i)
+        else:
+            first[key] = i
+            groups[i] = []
+    return dict([(i, groups[i]) for i in groups if len(groups[i]) > 0])
+
+def chromosome_source(sim_parameters, chromosome):
+    '''
+    Gives the source of a chromosome for the interpreter, where the 
+    chromosomal sequence is converted by "ragaraja_version" in simulation 
+    parameters (NucleotideBF for version 0.2, or "base_converter" for 
+    version 66). The source is kept with the chromosome until it is 
+    mutated (see genetic.Chromosome.program).
+
+    @param sim_parameters: simulation parameters dictionary (see Examples)
+    @param chromosome: genetic.Chromosome object
+    @return: Source string.
+
+    @since: version 1.0.6
+    '''
+    decoder = None
+    if sim_parameters["ragaraja_version"] == 0.2:
+        decoder = ragaraja.nBF_to_Ragaraja
+    elif sim_parameters["ragaraja_version"] == 66:
+        decoder = sim_parameters["base_converter"]
+    return chromosome.program(decoder)
+
+def lockstep_chromosomes(sim_parameters, agents, skipped=()):
+    '''
+    Interprets the chromosomes of organisms in lockstep (see 
+    lockstep.run), one chromosome at a time for all organisms, when 
+    the population has at least "lockstep_population" organisms (in 
+    simulation parameters; requires NumPy). Organisms with a chromosome 
+    diverging from the batch (reaching an instruction which cannot be 
+    executed in lockstep) are left, from that chromosome onwards, to be 
+    interpreted one at a time by interpret_chromosome, where the 
+    diverged chromosome is resumed from the instruction at which it 
+    diverged (see lockstep.resume). As instructions executed in lockstep 
+    do not take input, use random numbers or change the registers, the 
+    results are the same as of interpreting the organisms one at a time 
+    in population order. 
+    Chromosomes are not interpreted in lockstep when they are profiled 
+    (see chromosome_profiler), given an execution budget (see 
+    chromosome_budget) or interpreted on bounded tapes (see 
+    chromosome_tape).
+
+    @param sim_parameters: simulation parameters dictionary (see Examples)
+    @param agents: list of organisms
+    @param skipped: indices of organisms not to be interpreted
+    @return: Dictionary of machines of chromosomes executed in lockstep 
+    (see lockstep.Machine), where the key is (organism index, chromosome 
+    index).
+
+    @since: version 1.0.6
+    '''
+    results = {}
+    if "lockstep_population" not in sim_parameters or \
+        not sim_parameters["lockstep_population"] or \
+        ("profile_chromosome" in sim_parameters and 
+         sim_parameters["profile_chromosome"]) or \
+        chromosome_budget(sim_parameters) != None or \
+        chromosome_tape(sim_parameters) == tapes.BoundedTape or \
+        len(agents) < sim_parameters["lockstep_population"] or \
+        sim_parameters["ragaraja_version"] == 'user-defined':
+        return results
+    tape_class = chromosome_tape(sim_parameters)
+    arrays = {}
+    for i in range(len(agents)):
+        if i in skipped: continue
+        array = agents[i].status['blood']
+        if tape_class != None and not isinstance(array, tape_class):
+            if array == None:
+                array = blank_tape(sim_parameters)
+            else:
+                array = tape_class(array)
+        arrays[i] = array
+    chromosome_count = 0
+    while len(arrays) > 0:
+        organisms = [i for i in sorted(arrays) 
+                     if chromosome_count < len(agents[i].genome)]
+        sources = [chromosome_source(sim_parameters, 
+                                     agents[i].genome[chromosome_count])
+                   for i in organisms]
+        interpreter = chromosome_interpreter(sim_parameters)[0]
+        batch = lockstep.run(sources, interpreter, 3,
+                             [arrays[i] for i in organisms],
+                             sim_parameters["max_tape_length"],
+                             sim_parameters["max_codon"],
+                             ragaraja.lockstep_ragaraja)
+        arrays = {}
+        for (i, machine) in zip(organisms, batch):
+            if machine != None:
+                results[(i, chromosome_count)] = machine
+                if not machine.diverged: arrays[i] = machine.array
+        chromosome_count = chromosome_count + 1
+    return results
+
 def interpret_chromosome(sim_parameters, Populations, pop_name, World):
     '''
     Function to call Ragaraja interpreter to express / execute the genome 
@@ -526,6 +1032,83 @@ def interpret_chromosome(sim_parameters, Populations, pop_name, World):
     for genome execution - this will resemble consumption of environmental 
     resources and replenishing of environmental resources or dumping of 
     wastes respectively.
+
+    The chromosome will be interpreted by register_machine.interpret, 
+    unless "compile_chromosome" in simulation parameters is True, where 
+    the chromosome will be compiled and executed by 
+    register_machine.execute. If "optimise_chromosome" in simulation 
+    parameters is True, the chromosome will be compiled, and runs of 
+    simple instructions in the compiled chromosome will be executed as 
+    superinstructions (see register_machine.Superinstruction).
+    If "chromosome_cache_size" in simulation parameters is more than 0, 
+    the results of executing chromosomes will be cached (see 
+    chromosome_cache).
+
+    If "tape" in simulation parameters is given (see chromosome_tape), 
+    the cytoplasm / blood will be converted into the tape class before 
+    the chromosome is compiled and executed, and whole-tape instructions 
+    will be executed using the tape (see ragaraja.vectorised_ragaraja). 
+    For bounded tapes ("tape" is 'bounded'), the mathematical instructions 
+    are executed by ragaraja.bounded_mathematics (see 
+    ragaraja.bounded_ragaraja).
+
+    If "deduplicate_chromosome" in simulation parameters is True, 
+    organisms with the same chromosomes, ecological cell and starting 
+    cytoplasm / blood (see clone_groups) are interpreted once, at the 
+    position of the first organism of the group in the population, and 
+    the resulting cytoplasm / blood (and chromosome error, if any) is 
+    given to every organism in the group. Hence, the input data of the 
+    ecological cell is consumed once for each group instead of once for 
+    each organism, and the groups are interpreted in population order. 
+    Each organism in a group is given its own copy of the resulting 
+    cytoplasm / blood, so that the cytoplasm / blood of an organism can be 
+    changed in place without changing that of the other organisms.
+
+    If "lockstep_population" in simulation parameters is given, and the 
+    population has at least "lockstep_population" organisms, the 
+    chromosomes are executed in lockstep before the other chromosomes, and 
+    the chromosomes diverging from lockstep are finished one at a time in 
+    population order (see lockstep_chromosomes).
+
+    If "profile_chromosome" in simulation parameters is True, the 
+    execution of instructions, the number of instructions executed for 
+    each organism, and the number of chromosome errors are recorded into 
+    a profile for the population in this generation (see 
+    chromosome_profiler). Results given by the chromosome cache are not 
+    recorded.
+
+    If "chromosome_cost_budget" or "chromosome_time_budget" in simulation 
+    parameters is given, the chromosomes of each organism are interpreted 
+    within an execution budget (see chromosome_budget), and the 
+    interpretation is terminated, keeping the results so far, when the 
+    budget is exceeded. The cost of executed instructions is recorded as 
+    "chromosome_cost" in the status of the organism, and the exceeded 
+    budget ('cost' or 'time', or None) as "chromosome_budget".
+
+    The chromosomes of each organism are interpreted in a new execution 
+    context of the organism (see chromosome_context), unless 
+    "shared_context" in simulation parameters is True, where the 
+    registers and stacks (such as ragaraja.register) are shared with all 
+    organisms.
+
+    If "codegen_threshold" in simulation parameters is given, chromosomes 
+    which are executed many times (hot chromosomes) are executed by 
+    generated Python functions (see chromosome_codegen), unless the 
+    chromosomes are interpreted (see "compile_chromosome" above), 
+    profiled or within an execution budget. Chromosomes which cannot be 
+    compiled, such as chromosomes changing the source, are executed by 
+    register_machine.execute.
+
+    If "checkpoint_interval" in simulation parameters is given, 
+    chromosomes are executed with execution checkpoints stored with the 
+    chromosome (see chromosome_checkpoints), unless the chromosomes are 
+    interpreted (see "compile_chromosome" above).
+
+    If "repetition_interval" in simulation parameters is given, repeated 
+    machine states are detected (see chromosome_repetition), and 
+    "non_terminating" in the status of the organism is True if any 
+    chromosome of the organism was terminated early in a repetition. 
+    Results given by the chromosome cache are not checked.
     
     @param sim_parameters: simulation parameters dictionary (see Examples)
     @param Populations: dictionary of population objects
@@ -533,64 +1116,147 @@ def interpret_chromosome(sim_parameters, Populations, pop_name, World):
     @param World: dose_world.World object
     @return: none
     '''
-    array = [0] * sim_parameters["max_tape_length"]
+    array = blank_tape(sim_parameters)
+    clones = {}
+    if "deduplicate_chromosome" in sim_parameters and \
+        sim_parameters["deduplicate_chromosome"]:
+        clones = clone_groups(Populations[pop_name].agents)
+    duplicates = set([j for i in clones for j in clones[i]])
+    profile = chromosome_profiler(sim_parameters, pop_name)
+    lockstepped = lockstep_chromosomes(sim_parameters, 
+                                       Populations[pop_name].agents, 
+                                       duplicates)
+    tape_class = chromosome_tape(sim_parameters)
+    (interpreter, instruction_size) = chromosome_interpreter(sim_parameters)
+    compiled = tape_class != None
+    for key in ("compile_chromosome", "optimise_chromosome"):
+        if key in sim_parameters and sim_parameters[key]:
+            compiled = True
+    if tape_class == None:
+        specialised = chromosome_specialised(sim_parameters)
+    else:
+        specialised = ragaraja.vectorised_ragaraja(tape_class)
     for i in range(len(Populations[pop_name].agents)):
+        if i in duplicates: continue
         individual = Populations[pop_name].agents[i]
+        error_msg = None
+        budget = chromosome_budget(sim_parameters)
+        repetition = chromosome_repetition(sim_parameters)
+        context = chromosome_context(sim_parameters)
         location = individual.status['location']
         (x,y,z) = coordinates(location)
         if sim_parameters["clean_cell"]:
-            array = [0] * sim_parameters["max_tape_length"]
+            array = blank_tape(sim_parameters)
         else:
             array = Populations[pop_name].agents[i].status['blood']
             if array == None: 
-                array = [0] * sim_parameters["max_tape_length"]
+                array = blank_tape(sim_parameters)
         for chromosome_count in range(len(individual.genome)):
             # get world environment conditions
             inputdata = World.ecosystem[x][y][z]['local_input']
             output = World.ecosystem[x][y][z]['local_output']
-            # get chromosomal sequence
-            source = ''.join(individual.genome[chromosome_count].sequence)
-            # process chromosome sequence if needed
-            if sim_parameters["ragaraja_version"] == 0.2:
-                source = ragaraja.nBF_to_Ragaraja(source)
-            elif sim_parameters["ragaraja_version"] == 66:
-                source = sim_parameters["base_converter"](source) 
-            # print(source)
-            # change interpreter if needed
-            if sim_parameters["ragaraja_version"] == 'user-defined':
-                interpreter = sim_parameters["interpreter"]
-                instruction_size = sim_parameters["instruction_size"]
-            elif sim_parameters["interpreter"] == 'ragaraja':
-                interpreter = ragaraja.ragaraja
-                instruction_size = 3
-            else:
-                interpreter = ragaraja.ragaraja
-                instruction_size = 3
+            # get and process chromosomal sequence
+            source = chromosome_source(sim_parameters,
+                                       individual.genome[chromosome_count])
             # get cytoplasm / blood
             array = Populations[pop_name].agents[i].status['blood']
+            if tape_class != None and not isinstance(array, tape_class):
+                if array == None:
+                    array = blank_tape(sim_parameters)
+                else:
+                    array = tape_class(array)
             # interpret chromosme
-            try: (array, apointer, inputdata, output, source, spointer) = \
-                register_machine.interpret(source, interpreter, 
-                                           instruction_size,
-                                           inputdata, array, 
-                                           sim_parameters["max_tape_length"],
-                                           sim_parameters["max_codon"])
+            if profile != None: executed = profile.total()
+            try: 
+                if not compiled:
+                    engine = register_machine.interpret
+                    options = {}
+                elif "optimise_chromosome" in sim_parameters and \
+                    sim_parameters["optimise_chromosome"]:
+                    engine = register_machine.execute
+                    options = {'specialised': specialised,
+                               'superinstructions': 
+                                   ragaraja.superinstructions_ragaraja}
+                else:
+                    engine = register_machine.execute
+                    options = {'specialised': specialised}
+                if profile != None:
+                    options['profile'] = profile
+                if budget != None:
+                    options['budget'] = budget
+                programs = chromosome_codegen(sim_parameters)
+                if programs != None and profile == None and \
+                    budget == None and engine == register_machine.execute:
+                    engine = programs.execute
+                if context != None:
+                    options['context'] = context
+                if repetition != None:
+                    options['repetition'] = repetition
+                checkpoints = chromosome_checkpoints(sim_parameters,
+                    individual.genome[chromosome_count])
+                if checkpoints != None and \
+                    engine != register_machine.interpret:
+                    options['checkpoints'] = checkpoints
+                cache = chromosome_cache(sim_parameters)
+                if (i, chromosome_count) in lockstepped:
+                    result = lockstep.resume(
+                        lockstepped[(i, chromosome_count)], source, 
+                        interpreter, instruction_size, inputdata, 
+                        sim_parameters["max_tape_length"],
+                        sim_parameters["max_codon"], **options)
+                elif cache != None:
+                    result = cache.execute(engine, source, interpreter, 
+                                instruction_size, inputdata, array, 
+                                sim_parameters["max_tape_length"],
+                                sim_parameters["max_codon"],
+                                sim_parameters["ragaraja_version"],
+                                **options)
+                else:
+                    result = engine(source, interpreter, 
+                                instruction_size, inputdata, array, 
+                                sim_parameters["max_tape_length"],
+                                sim_parameters["max_codon"],
+                                **options)
+                (array, apointer, inputdata, output, source, spointer) = result
             except Exception as e: 
                 error_msg = '|'.join(['Error at Chromosome_' + \
                     str(chromosome_count), str(e)])
+                if profile != None: profile.errors = profile.errors + 1
                 Populations[pop_name].agents[i]. \
                     status['chromosome_error'] = error_msg
                 Populations[pop_name].agents[i].status['blood'] = array
+            if profile != None:
+                if individual.status['identity'] != None:
+                    profile.organism(individual.status['identity'],
+                                     profile.total() - executed)
+                else:
+                    profile.organism(i, profile.total() - executed)
             # update world environment conditions and cytoplasm / blood
             Populations[pop_name].agents[i].status['blood'] = array
             World.ecosystem[x][y][z]['temporary_input'] = inputdata
             World.ecosystem[x][y][z]['temporary_output'] = output
+        if budget != None:
+            individual.status['chromosome_cost'] = budget.cost
+            individual.status['chromosome_budget'] = budget.exceeded
+        if repetition != None:
+            individual.status['non_terminating'] = \
+                repetition.non_terminating
+        for j in clones.get(i, []):
+            clone = Populations[pop_name].agents[j]
+            clone.status['blood'] = deepcopy(individual.status['blood'])
+            if budget != None:
+                clone.status['chromosome_cost'] = budget.cost
+                clone.status['chromosome_budget'] = budget.exceeded
+            if repetition != None:
+                clone.status['non_terminating'] = repetition.non_terminating
+            if error_msg != None:
+                clone.status['chromosome_error'] = error_msg
 
 def step(Populations, pop_name, sim_functions):
     '''
     Performs a generational step for a population
         - Prepopulation control
-        - Mutations
+        - Mutations (see dose.dose_functions.population_mutation_scheme)
         - Before mating fitness measurement
         - Mating
         - Postpopulation control
@@ -606,8 +1272,7 @@ def step(Populations, pop_name, sim_functions):
     '''
     if Populations[pop_name].generation > 0:
         sim_functions.prepopulation_control(Populations, pop_name)
-    for organism in Populations[pop_name].agents:
-        sim_functions.mutation_scheme(organism)
+    sim_functions.population_mutation_scheme(Populations, pop_name)
     sim_functions.fitness(Populations, pop_name)
     sim_functions.mating(Populations, pop_name)
     sim_functions.postpopulation_control(Populations, pop_name)
@@ -736,7 +1401,8 @@ def write_parameters(sim_parameters, pop_name):
         f.write("SIMULATION STARTED: %s\n\n" % \
                 sim_parameters["starting_time"])
     for key in sim_parameters:
-        if key not in ('deployment_scheme', 'directory', 'sim_folder'):
+        if key not in ('deployment_scheme', 'directory', 'sim_folder',
+                       'simulation_state'):
             f.write("%s : %s\n" % (key, sim_parameters[key]))
     f.write("""\n\nREPORT
 ----------------------------------------------------------------------
@@ -0,0 +1,877 @@
+'''
+Alternative Tapes for Register Machine
+Date created: 18th October 2026
+
+The tape of the register machine (see register_machine) is a list by
+default. This module provides other tapes, which behave as lists for all
+instructions, and also provide whole-tape (vectorised) operations, which
+are used by the vectorised Ragaraja instructions (see
+ragaraja.vectorised_ragaraja):
+    1. NumPyTape: A tape backed by a NumPy float64 array. This requires
+    NumPy (http://www.numpy.org/).
+    2. SparseTape: A tape backed by runs of cells of the same value 
+    (run-length encoding), where memory and allocation scale with the 
+    number of changed regions of the tape instead of the length of the 
+    tape.
+    3. BoundedTape: A list of floats which are saturated at the largest
+    finite float, so that the values of cells cannot grow without bound.
+
+Whole-tape operations work on a range of cells, given by the start and
+end of the range as in slicing (start and end of None are the ends of the
+tape). They change the tape in place and give the tape, and raise the
+same exceptions as the list operations they replace before changing the
+tape.
+'''
+
+import bisect
+import math
+import operator
+import sys
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class NumPyTape(object):
+    '''
+    Tape backed by a NumPy float64 array. All cells are stored as 64-bit
+    floating point numbers, and read as Python floats. The array has more
+    cells than the tape (capacity), so that the tape can grow and shrink
+    without re-allocating the array for every change in length.
+    '''
+    __slots__ = ('cells', 'length')
+
+    def __init__(self, cells=(), capacity=0):
+        '''
+        @param cells: Initial values of the tape cells. Default = empty
+        tape
+        @type cells: list
+        @param capacity: Initial capacity of the tape. Default = 0 (the
+        length of the tape)
+        @type capacity: integer
+        '''
+        if numpy == None:
+            raise ImportError('NumPy is required for NumPyTape')
+        if isinstance(cells, NumPyTape):
+            cells = cells.view()
+        else:
+            cells = numpy.array([self.number(x) for x in cells],
+                                dtype=numpy.float64)
+        self.length = len(cells)
+        self.cells = numpy.zeros(max(capacity, self.length, 1),
+                                 dtype=numpy.float64)
+        self.cells[:self.length] = cells
+
+    @classmethod
+    def zeros(cls, length):
+        '''
+        Gives a tape of cells of zero.
+
+        @param length: Length of the tape.
+        @type length: integer
+        '''
+        return cls((), length).resize(length)
+
+    def number(self, value):
+        '''
+        Checks that a value can be stored in a tape cell.
+
+        @return: Value to store.
+        '''
+        if value is None or isinstance(value, (str, bytes)):
+            raise TypeError('Tape cell value must be a number: ' +
+                            repr(value))
+        return value
+
+    def view(self):
+        '''
+        Gives the tape cells as a NumPy array (without copying).
+        '''
+        return self.cells[:self.length]
+
+    def reserve(self, length):
+        '''
+        Increases the capacity of the tape to at least the given length.
+        '''
+        if length > len(self.cells):
+            cells = numpy.zeros(max(length, 2 * len(self.cells)),
+                                dtype=numpy.float64)
+            cells[:self.length] = self.view()
+            self.cells = cells
+
+    def resize(self, length):
+        '''
+        Changes the length of the tape, adding cells of zero to the end
+        of the tape or removing cells from the end of the tape, and gives
+        the tape.
+        '''
+        length = max(length, 0)
+        if length > self.length:
+            self.reserve(length)
+            self.cells[self.length:length] = 0.0
+        self.length = length
+        return self
+
+    def tolist(self):
+        '''
+        Gives the tape cells as a list.
+        '''
+        return self.view().tolist()
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __repr__(self):
+        return repr(self.tolist())
+
+    def __eq__(self, other):
+        if isinstance(other, NumPyTape):
+            other = other.tolist()
+        return isinstance(other, list) and self.tolist() == other
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return NumPyTape(self.view()[index])
+        return float(self.view()[index])
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            cells = self.tolist()
+            cells[index] = [self.number(x) for x in value]
+            self.resize(len(cells))
+            self.cells[:self.length] = cells
+        else:
+            self.view()[index] = self.number(value)
+
+    def __delitem__(self, index):
+        cells = self.tolist()
+        del cells[index]
+        self.resize(len(cells))
+        self.cells[:self.length] = cells
+
+    def __add__(self, other):
+        tape = NumPyTape(self, self.length + len(other))
+        tape.extend(other)
+        return tape
+
+    def __radd__(self, other):
+        return other + self.tolist()
+
+    def append(self, value):
+        value = self.number(value)
+        self.resize(self.length + 1)
+        self.cells[self.length - 1] = value
+
+    def extend(self, values):
+        values = [self.number(x) for x in values]
+        self.resize(self.length + len(values))
+        self.cells[self.length - len(values):self.length] = values
+
+    def insert(self, index, value):
+        value = self.number(value)
+        if index < 0: index = max(index + self.length, 0)
+        index = min(index, self.length)
+        self.resize(self.length + 1)
+        self.cells[index+1:self.length] = self.cells[index:self.length-1]
+        self.cells[index] = value
+
+    def pop(self, index=-1):
+        if self.length == 0:
+            raise IndexError('pop from empty list')
+        if index < -self.length or index >= self.length:
+            raise IndexError('pop index out of range')
+        if index < 0: index = index + self.length
+        value = float(self.cells[index])
+        self.cells[index:self.length-1] = self.cells[index+1:self.length]
+        self.length = self.length - 1
+        return value
+
+    def reverse(self):
+        self.view()[:] = self.view()[::-1].copy()
+
+    def fill(self, value, start=None, end=None):
+        '''
+        Sets the cells in a range of the tape to a value.
+        '''
+        self.view()[start:end] = self.number(value)
+        return self
+
+    def fill_cell(self, index, start=None, end=None):
+        '''
+        Sets the cells in a range of the tape to the value of a cell. The
+        cell is only read (and may raise IndexError) if the range is not
+        empty.
+        '''
+        if len(self.view()[start:end]) > 0:
+            self.view()[start:end] = self.view()[index]
+        return self
+
+    def multiply(self, factor, start=None, end=None):
+        '''
+        Multiplies the cells in a range of the tape by a factor.
+        '''
+        with numpy.errstate(all='ignore'):
+            self.view()[start:end] *= factor
+        return self
+
+    def square(self, start=None, end=None):
+        '''
+        Squares the cells in a range of the tape.
+        '''
+        with numpy.errstate(all='ignore'):
+            cells = self.view()[start:end]
+            numpy.multiply(cells, cells, out=cells)
+        return self
+
+    def sqrt(self, start=None, end=None):
+        '''
+        Takes the square root of the cells in a range of the tape. Raises
+        ValueError (as math.sqrt) if any of the cells is negative.
+        '''
+        cells = self.view()[start:end]
+        if (cells < 0).any():
+            raise ValueError('math domain error')
+        numpy.sqrt(cells, out=cells)
+        return self
+
+    def total(self, start=None, end=None):
+        '''
+        Gives the sum of the cells in a range of the tape. The cells are
+        added in order (as sum), so that the result is the same as the sum
+        of the cells as a list.
+        '''
+        cells = self.view()[start:end]
+        if len(cells) == 0:
+            return 0
+        with numpy.errstate(all='ignore'):
+            return float(numpy.cumsum(cells)[-1])
+
+    def mean(self, start=None, end=None):
+        '''
+        Gives the mean of the cells in a range of the tape. Raises
+        ZeroDivisionError if the range is empty.
+        '''
+        cells = self.view()[start:end]
+        return self.total(start, end) / float(len(cells))
+
+def _same_value(x, y):
+    '''
+    Checks that two cell values are the same - of the same type, equal, 
+    and of the same sign for zeros - so that they can be kept in one run 
+    (see SparseTape).
+    '''
+    if type(x) is not type(y) or x != y:
+        return False
+    if isinstance(x, float) and x == 0:
+        return math.copysign(1, x) == math.copysign(1, y)
+    return True
+
+class SparseTape(object):
+    '''
+    Tape backed by runs of cells of the same value (run-length encoding), 
+    kept as a list of the starting cell of each run and a list of the 
+    value of each run. Cells keep their values exactly as in a list 
+    (including the type of the value), and a tape of cells of zero is a 
+    single run.
+
+    Changes to the tape can be journaled for roll back (as 
+    register_machine.JournalList) by giving a journal (see journaled).
+    '''
+    __slots__ = ('starts', 'values', 'length', 'journal')
+
+    def __init__(self, cells=(), length=0):
+        '''
+        @param cells: Initial values of the tape cells. Default = empty
+        tape
+        @type cells: list
+        @param length: Length of the tape, where cells of zero will be 
+        added after the initial values. Default = 0 (the number of 
+        initial values)
+        @type length: integer
+        '''
+        self.journal = None
+        if isinstance(cells, SparseTape):
+            self.starts = list(cells.starts)
+            self.values = list(cells.values)
+            self.length = cells.length
+        else:
+            self.starts = []
+            self.values = []
+            self.length = 0
+            self.add_cells(cells)
+        if length > self.length:
+            self.add_run(0, length - self.length)
+
+    @classmethod
+    def zeros(cls, length):
+        '''
+        Gives a tape of cells of zero.
+
+        @param length: Length of the tape.
+        @type length: integer
+        '''
+        return cls((), length)
+
+    def journaled(self, journal):
+        '''
+        Gives a copy of the tape recording the inverse of its changes into 
+        a journal (see register_machine.rollback), or not recording its 
+        changes if journal is None.
+        '''
+        tape = SparseTape(self)
+        tape.journal = journal
+        return tape
+
+    def record(self):
+        '''
+        Records the tape into the journal (if any) before a change.
+        '''
+        if self.journal is not None:
+            self.journal.append((self.restore, list(self.starts), 
+                                 list(self.values), self.length))
+
+    def restore(self, starts, values, length):
+        '''
+        Restores the tape to a recorded state (see record).
+        '''
+        self.starts = starts
+        self.values = values
+        self.length = length
+
+    def add_cells(self, cells):
+        '''
+        Adds cells to the end of the tape (without journaling).
+        '''
+        for value in cells:
+            self.add_run(value, 1)
+
+    def add_run(self, value, count):
+        '''
+        Adds a number of cells of a value to the end of the tape (without 
+        journaling).
+        '''
+        if count <= 0: return
+        if not self.values or not _same_value(self.values[-1], value):
+            self.starts.append(self.length)
+            self.values.append(value)
+        self.length = self.length + count
+
+    def runs(self, start=0, end=None):
+        '''
+        Gives the runs in a range of cells (start <= end) as a list of 
+        (run index, number of cells of the run in the range, value).
+        '''
+        if end == None: end = self.length
+        if start >= end: return []
+        first = bisect.bisect_right(self.starts, start) - 1
+        last = bisect.bisect_right(self.starts, end - 1) - 1
+        runs = []
+        for run in range(first, last + 1):
+            if run + 1 < len(self.starts): run_end = self.starts[run+1]
+            else: run_end = self.length
+            count = min(run_end, end) - max(self.starts[run], start)
+            runs.append((run, count, self.values[run]))
+        return runs
+
+    def split(self, index):
+        '''
+        Makes a run start at a cell (0 <= index <= length of tape).
+
+        @return: Index of the run starting at the cell (the number of runs 
+        if index is the length of tape).
+        '''
+        if index >= self.length: return len(self.starts)
+        run = bisect.bisect_right(self.starts, index) - 1
+        if self.starts[run] == index: return run
+        self.starts.insert(run + 1, index)
+        self.values.insert(run + 1, self.values[run])
+        return run + 1
+
+    def merge(self, first, last):
+        '''
+        Merges runs of the same value, from run last to run first, with 
+        the run before it.
+        '''
+        for run in range(min(last, len(self.starts) - 1), max(first, 1) - 1, 
+                         -1):
+            if _same_value(self.values[run-1], self.values[run]):
+                del self.starts[run]
+                del self.values[run]
+
+    def replace(self, start, end, tape):
+        '''
+        Replaces a range of cells (0 <= start <= end <= length of tape) 
+        with the cells of another SparseTape (without journaling).
+        '''
+        first = self.split(start)
+        last = self.split(end)
+        shift = tape.length - (end - start)
+        self.starts[last:] = [x + shift for x in self.starts[last:]]
+        self.starts[first:last] = [x + start for x in tape.starts]
+        self.values[first:last] = tape.values
+        self.length = self.length + shift
+        self.merge(first, first + len(tape.starts))
+
+    def cell(self, index):
+        '''
+        Gives the cell of an index as in list indexing, raising IndexError 
+        if the index is out of range.
+        '''
+        index = operator.index(index)
+        if index < 0: index = index + self.length
+        if index < 0 or index >= self.length:
+            raise IndexError('list index out of range')
+        return index
+
+    def cells(self, start, end):
+        '''
+        Gives the range of cells of a slice (start <= end).
+        '''
+        (start, end, step) = slice(start, end).indices(self.length)
+        return (start, max(start, end))
+
+    def tolist(self):
+        '''
+        Gives the tape cells as a list.
+        '''
+        cells = []
+        for (run, count, value) in self.runs():
+            cells.extend([value] * count)
+        return cells
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        for (run, count, value) in self.runs():
+            for i in range(count):
+                yield value
+
+    def __repr__(self):
+        return repr(self.tolist())
+
+    def __eq__(self, other):
+        if isinstance(other, SparseTape):
+            other = other.tolist()
+        return isinstance(other, list) and self.tolist() == other
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            (start, end, step) = index.indices(self.length)
+            if step != 1:
+                return SparseTape(self.tolist()[index])
+            tape = SparseTape()
+            for (run, count, value) in self.runs(start, max(start, end)):
+                tape.add_run(value, count)
+            return tape
+        return self.values[bisect.bisect_right(self.starts, 
+                                               self.cell(index)) - 1]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            (start, end, step) = index.indices(self.length)
+            if step != 1:
+                cells = self.tolist()
+                cells[index] = value
+                self.record()
+                self.restore([], [], 0)
+                self.add_cells(cells)
+                return
+            if not isinstance(value, SparseTape):
+                value = SparseTape(value)
+            self.record()
+            self.replace(start, max(start, end), value)
+        else:
+            index = self.cell(index)
+            self.record()
+            first = self.split(index)
+            last = self.split(index + 1)
+            self.starts[first:last] = [index]
+            self.values[first:last] = [value]
+            self.merge(first, first + 1)
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            (start, end, step) = index.indices(self.length)
+            if step != 1:
+                cells = self.tolist()
+                del cells[index]
+                self.record()
+                self.restore([], [], 0)
+                self.add_cells(cells)
+                return
+            self.record()
+            self.replace(start, max(start, end), SparseTape())
+        else:
+            index = self.cell(index)
+            self.record()
+            self.replace(index, index + 1, SparseTape())
+
+    def __add__(self, other):
+        tape = SparseTape(self)
+        tape.add_cells(other)
+        return tape
+
+    def __radd__(self, other):
+        return other + self.tolist()
+
+    def append(self, value):
+        self.record()
+        self.add_run(value, 1)
+
+    def extend(self, values):
+        values = list(values)
+        self.record()
+        self.add_cells(values)
+
+    def insert(self, index, value):
+        if index < 0: index = max(index + self.length, 0)
+        index = min(index, self.length)
+        self.record()
+        self.replace(index, index, SparseTape([value]))
+
+    def pop(self, index=-1):
+        if self.length == 0:
+            raise IndexError('pop from empty list')
+        if index < -self.length or index >= self.length:
+            raise IndexError('pop index out of range')
+        if index < 0: index = index + self.length
+        value = self[index]
+        self.record()
+        self.replace(index, index + 1, SparseTape())
+        return value
+
+    def reverse(self):
+        runs = self.runs()
+        self.record()
+        self.restore([], [], 0)
+        for (run, count, value) in reversed(runs):
+            self.add_run(value, count)
+
+    def resize(self, length):
+        '''
+        Changes the length of the tape, adding cells of zero to the end
+        of the tape or removing cells from the end of the tape, and gives
+        the tape.
+        '''
+        length = max(length, 0)
+        self.record()
+        if length < self.length:
+            run = self.split(length)
+            del self.starts[run:]
+            del self.values[run:]
+            self.length = length
+        else:
+            self.add_run(0, length - self.length)
+        return self
+
+    def apply(self, function, start=None, end=None):
+        '''
+        Replaces the value of each cell in a range of the tape with the 
+        result of a function on the value, and gives the tape. The 
+        function is called once for each run.
+        '''
+        (start, end) = self.cells(start, end)
+        if start >= end: return self
+        values = [function(value) for (run, count, value) 
+                  in self.runs(start, end)]
+        self.record()
+        first = self.split(start)
+        last = self.split(end)
+        self.values[first:last] = values
+        self.merge(first, last)
+        return self
+
+    def fill(self, value, start=None, end=None):
+        '''
+        Sets the cells in a range of the tape to a value.
+        '''
+        (start, end) = self.cells(start, end)
+        if start < end:
+            self.record()
+            first = self.split(start)
+            last = self.split(end)
+            self.starts[first:last] = [start]
+            self.values[first:last] = [value]
+            self.merge(first, first + 1)
+        return self
+
+    def fill_cell(self, index, start=None, end=None):
+        '''
+        Sets the cells in a range of the tape to the value of a cell.
+        '''
+        (start, end) = self.cells(start, end)
+        if start < end:
+            self.fill(self[index], start, end)
+        return self
+
+    def multiply(self, factor, start=None, end=None):
+        '''
+        Multiplies the cells in a range of the tape by a factor.
+        '''
+        return self.apply(lambda x: factor * x, start, end)
+
+    def square(self, start=None, end=None):
+        '''
+        Squares the cells in a range of the tape.
+        '''
+        return self.apply(lambda x: x * x, start, end)
+
+    def sqrt(self, start=None, end=None):
+        '''
+        Replaces the cells in a range of the tape with their square roots.
+        '''
+        return self.apply(math.sqrt, start, end)
+
+    def total(self, start=None, end=None):
+        '''
+        Gives the sum of the cells in a range of the tape, added in order 
+        of the cells (as sum). Adding the same zero or integer to an 
+        integer repeatedly are done at once for each run.
+        '''
+        (start, end) = self.cells(start, end)
+        total = 0
+        for (run, count, value) in self.runs(start, end):
+            if type(value) is int and type(total) is int:
+                total = total + count * value
+            elif type(value) in (int, float) and value == 0:
+                total = total + value
+            else:
+                for i in range(count):
+                    total = total + value
+        return total
+
+    def mean(self, start=None, end=None):
+        '''
+        Gives the mean of the cells in a range of the tape.
+        '''
+        (start, end) = self.cells(start, end)
+        return self.total(start, end) / float(end - start)
+
+class BoundedTape(list):
+    '''
+    Tape of bounded 64-bit floating point numbers, as a list. Every value
+    stored into the tape is converted into a float, where values beyond
+    the bound of the tape (limit, which is the largest finite float) -
+    infinities, and integers too large for a float - are saturated to
+    the bound of the same sign, and values which are not real numbers
+    (NaN and complex numbers) are stored as 0.0. Hence, arithmetic on the
+    cells takes constant time, instead of slowing down as integers grow
+    without bound.
+
+    Changes to the tape can be journaled for roll back (as 
+    register_machine.JournalList) by giving a journal (see journaled).
+    '''
+    __slots__ = ('journal',)
+
+    limit = sys.float_info.max
+
+    def __init__(self, cells=()):
+        '''
+        @param cells: Initial values of the tape cells. Default = empty
+        tape
+        @type cells: list
+        '''
+        if isinstance(cells, BoundedTape):
+            list.__init__(self, cells)
+        else:
+            list.__init__(self, [self.number(x) for x in cells])
+        self.journal = None
+
+    @classmethod
+    def zeros(cls, length):
+        '''
+        Gives a tape of cells of zero.
+
+        @param length: Length of the tape.
+        @type length: integer
+        '''
+        return cls([0.0] * length)
+
+    def number(self, value):
+        '''
+        Converts a value into a bounded float to store in a tape cell.
+
+        @return: Value to store.
+        '''
+        if value is None or isinstance(value, (str, bytes)):
+            raise TypeError('Tape cell value must be a number: ' +
+                            repr(value))
+        try:
+            value = float(value)
+        except OverflowError:
+            if value > 0: return self.limit
+            return -self.limit
+        except TypeError:
+            return 0.0
+        if value != value:
+            return 0.0
+        if value > self.limit:
+            return self.limit
+        if value < -self.limit:
+            return -self.limit
+        return value
+
+    def journaled(self, journal):
+        '''
+        Gives a copy of the tape recording the inverse of its changes into 
+        a journal (see register_machine.rollback), or not recording its 
+        changes if journal is None.
+        '''
+        tape = self.__class__(self)
+        tape.journal = journal
+        return tape
+
+    def __reduce__(self):
+        return (self.__class__, (list(self),))
+
+    def record(self, *entry):
+        '''
+        Records the inverse of a change into the journal (if any).
+        '''
+        if self.journal is not None:
+            self.journal.append(entry)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = [self.number(x) for x in value]
+            self.record(list.__setitem__, self, slice(None), list(self))
+        else:
+            value = self.number(value)
+            self.record(list.__setitem__, self, 
+                        index, list.__getitem__(self, index))
+        list.__setitem__(self, index, value)
+
+    def __delitem__(self, index):
+        self.record(list.__setitem__, self, slice(None), list(self))
+        list.__delitem__(self, index)
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def __imul__(self, other):
+        self.record(list.__setitem__, self, slice(None), list(self))
+        return list.__imul__(self, other)
+
+    def append(self, value):
+        value = self.number(value)
+        self.record(list.__delitem__, self, slice(len(self), None))
+        list.append(self, value)
+
+    def extend(self, values):
+        values = [self.number(x) for x in values]
+        self.record(list.__delitem__, self, slice(len(self), None))
+        list.extend(self, values)
+
+    def insert(self, index, value):
+        value = self.number(value)
+        length = len(self)
+        if index < 0: index = max(0, length + index)
+        if index > length: index = length
+        list.insert(self, index, value)
+        self.record(list.pop, self, index)
+
+    def pop(self, index=-1):
+        value = list.pop(self, index)
+        if index < 0: index = len(self) + 1 + index
+        self.record(list.insert, self, index, value)
+        return value
+
+    def remove(self, value):
+        self.record(list.__setitem__, self, slice(None), list(self))
+        list.remove(self, value)
+
+    def reverse(self):
+        list.reverse(self)
+        self.record(list.reverse, self)
+
+    def sort(self, *args, **kwargs):
+        self.record(list.__setitem__, self, slice(None), list(self))
+        list.sort(self, *args, **kwargs)
+
+    def resize(self, length):
+        '''
+        Changes the length of the tape, adding cells of zero to the end
+        of the tape or removing cells from the end of the tape, and gives
+        the tape.
+        '''
+        length = max(length, 0)
+        if length < len(self):
+            del self[length:]
+        else:
+            self.extend([0.0] * (length - len(self)))
+        return self
+
+    def apply(self, function, start=None, end=None):
+        '''
+        Replaces the value of each cell in a range of the tape with the 
+        result of a function on the value, and gives the tape.
+        '''
+        (start, end, step) = slice(start, end).indices(len(self))
+        if start < end:
+            self[start:end] = [function(x) for x in self[start:end]]
+        return self
+
+    def fill(self, value, start=None, end=None):
+        '''
+        Sets the cells in a range of the tape to a value.
+        '''
+        return self.apply(lambda x: value, start, end)
+
+    def fill_cell(self, index, start=None, end=None):
+        '''
+        Sets the cells in a range of the tape to the value of a cell. The
+        cell is only read (and may raise IndexError) if the range is not
+        empty.
+        '''
+        if len(self[start:end]) > 0:
+            self.fill(self[index], start, end)
+        return self
+
+    def multiply(self, factor, start=None, end=None):
+        '''
+        Multiplies the cells in a range of the tape by a factor.
+        '''
+        return self.apply(lambda x: factor * x, start, end)
+
+    def square(self, start=None, end=None):
+        '''
+        Squares the cells in a range of the tape.
+        '''
+        return self.apply(lambda x: x * x, start, end)
+
+    def sqrt(self, start=None, end=None):
+        '''
+        Replaces the cells in a range of the tape with their square roots.
+        '''
+        return self.apply(math.sqrt, start, end)
+
+    def total(self, start=None, end=None):
+        '''
+        Gives the sum of the cells in a range of the tape, added in order 
+        of the cells (as sum).
+        '''
+        return sum(self[start:end])
+
+    def mean(self, start=None, end=None):
+        '''
+        Gives the mean of the cells in a range of the tape. Raises
+        ZeroDivisionError if the range is empty.
+        '''
+        cells = self[start:end]
+        return sum(cells) / float(len(cells))
@@ -81,7 +81,7 @@ class simulation_functions(dose.dose_functions):
     def generation_events(self, Populations, pop_name): pass
 
     def population_report(self, Populations, pop_name):
-        sequences = [''.join(org.genome[0].sequence) for org in Populations[pop_name].agents]
+        sequences = [org.genome[0].joined() for org in Populations[pop_name].agents]
         identities = [org.status['identity'] for org in Populations[pop_name].agents]
         locations = [str(org.status['location']) for org in Populations[pop_name].agents]
         demes = [org.status['deme'] for org in Populations[pop_name].agents]
@@ -112,7 +112,7 @@ class simulation_functions(dose.dose_functions):
                     while parents[i] not in group:
                         parents[i] = random.choice(Populations[pop_name].agents)
                     Populations[pop_name].agents.remove(parents[i])
-                crossover_pt = random.randint(0, len(parents[0].genome[0].sequence))
+                crossover_pt = random.randint(0, len(parents[0].genome[0].read_sequence()))
                 (new_chromo1, new_chromo2) = dose.genetic.crossover(parents[0].genome[0], 
                                                                parents[1].genome[0], 
                                                                crossover_pt)
@@ -74,7 +74,7 @@ class simulation_functions(dose.dose_functions):
     def fitness(self, Populations, pop_name):
         for organism in Populations[pop_name].agents:
             fitness_score = 0
-            for base in organism.genome[0].sequence:
+            for base in organism.genome[0].read_sequence():
                 if int(base) != 0: fitness_score = fitness_score + 1
             organism.status['fitness'] = fitness_score
 
@@ -113,7 +113,7 @@ class simulation_functions(dose.dose_functions):
                         alpha_organism = organism
                 parents.append(alpha_organism)
                 parents.append(random.choice(group))
-                crossover_pt = random.randint(0, len(parents[0].genome[0].sequence))
+                crossover_pt = random.randint(0, len(parents[0].genome[0].read_sequence()))
                 (new_chromo1, new_chromo2) = dose.genetic.crossover(parents[0].genome[0], 
                                                                parents[1].genome[0], 
                                                                crossover_pt)
@@ -49,7 +49,7 @@ class simulation_functions(dose.dose_functions):
     def fitness(self, Populations, pop_name):
         for organism in Populations[pop_name].agents:
             final_fitness = []
-            chromosome = organism.genome[0].sequence
+            chromosome = organism.genome[0].read_sequence()
             zero_count = []
             for base_index in range(parameters["chromosome_size"] - 1):
                 if int(chromosome[base_index]) == 0 and int(chromosome[base_index - 1]) != 0:
@@ -36,7 +36,7 @@ class simulation_functions(dose.dose_functions):
         for organism in Populations[pop_name].agents:
         	#Fitness Score with Cost
 
-            chromosome = organism.genome[0].sequence
+            chromosome = organism.genome[0].read_sequence()
             fitness_cost = (abs(chromosome.count('0') - 250) + abs(chromosome.count('1') - 250)) / 500.0;
             organism.status['fitness_kill'] = 100 - (fitness_cost * 100)
 
@@ -27,7 +27,6 @@ try:
 	import run_examples_without_installation
 except ImportError: pass
 
-import copy
 import random
 
 # Example codes starts from here
@@ -356,7 +355,7 @@ class simulation_functions(dose.dose_functions):
         agents = Populations[pop_name].agents
         for index in range(len(agents)):
             organism = agents[index]
-            chromosome = ''.join(organism.genome[0].sequence)
+            chromosome = organism.genome[0].joined()
             score = [aligner.score(chromosome, seq) 
                      for seq in known_sequences]
             score = sum(score) / len(score)
@@ -390,7 +389,7 @@ class simulation_functions(dose.dose_functions):
         agents = Populations[pop_name].agents
         while len(agents) < 100:
             chosen_agent = random.choice(agents)
-            new_agent = copy.deepcopy(chosen_agent)
+            new_agent = chosen_agent.clone()
             agents.append(new_agent)
 
     def postpopulation_control(self, Populations, pop_name): pass
@@ -399,7 +398,7 @@ class simulation_functions(dose.dose_functions):
 
     def population_report(self, Populations, pop_name):
         agents = Populations[pop_name].agents
-        sequences = [''.join(org.genome[0].sequence) for org in agents]
+        sequences = [org.genome[0].joined() for org in agents]
         identities = [org.status['identity'] for org in agents]
         locations = [str(org.status['location']) for org in agents]
         demes = [org.status['deme'] for org in agents]
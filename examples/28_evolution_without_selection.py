@@ -110,7 +110,7 @@ class simulation_functions(dose.dose_functions):
 
     def population_report(self, Populations, pop_name):
         agents = Populations[pop_name].agents
-        sequences = [''.join(org.genome[0].sequence) for org in agents]
+        sequences = [org.genome[0].joined() for org in agents]
         identities = [org.status['identity'] for org in agents]
         gen_count = agents[0].status["generation"]
         for index in range(len(agents)):
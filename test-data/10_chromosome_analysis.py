@@ -9,8 +9,8 @@ import analytics
 def calc_average_distance(genomes):
     genetic_distance_list = []
     for genome in genomes:
-        chromosome = genome[0].sequence
-        random_chromosome = random.choice(genomes)[0].sequence
+        chromosome = genome[0].read_sequence()
+        random_chromosome = random.choice(genomes)[0].read_sequence()
         genetic_distance_list.append(analytics.hamming_distance(random_chromosome, chromosome))
     return analytics.average(genetic_distance_list)
 
@@ -44,7 +44,7 @@ def get_chromosomes_by_location(starting_time, pop_name, generation):
         organism_chromosomes[location] = []
         for organism in organisms:
             if organism.status['location'] == location:
-                organism_chromosomes[location].append(organism.genome[0].sequence)
+                organism_chromosomes[location].append(organism.genome[0].read_sequence())
     return organism_chromosomes
 
 print('Starting main analysis...\n')
@@ -0,0 +1,42 @@
+'''
+Tests of dose.benchmark.
+'''
+
+import unittest
+
+from dose import benchmark
+
+class TestDifferential(unittest.TestCase):
+
+    def check(self, name, corpus):
+        checks = benchmark.differential(name, corpus)
+        for backend in checks:
+            self.assertEqual(checks[backend]['mismatches'], [],
+                             name + ' ' + backend)
+        return checks
+
+    def test_backends_match_reference(self):
+        for name in ('LCBF', 'nBF 0.2 DNA'):
+            self.check(name, benchmark.random_corpus(name, 20))
+
+    def test_tape_and_recording_backends(self):
+        checks = self.check('nBF 0.2 DNA',
+                            benchmark.evolved_corpus('nBF 0.2 DNA', 20))
+        for backend in ('numpy', 'bounded', 'checkpoints', 'cache'):
+            if backend == 'numpy' and benchmark.tapes.numpy == None:
+                continue
+            self.assertEqual(checks[backend]['executed'], 20, backend)
+
+    def test_unbounded_mathematics(self):
+        for name in ('Ragaraja 1 unbounded', 'Ragaraja tested unbounded'):
+            self.check(name, benchmark.random_corpus(name, 20))
+            corpus = benchmark.evolved_corpus(name, 20)
+            for source in corpus:
+                instructions = [source[i:i+3]
+                                for i in range(0, len(source), 3)]
+                for instruction in benchmark.unbounded_instructions:
+                    self.assertFalse(instruction in instructions)
+            self.check(name, corpus)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+'''
+Tests of dose.genetic.
+'''
+
+import json
+import pickle
+import random
+import unittest
+
+from dose import genetic
+
+def reverse(source):
+    return source[::-1]
+
+class TestDecodedPrograms(unittest.TestCase):
+
+    def test_program_after_change_in_place(self):
+        chromosome = genetic.Chromosome(list('0123'), '0123456789')
+        self.assertEqual(chromosome.program(), '0123')
+        chromosome.sequence[0] = '9'
+        self.assertEqual(chromosome.program(), '9123')
+        self.assertEqual(chromosome.program(reverse), '3219')
+
+    def test_program_of_each_decoder(self):
+        chromosome = genetic.Chromosome(list('0123'), '0123456789')
+        self.assertEqual(chromosome.program(lambda source: source + '4'),
+                         '01234')
+        # a new decoder may be given the identity of a removed decoder
+        self.assertEqual(chromosome.program(lambda source: source + '5'),
+                         '01235')
+
+    def test_pickled_without_programs(self):
+        chromosome = genetic.Chromosome(list('0123'), '0123456789')
+        chromosome.program(lambda source: source + '4')
+        chromosome = pickle.loads(pickle.dumps(chromosome))
+        self.assertEqual(chromosome.decoded, {})
+        self.assertEqual(chromosome.program(), '0123')
+
+class TestSharedSequences(unittest.TestCase):
+
+    def test_clone_shares_sequence_after_read(self):
+        organism = genetic.Organism([genetic.Chromosome(list('0110'), '01')])
+        clone = organism.clone()
+        # reads of a fitness function
+        for individual in (organism, clone):
+            fitness = individual.genome[0].read_sequence().count('1')
+            self.assertEqual(fitness, 2)
+        self.assertTrue(clone.genome[0].read_sequence() is
+                        organism.genome[0].read_sequence())
+        clone.genome[0].sequence[0] = '1'
+        self.assertEqual(organism.genome[0].read_sequence(), list('0110'))
+        self.assertEqual(clone.genome[0].read_sequence(), list('1110'))
+
+class TestStatus(unittest.TestCase):
+
+    def test_copies_do_not_share_values(self):
+        status = genetic.Status({'blood': [1, 2], 'age': 0})
+        for copy in (lambda x: dict(x), lambda x: {**x}, 
+                     lambda x: dict(x.items())):
+            shared = status.share()
+            copied = copy(shared)
+            copied['blood'].append(3)
+            self.assertEqual(status['blood'], [1, 2])
+        shared = status.share()
+        self.assertEqual(json.loads(json.dumps(shared)), 
+                         {'blood': [1, 2], 'age': 0})
+
+def chromosomes(sequence, base='ATCG'):
+    '''
+    Gives a chromosome of a sequence, and the compact chromosomes of the 
+    sequence - unpacked, and packed where the bases can be packed.
+    '''
+    chromosomes = [genetic.Chromosome(list(sequence), base, 0.0),
+                   genetic.CompactChromosome(sequence, base, 0.0, False)]
+    if len(base) <= 4:
+        chromosomes.append(genetic.CompactChromosome(sequence, base, 0.0, 
+                                                     True))
+    return chromosomes
+
+class TestCompactSequences(unittest.TestCase):
+
+    sequence = 'ATCGGATTACACGTTAGC'
+
+    def assertSame(self, chromosomes):
+        expected = chromosomes[0].read_sequence()
+        for chromosome in chromosomes[1:]:
+            self.assertEqual(list(chromosome.read_sequence()), expected)
+            self.assertEqual(chromosome.program(), ''.join(expected))
+
+    def test_indexing(self):
+        for chromosome in chromosomes(self.sequence):
+            sequence = chromosome.read_sequence()
+            for i in range(-len(self.sequence), len(self.sequence)):
+                self.assertEqual(sequence[i], self.sequence[i])
+            for i in (len(self.sequence), -len(self.sequence) - 1):
+                self.assertRaises(IndexError, lambda: sequence[i])
+            self.assertEqual(list(sequence[3:-4]), 
+                             list(self.sequence[3:-4]))
+            self.assertEqual(list(sequence[::-3]), list(self.sequence[::-3]))
+
+    def test_assignment(self):
+        changes = [(5, 'G'), (-1, 'A'), (slice(2, 6), 'CC'), 
+                   (slice(-3, None), 'TTTT'), (slice(None, None, 2), 'A' * 9),
+                   (slice(4, 4), 'GAT'), (slice(None), 'CAT')]
+        for (index, value) in changes:
+            genome = chromosomes(self.sequence)
+            for chromosome in genome:
+                if isinstance(index, slice): 
+                    chromosome.sequence[index] = list(value)
+                else: 
+                    chromosome.sequence[index] = value
+            self.assertSame(genome)
+
+    def test_insert_and_pop(self):
+        genome = chromosomes(self.sequence)
+        for chromosome in genome:
+            chromosome.sequence.insert(0, 'G')
+            chromosome.sequence.insert(7, 'C')
+            chromosome.sequence.insert(-1, 'T')
+            chromosome.sequence.insert(100, 'A')
+        self.assertSame(genome)
+        for index in (-1, 0, 5, -3):
+            bases = [chromosome.sequence.pop(index) for chromosome in genome]
+            self.assertEqual(bases, [bases[0]] * len(genome))
+        self.assertSame(genome)
+
+    def test_rmutate(self):
+        for type in ('point', 'insert', 'delete', 'duplicate', 'invert', 
+                     'translocate'):
+            for start in (0, -10):
+                genome = chromosomes(self.sequence * 4)
+                for chromosome in genome:
+                    random.seed(type)
+                    chromosome.rmutate(type, 0.1, start)
+                self.assertSame(genome)
+
+    def test_crossover(self):
+        for position in (0, 7, 30):
+            pairs = zip(chromosomes(self.sequence), 
+                        chromosomes(self.sequence[::-1] * 2))
+            crossed = [genetic.crossover(x, y, position) for (x, y) in pairs]
+            for i in (0, 1):
+                genome = [pair[i] for pair in crossed]
+                self.assertSame(genome)
+                self.assertEqual([chromosome.__class__ 
+                                  for chromosome in genome],
+                                 [genetic.Chromosome] + 
+                                 [genetic.CompactChromosome] * 2)
+                self.assertEqual(genome[2].read_sequence().packed, True)
+
+    def test_pickling(self):
+        for base in ('ATCG', '0123456789'):
+            sequence = ''.join([base[i % len(base)] for i in range(23)])
+            genome = [pickle.loads(pickle.dumps(chromosome))
+                      for chromosome in chromosomes(sequence, base)]
+            self.assertSame(genome)
+            packed = [getattr(chromosome.read_sequence(), 'packed', None) 
+                      for chromosome in genome]
+            self.assertEqual(packed, [None, False, True][:len(genome)])
+
+if __name__ == '__main__':
+    unittest.main()
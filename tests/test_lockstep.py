@@ -0,0 +1,69 @@
+'''
+Tests of dose.lockstep.
+'''
+
+import random
+import unittest
+
+from dose import benchmark, lockstep, ragaraja, register_machine
+
+functions = ragaraja.instruction_table(0.2)
+
+def interpreted(sources, arrays=None, size=30, max_instructions=1000,
+                functions=functions):
+    '''
+    Gives the results of interpreting sources one at a time.
+    '''
+    if arrays == None: arrays = [None] * len(sources)
+    return [register_machine.interpret(sources[i], functions, 3, [],
+                                       arrays[i], size, max_instructions)
+            for i in range(len(sources))]
+
+@unittest.skipIf(lockstep.numpy == None, 'NumPy is not installed')
+class TestLockstep(unittest.TestCase):
+
+    def test_nBF_DNA_corpus(self):
+        corpus = benchmark.evolved_corpus('nBF 0.2 DNA', 50)
+        machines = lockstep.run(corpus, functions, 3, None, 30, 1000,
+                                ragaraja.lockstep_ragaraja)
+        self.assertEqual([machine.diverged for machine in machines],
+                         [False] * len(corpus))
+        self.assertEqual(sum([machine.instruction_count
+                              for machine in machines]),
+                         sum([len(source) // 3 for source in corpus]))
+        results = lockstep.execute(corpus, functions, 3, None, None, 30,
+                                   1000, ragaraja.lockstep_ragaraja)
+        self.assertEqual(results, interpreted(corpus))
+
+    def test_divergence(self):
+        sources = ['008008050008020', '008008008020', '008060004011020']
+        machines = lockstep.run(sources, functions, 3, None, 30, 1000,
+                                ragaraja.lockstep_ragaraja)
+        self.assertEqual([machine.diverged for machine in machines],
+                         [True, False, True])
+        self.assertEqual([machine.instruction_count
+                          for machine in machines], [2, 4, 1])
+        random.seed(1)
+        results = lockstep.execute(sources, functions, 3, None, None, 30,
+                                   1000, ragaraja.lockstep_ragaraja)
+        random.seed(1)
+        self.assertEqual(results, interpreted(sources))
+
+    def test_arithmetic(self):
+        sources = ['032065068071087', '033074080', '087074020']
+        arrays = [[3, 4, 0], [7, 2.5, 0], [0, 1, 0]]
+        functions = ragaraja.instruction_table(1)
+        machines = lockstep.run(sources, functions, 3, arrays, 3, 1000,
+                                ragaraja.lockstep_ragaraja)
+        # division by zero is left to be executed one at a time
+        self.assertEqual([machine.diverged for machine in machines],
+                         [False, False, True])
+        results = lockstep.execute(sources, functions, 3, None, arrays, 3,
+                                   1000, ragaraja.lockstep_ragaraja)
+        self.assertEqual(results, interpreted(sources, arrays, 3, 1000,
+                                              functions))
+        self.assertEqual([type(x) for x in results[1][0]],
+                         [int, float, int])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+'''
+Tests of dose.register_machine.
+'''
+
+import unittest
+import weakref
+
+from dose import ragaraja, register_machine
+
+functions = ragaraja.instruction_table(0, ragaraja.ragaraja.keys())
+
+def checkpoints(interval=5):
+    '''
+    Gives execution checkpoints of Ragaraja sources.
+    '''
+    return register_machine.Checkpoints(interval,
+                                        ragaraja.nondeterministic_ragaraja,
+                                        ragaraja.structural_ragaraja)
+
+def interpreted(source, inputdata=None, array=None):
+    '''
+    Gives the results of interpreting a source from the start.
+    '''
+    if inputdata == None: inputdata = []
+    if array == None: array = [0] * 30
+    return register_machine.interpret(source, functions, 3, list(inputdata),
+                                      list(array), 30, 1000)
+
+def executed(source, checkpoints, inputdata=None, array=None):
+    '''
+    Gives the results of executing a source with execution checkpoints.
+    '''
+    if inputdata == None: inputdata = []
+    if array == None: array = [0] * 30
+    return register_machine.execute(source, functions, 3, list(inputdata),
+                                    list(array), 30, 1000,
+                                    checkpoints=checkpoints)
+
+class TestCheckpoints(unittest.TestCase):
+
+    def test_resume_through_execute(self):
+        source = '000' * 30 + '001' * 10
+        changed = source[:-3] + '008'
+        points = checkpoints()
+        executed(source, points)
+        self.assertEqual(executed(changed, points), interpreted(changed))
+        self.assertEqual(points.resumes, 1)
+
+    def test_reuse_unexecuted_change(self):
+        # the loop is skipped as the first cell is zero
+        source = '014' + '008' * 5 + '015' + '000' * 10
+        changed = source[:6] + '009' + source[9:]
+        points = checkpoints()
+        executed(source, points)
+        self.assertEqual(executed(changed, points), interpreted(changed))
+        self.assertEqual((points.reuses, points.resumes), (1, 0))
+
+    def test_resume_after_instructions(self):
+        source = '008' * 12 + '000' * 12 + '009' * 12
+        changed = source[:-6] + '004' + source[-3:]
+        points = checkpoints()
+        self.assertEqual(executed(source, points), interpreted(source))
+        self.assertEqual(executed(changed, points), interpreted(changed))
+        self.assertEqual((points.reuses, points.resumes), (0, 1))
+
+    def test_rerun_on_changed_blood_or_input(self):
+        source = '008' * 12 + '000' * 12 + '009' * 12
+        changed = source[:-6] + '004' + source[-3:]
+        points = checkpoints()
+        executed(source, points)
+        blood = [5] + [0] * 29
+        self.assertEqual(executed(changed, points, array=blood),
+                         interpreted(changed, array=blood))
+        self.assertEqual((points.reuses, points.resumes), (0, 0))
+        self.assertEqual(executed(source, points, [1], blood),
+                         interpreted(source, [1], blood))
+        self.assertEqual((points.reuses, points.resumes), (0, 0))
+
+class Table(dict):
+    '''
+    Dictionary of functions / operations which can be weakly referenced.
+    '''
+    pass
+
+def cached(cache, source, table=functions, version=None):
+    '''
+    Gives the results of executing a source through a result cache.
+    '''
+    return cache.execute(register_machine.interpret, source, table, 3, [],
+                         [0] * 30, 30, 1000, version)
+
+class TestResultCache(unittest.TestCase):
+
+    def evicted(self, eviction):
+        cache = register_machine.ResultCache(2, eviction)
+        for source in ('008', '008008', '008', '008008008'):
+            cached(cache, source)
+        cached(cache, '008')
+        return cache
+
+    def test_lru_eviction(self):
+        cache = self.evicted('LRU')
+        # '008' was used after '008008', which is evicted instead
+        self.assertEqual((cache.hits, cache.misses, cache.evictions), 
+                         (2, 3, 1))
+
+    def test_fifo_eviction(self):
+        cache = self.evicted('FIFO')
+        self.assertEqual((cache.hits, cache.misses, cache.evictions), 
+                         (1, 4, 2))
+
+    def test_miss_on_changed_table(self):
+        cache = register_machine.ResultCache()
+        source = '008' * 3
+        cached(cache, source)
+        changed = dict(functions)
+        changed['008'] = functions['011']
+        self.assertEqual(cached(cache, source, changed)[0], 
+                         interpreted(source.replace('008', '011'))[0])
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+        # a table changed in place is given by a new version
+        changed['008'] = functions['008']
+        self.assertEqual(cached(cache, source, changed, 'changed'), 
+                         interpreted(source))
+        self.assertEqual((cache.hits, cache.misses), (0, 3))
+
+    def test_table_identity_held(self):
+        cache = register_machine.ResultCache()
+        table = Table(functions)
+        reference = weakref.ref(table)
+        cached(cache, '008', table)
+        del table
+        # the discarded table cannot give its identity to a new table
+        self.assertTrue(reference() is not None)
+        cache.clear()
+        self.assertTrue(reference() is None)
+
+if __name__ == '__main__':
+    unittest.main()
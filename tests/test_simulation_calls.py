@@ -0,0 +1,172 @@
+'''
+Tests of dose.simulation_calls.
+'''
+
+import sys
+import unittest
+
+from dose import dose_world, genetic, ragaraja, register_machine
+from dose import simulation_calls, tapes
+
+def parameters(**kwargs):
+    '''
+    Gives simulation parameters for interpreting chromosomes of a one-cell
+    world.
+    '''
+    sim_parameters = {"ragaraja_version": 0,
+                      "ragaraja_instructions": ragaraja.ragaraja.keys(),
+                      "max_tape_length": 10,
+                      "clean_cell": False,
+                      "max_codon": 100}
+    sim_parameters.update(kwargs)
+    return sim_parameters
+
+def population(sources, blood=None):
+    '''
+    Gives a population of organisms in ecological cell (0, 0, 0), with one
+    chromosome of each source.
+    '''
+    agents = []
+    for source in sources:
+        organism = genetic.Organism([genetic.Chromosome(list(source),
+                                                        '0123456789')])
+        organism.status['location'] = (0, 0, 0)
+        if blood != None: organism.status['blood'] = list(blood)
+        agents.append(organism)
+    return {'pop_01': genetic.Population(0, 10, agents)}
+
+def world():
+    '''
+    Gives a one-cell world.
+    '''
+    World = dose_world.World(1, 1, 1)
+    World.ecosystem[0][0][0]['local_input'] = [1, 2, 3]
+    return World
+
+class TestCloneGroups(unittest.TestCase):
+
+    def test_clones_have_own_blood(self):
+        Populations = population(['008008008'] * 3, [0] * 10)
+        sim_parameters = parameters(deduplicate_chromosome=True)
+        simulation_calls.interpret_chromosome(sim_parameters, Populations,
+                                              'pop_01', world())
+        agents = Populations['pop_01'].agents
+        self.assertEqual(agents[0].status['blood'], [3] + [0] * 9)
+        self.assertEqual(agents[1].status['blood'], [3] + [0] * 9)
+        self.assertEqual(agents[2].status['blood'], [3] + [0] * 9)
+        agents[1].status['blood'][0] = 10
+        self.assertEqual(agents[0].status['blood'][0], 3)
+        self.assertEqual(agents[2].status['blood'][0], 3)
+
+class TestChromosomeContext(unittest.TestCase):
+
+    def interpret(self, **kwargs):
+        # the first organism stores 5 into register 1, which the second 
+        # organism loads into its first cell
+        Populations = population(['009201', '301'], [0] * 10)
+        simulation_calls.interpret_chromosome(parameters(**kwargs),
+                                              Populations, 'pop_01', 
+                                              world())
+        return [organism.status['blood'][0]
+                for organism in Populations['pop_01'].agents]
+
+    def test_registers_of_organism(self):
+        self.assertEqual(self.interpret(), [5, 0])
+
+    def test_shared_registers(self):
+        self.assertEqual(self.interpret(shared_context=True), [5, 5])
+
+class TestChromosomeCheckpoints(unittest.TestCase):
+
+    def test_checkpoints_of_chromosome(self):
+        sim_parameters = parameters(checkpoint_interval=5,
+                                    compile_chromosome=True)
+        source = '008' * 12 + '000' * 12 + '009' * 12
+        Populations = population([source], [0] * 10)
+        organism = Populations['pop_01'].agents[0]
+        chromosome = organism.genome[0]
+        simulation_calls.interpret_chromosome(sim_parameters, Populations,
+                                              'pop_01', world())
+        checkpoints = chromosome.checkpoints
+        self.assertTrue(checkpoints is
+            simulation_calls.chromosome_checkpoints(sim_parameters,
+                                                    chromosome))
+        # the 35th instruction is changed into '004' (backward)
+        chromosome.kmutate('point', 34 * 3 + 2, 0, '4')
+        organism.status['blood'] = [0] * 10
+        simulation_calls.interpret_chromosome(sim_parameters, Populations,
+                                              'pop_01', world())
+        self.assertEqual(checkpoints.resumes, 1)
+        self.assertEqual(organism.status['blood'],
+            register_machine.interpret(chromosome.program(),
+                simulation_calls.chromosome_interpreter(sim_parameters)[0],
+                3, [1, 2, 3], [0] * 10, 10, 100)[0])
+        self.assertFalse('chromosome_error' in organism.status)
+
+    def test_no_checkpoints_of_user_defined(self):
+        sim_parameters = parameters(checkpoint_interval=5,
+                                    ragaraja_version='user-defined')
+        chromosome = genetic.Chromosome(list('008'), '0123456789')
+        self.assertEqual(simulation_calls.chromosome_checkpoints(
+            sim_parameters, chromosome), None)
+
+class TestSimulationState(unittest.TestCase):
+
+    def test_instruction_table_of_simulation(self):
+        sim_parameters = parameters(ragaraja_version=0.2)
+        simulation_calls.ragaraja_activation(None, sim_parameters,
+                                             population([]), world())
+        table = sim_parameters["simulation_state"]['instruction_table']
+        self.assertEqual(table, ragaraja.instruction_table(0.2))
+        self.assertTrue(simulation_calls.chromosome_interpreter(
+            sim_parameters)[0] is table)
+
+    def test_caches_of_simulation(self):
+        first = parameters(chromosome_cache_size=10,
+                           profile_chromosome=True)
+        second = parameters(chromosome_cache_size=10,
+                           profile_chromosome=True)
+        simulation_calls.interpret_chromosome(first, population(['008']),
+                                              'pop_01', world())
+        self.assertEqual(len(simulation_calls.chromosome_cache(first).results),
+                         1)
+        self.assertEqual(len(simulation_calls.chromosome_cache(second).results),
+                         0)
+        self.assertEqual(list(first["simulation_state"]['profiles']),
+                         ['pop_01'])
+        self.assertEqual(simulation_calls.simulation_state(second)
+                         ['profiles'], {})
+
+class TestBoundedTape(unittest.TestCase):
+
+    def test_overflow_clamped_as_execute(self):
+        # 10 ** 1000 overflows, and factorial of the bound is infinity
+        source = '008' * 3 + '109' * 2 + '000' + '008' * 4 + '114' + \
+            '001' + '009' + '109' * 3 + '114'
+        sim_parameters = parameters(tape='bounded')
+        Populations = population([source], [0] * 10)
+        simulation_calls.interpret_chromosome(sim_parameters, Populations,
+                                              'pop_01', world())
+        blood = Populations['pop_01'].agents[0].status['blood']
+        table = ragaraja.instruction_table(0, ragaraja.ragaraja.keys())
+        result = register_machine.execute(source,
+            ragaraja.bounded_ragaraja(table), 3, [1, 2, 3],
+            tapes.BoundedTape([0] * 10), 10, 100,
+            ragaraja.vectorised_ragaraja(tapes.BoundedTape))
+        self.assertTrue(isinstance(blood, tapes.BoundedTape))
+        self.assertEqual(list(blood), list(result[0]))
+        self.assertEqual(blood[0], sys.float_info.max)
+        self.assertEqual(blood[6], sys.float_info.max)
+
+    def test_bounded_table_of_simulation(self):
+        sim_parameters = parameters(tape='bounded')
+        (interpreter, size) = \
+            simulation_calls.chromosome_interpreter(sim_parameters)
+        self.assertTrue(simulation_calls.chromosome_interpreter(
+            sim_parameters)[0] is interpreter)
+        self.assertTrue(simulation_calls.simulation_state(sim_parameters)
+                        ['bounded_table'][1] is interpreter)
+        self.assertTrue(interpreter['109'] is ragaraja.bounded_mathematics)
+
+if __name__ == '__main__':
+    unittest.main()